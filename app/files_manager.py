@@ -1,10 +1,119 @@
+import threading
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from core.utils.logger import configure_logger, log_warning, log_error
+from typing import Optional, Tuple
+from core.utils.logger import configure_logger, log_info, log_warning, log_error
+from core.utils.sinks import compact_column
+from core.utils.snapshots import DEFAULT_SNAPSHOT_DB_NAME, diff_snapshots, list_snapshots
+from table_query import TableIndex
 
 logger = configure_logger(__name__)
 
+# Output formats in order of preference; columnar files load much faster than CSV
+DATA_FILE_SUFFIXES = (".parquet", ".feather", ".csv")
+
+# Data files kept loaded for all sessions, each in its latest version only
+DATA_CACHE_ENTRIES = 16
+
+PAGE_SIZES = (50, 100, 250, 500)
+
+
+def read_data_file(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".feather":
+        return pd.read_feather(path)
+    return pd.read_csv(path, sep=",", dtype=str)
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality columns as categoricals and the rest as nullable strings, like the columnar exports."""
+    for name in df.columns:
+        df[name] = compact_column(name, df[name], len(df))
+    return df
+
+
+def get_file_fingerprint(path: Path) -> Tuple[str, int, int]:
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+class LoadedFile:
+    """The shared frame of one version of a data file, and its table index once built."""
+
+    def __init__(self, fingerprint: Tuple[int, int], df: pd.DataFrame):
+        self.fingerprint = fingerprint
+        self.df = df
+        self.index: Optional[TableIndex] = None
+
+
+class DataFileSlot:
+    """Holds the loaded version of a data file; a new version replaces the old one."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded: Optional[LoadedFile] = None
+
+
+@st.cache_resource(max_entries=DATA_CACHE_ENTRIES, show_spinner=False)
+def get_data_file_slot(path: str) -> DataFileSlot:
+    return DataFileSlot()
+
+
+def get_loaded_file(path: str, mtime_ns: int, size: int) -> LoadedFile:
+    slot = get_data_file_slot(path)
+    with slot.lock:
+        if slot.loaded is None or slot.loaded.fingerprint != (mtime_ns, size):
+            # Drop the previous version first, so it is not held while the new one loads
+            slot.loaded = None
+            with st.spinner("Loading data..."):
+                df = optimize_dtypes(read_data_file(Path(path)))
+            log_info(logger, f"Loaded {path}: {len(df)} rows, {df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB")
+            slot.loaded = LoadedFile((mtime_ns, size), df)
+        return slot.loaded
+
+
+def load_data_file(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Load a parser output once per process. All sessions share the returned
+    frame, so callers must not modify it. The cache is keyed on the path and
+    remembers the mtime and size: a regenerated file is loaded again on the
+    next rerun and replaces the previous version.
+    """
+    return get_loaded_file(path, mtime_ns, size).df
+
+
+def load_table_index(path: str, mtime_ns: int, size: int) -> TableIndex:
+    """Filter/search lookups over the shared frame of a data file, built once per file version."""
+    loaded = get_loaded_file(path, mtime_ns, size)
+    slot = get_data_file_slot(path)
+    with slot.lock:
+        if loaded.index is None:
+            with st.spinner("Indexing data..."):
+                loaded.index = TableIndex(loaded.df)
+        return loaded.index
+
+
+@st.cache_data(max_entries=32, show_spinner="Comparing snapshots...")
+def load_snapshot_diff(db_path: str, series: str, old_id: int, new_id: int, new_created_at: str) -> pd.DataFrame:
+    """
+    Change report between two snapshots. Snapshots never change once written;
+    the creation time only guards against a recreated database reusing ids.
+    """
+    return pd.DataFrame(
+        diff_snapshots(Path(db_path), series, old_id, new_id).rows(),
+        columns=["CHANGE", "TYPE", "SN", "ATTRIBUTE", "OLD", "NEW"],
+    )
+
+
+def format_snapshot(snapshot: dict) -> str:
+    return (
+        f"#{snapshot['id']}  {snapshot['created_at'].replace('T', ' ')}  "
+        f"(+{snapshot['added']} ~{snapshot['changed']} -{snapshot['removed']})"
+    )
+
+
 class Files:
     def __init__(self, machine: str):
         from core.utils.definitions import DEFAULT_OUTFILES_PATH
@@ -12,16 +121,24 @@ class Files:
         self.base_folder = Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH
         self.correct_file: Path | None = None
         self.df = pd.DataFrame()
+        self.fingerprint: Tuple[str, int, int] | None = None
 
     def find_csv(self):
         try:
             from core.utils.definitions import get_series_info
             series_info = get_series_info(self.machine)
-            expected_csv_path = self.base_folder / Path(series_info.out_file_name).with_suffix(".csv")
-            if expected_csv_path.exists():
-                self.correct_file = expected_csv_path
-            else:
-                self.correct_file = None
+            base_path = self.base_folder / Path(series_info.out_file_name)
+            candidates = [
+                base_path.with_suffix(suffix) for suffix in DATA_FILE_SUFFIXES
+                if base_path.with_suffix(suffix).exists()
+            ]
+            self.correct_file = None
+            # Prefer columnar files, unless a later format was regenerated after them
+            for idx, candidate in enumerate(candidates):
+                mtime = candidate.stat().st_mtime
+                if all(mtime >= other.stat().st_mtime for other in candidates[idx + 1:]):
+                    self.correct_file = candidate
+                    break
         except Exception as exc:
             log_warning(logger, f"find_csv error for {self.machine}: {exc}")
             self.correct_file = None
@@ -53,37 +170,83 @@ class Files:
             )
             return
 
-        df_key = f"df_{self.machine}"
-        if df_key not in st.session_state:
-            try:
-                self.df = pd.read_csv(self.correct_file, sep=",", dtype=str)
-                st.session_state[df_key] = self.df
-            except Exception as exc:
-                log_error(logger, f"Error reading CSV {self.correct_file}: {exc}")
-                st.error(f"Error cargando CSV: {exc}")
-                self.df = pd.DataFrame()
-                st.session_state[df_key] = self.df
-
-        self.df = st.session_state[df_key]
+        try:
+            self.fingerprint = get_file_fingerprint(self.correct_file)
+            self.df = load_data_file(*self.fingerprint)
+        except Exception as exc:
+            log_error(logger, f"Error reading data file {self.correct_file}: {exc}")
+            st.error(f"Error cargando CSV: {exc}")
+            self.df = pd.DataFrame()
 
 
     def show_filtered_data(self):
         if self.df.empty:
             st.warning("No data loaded")
             return
-        
-        df_key = f"df_{self.machine}"
+
         election_key = f"election_{self.machine}"
+        filters_key = f"filters_{self.machine}"
 
         st.sidebar.multiselect(
                     "Choose columns",
                     self.df.columns.tolist(),
                     key=election_key
                 )
+        selected_columns = st.session_state.get(election_key) or self.df.columns.tolist()
+
+        # Rows are narrowed and paged here; only the visible page is sent to the browser
+        index = load_table_index(*self.fingerprint)
+        filter_columns = st.sidebar.multiselect("Filter by", index.filterable_columns, key=filters_key)
+        filters = {
+            column: st.sidebar.multiselect(column, index.values(column), key=f"filter_{self.machine}_{column}")
+            for column in filter_columns
+        }
+        search = st.text_input("Search", key=f"search_{self.machine}", placeholder="Text contained in any column")
+
+        positions = index.filter(filters, search)
+        page_col, size_col = st.columns([3, 1])
+        page_size = size_col.selectbox("Rows per page", PAGE_SIZES, key=f"page_size_{self.machine}")
+        page_count = max(1, -(-len(positions) // page_size))
+        page_key = f"page_{self.machine}"
+        if st.session_state.get(page_key, 1) > page_count:
+            # The filters left fewer pages than the one shown before
+            st.session_state[page_key] = page_count
+        page = page_col.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key=page_key)
 
-        selected_columns = st.session_state.get(election_key, self.df.columns.tolist())
+        start = (page - 1) * page_size
+        end = min(start + page_size, len(positions))
+        st.caption(f"Rows {min(start + 1, end)}-{end} of {len(positions)} ({len(self.df)} total)")
+        st.data_editor(
+            index.page(positions, selected_columns, page - 1, page_size),
+            use_container_width=True,
+            hide_index=True,
+        )
 
-        if selected_columns:
-            st.data_editor(self.df[selected_columns], use_container_width=True, hide_index=True)
-        else:
-            st.data_editor(self.df, use_container_width=True, hide_index=True)
\ No newline at end of file
+    def show_changes(self):
+        db_path = self.base_folder / DEFAULT_SNAPSHOT_DB_NAME
+        snapshots = list_snapshots(db_path, self.machine)
+        if not snapshots:
+            st.info(f"No snapshots of '{self.machine}' yet. Run the parser with --snapshots to record them.")
+            return
+
+        # Oldest option is the empty state, so the first snapshot can be shown as all-added
+        baseline = {"id": 0, "created_at": "before the first snapshot", "added": 0, "changed": 0, "removed": 0}
+        old_col, new_col = st.columns(2)
+        new = new_col.selectbox("To", snapshots, format_func=format_snapshot, key=f"snapshot_to_{self.machine}")
+        older = [snapshot for snapshot in snapshots if snapshot["id"] < new["id"]] + [baseline]
+        old = old_col.selectbox("From", older, format_func=format_snapshot, key=f"snapshot_from_{self.machine}")
+
+        report = load_snapshot_diff(str(db_path), self.machine, old["id"], new["id"], new["created_at"])
+        added, removed, changed = (report["CHANGE"] == change for change in ("added", "removed", "changed"))
+        added_col, removed_col, changed_col = st.columns(3)
+        added_col.metric("Added machines", int(added.sum()))
+        removed_col.metric("Removed machines", int(removed.sum()))
+        changed_col.metric("Changed machines", report.loc[changed, ["TYPE", "SN"]].drop_duplicates().shape[0])
+
+        if report.empty:
+            st.success("No changes between these snapshots.")
+            return
+        changes = st.multiselect(
+            "Show", ["added", "removed", "changed"], default=["added", "removed", "changed"], key=f"changes_{self.machine}"
+        )
+        st.dataframe(report[report["CHANGE"].isin(changes)], use_container_width=True, hide_index=True)
@@ -1,14 +1,26 @@
-import subprocess
+import importlib.util
 import sys
 from pathlib import Path
 import streamlit as st
 from tabs_manager import Content
 from style_manager import AppStyles
-from core.utils.definitions import get_supported_series
+from parser_runner import ParserRunner
+from core.utils.definitions import get_supported_series, DEFAULT_OUTFILES_PATH
 from core.utils.logger import configure_logger, log_error, log_warning
 
 logger = configure_logger(__name__)
 
+# Seconds between refreshes of the parser output while it runs
+REFRESH_SECONDS = 1.0
+
+# Output lines shown in the terminal box
+TERMINAL_LINES = 200
+
+
+def get_export_option() -> str:
+    """Parser option for the export the viewer reads: Parquet when pyarrow is installed, CSV otherwise."""
+    return "--parquet" if importlib.util.find_spec("pyarrow") is not None else "--csv"
+
 
 class MainPage:
 
@@ -27,6 +39,9 @@ class MainPage:
             if st.button("Run Machine Parser"):
                 self.run_script_live()
 
+        if "parser_runner" in st.session_state:
+            self.show_parser_output()
+
         if "machine_type" in st.session_state:
             selected_machine = st.session_state.machine_type
             tabs = Content(selected_machine)
@@ -38,11 +53,11 @@ class MainPage:
 
     def run_script_live(self):
         """
-        Executes machine_config_parser.py in streaming mode,
-        piping output live into Streamlit.
+        Starts machine_config_parser.py in the background. The runner is kept
+        in the session state, so it survives reruns of the page.
         """
 
-        script_path = Path(__file__).parent.parent / "py" / "machine_config_parser.py"
+        script_path = Path(__file__).parent.parent / "core" / "machine_config_parser.py"
 
         selected_machine = st.session_state.get("machine_type", "")
         if not selected_machine:
@@ -57,41 +72,55 @@ class MainPage:
             st.error(msg)
             return
 
-        st.markdown("### 🖥️ Live Script Output")
-        terminal_box = st.empty()
+        runner = st.session_state.get("parser_runner")
+        if runner is not None and runner.running:
+            st.warning("The parser is already running.")
+            return
 
         command = [
             sys.executable,
+            "-u",
             str(script_path),
             "--series",
-            selected_machine
+            selected_machine,
+            get_export_option(),
+            "--cache-dir",
+            str(Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH / ".cache")
         ]
 
         try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
-            )
-
-            output_text = ""
-
-            # Read stdout in real time
-            for line in process.stdout:
-                output_text += line
-                terminal_box.code(output_text)
-
-            # Read stderr after process ends
-            stderr_output = process.stderr.read()
-            if stderr_output:
-                output_text += "\n--- ERRORS ---\n" + stderr_output
-                terminal_box.code(output_text)
-
-            process.wait()
-
+            runner = ParserRunner(command)
+            runner.start()
+            st.session_state.parser_runner = runner
         except Exception as e:
             error_msg = f"Error running script: {e}"
             log_error(logger, error_msg)
-            st.error(error_msg)
\ No newline at end of file
+            st.error(error_msg)
+
+    def show_parser_output(self):
+        runner: ParserRunner = st.session_state.parser_runner
+
+        # Only this fragment reruns on the timer, the data tabs are left alone
+        @st.fragment(run_every=REFRESH_SECONDS if runner.running else None)
+        def parser_output():
+            st.markdown("### 🖥️ Live Script Output")
+            for series, progress in sorted(runner.progress_snapshot().items()):
+                eta = f"{progress.eta:.0f} s" if progress.eta is not None else "-"
+                st.progress(
+                    progress.done / progress.total if progress.total else 0.0,
+                    text=f"{series} {progress.done}/{progress.total} machines, {progress.rate:.1f}/s, ETA {eta}",
+                )
+            st.code("\n".join(runner.tail(TERMINAL_LINES)))
+
+            if runner.running:
+                return
+            if runner.returncode == 0:
+                st.success("Parser finished.")
+            else:
+                st.error(f"Parser exited with code {runner.returncode}.")
+            if not runner.reported:
+                # Stop the timer and reload the regenerated data
+                runner.reported = True
+                st.rerun()
+
+        parser_output()
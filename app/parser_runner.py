@@ -0,0 +1,108 @@
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+# Lines kept for display; older output is dropped
+DEFAULT_MAX_LINES = 2000
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+# Per-machine log line of the parser, e.g. "[T300] Copying properties from T300_000123 [12/480]"
+PROGRESS_PATTERN = re.compile(
+    r"(?:\[(?P<series>[^\]]+)\] )?Copying properties from \S+ \[(?P<done>\d+)/(?P<total>\d+)\]"
+)
+
+
+class SeriesProgress:
+    def __init__(self, total: int, now: float):
+        self.done = 0
+        self.total = total
+        self.started = now
+        self.updated = now
+
+    @property
+    def rate(self) -> float:
+        """Machines per second since the first progress line of the series."""
+        elapsed = self.updated - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        rate = self.rate
+        return (self.total - self.done) / rate if rate > 0 else None
+
+
+class ParserRunner:
+    """
+    Run the parser in the background and collect its output.
+
+    stdout and stderr are drained by one thread each, so neither pipe can fill
+    up and block the child. Lines go into a bounded ring buffer and progress
+    lines update a per-series SeriesProgress; the UI polls snapshots of both.
+    """
+
+    def __init__(self, command: Sequence[str], max_lines: int = DEFAULT_MAX_LINES):
+        self.command = list(command)
+        self.lines: deque = deque(maxlen=max_lines)
+        self.progress: Dict[str, SeriesProgress] = {}
+        self.process: Optional[subprocess.Popen] = None
+        self.reported = False
+        self._lock = threading.Lock()
+        self._readers: List[threading.Thread] = []
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(
+            self.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        for stream in (self.process.stdout, self.process.stderr):
+            reader = threading.Thread(target=self._pump, args=(stream,), daemon=True, name="parser-output")
+            reader.start()
+            self._readers.append(reader)
+
+    def _pump(self, stream) -> None:
+        with stream:
+            for line in stream:
+                self._add_line(ANSI_PATTERN.sub("", line.rstrip("\r\n")))
+
+    def _add_line(self, line: str) -> None:
+        match = PROGRESS_PATTERN.search(line)
+        with self._lock:
+            self.lines.append(line)
+            if match:
+                now = time.monotonic()
+                progress = self.progress.get(match["series"] or "")
+                if progress is None:
+                    progress = self.progress[match["series"] or ""] = SeriesProgress(int(match["total"]), now)
+                progress.done = int(match["done"])
+                progress.updated = now
+
+    @property
+    def running(self) -> bool:
+        if self.process is None:
+            return False
+        return self.process.poll() is None or any(reader.is_alive() for reader in self._readers)
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return None if self.running else self.process.returncode
+
+    def tail(self, count: int) -> List[str]:
+        with self._lock:
+            return list(self.lines)[-count:]
+
+    def progress_snapshot(self) -> Dict[str, SeriesProgress]:
+        with self._lock:
+            return dict(self.progress)
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
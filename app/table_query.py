@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence
+
+
+class TableIndex:
+    """
+    Precomputed lookups over a loaded data file for server-side filtering.
+
+    Categorical columns are matched on their (few) categories and mapped back
+    through the codes. Other columns are searched in the shared frame itself,
+    case-insensitively and only in the rows the filters left, so the index
+    adds no copy of the data. Filtering returns row positions, so only the
+    visible page is materialized.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._codes: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, pd.Index] = {}
+        self._text_columns: List[str] = []
+        for name in df.columns:
+            column = df[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                self._codes[name] = column.cat.codes.to_numpy()
+                self._categories[name] = column.cat.categories.astype(str).str.lower()
+            else:
+                self._text_columns.append(name)
+
+    @property
+    def filterable_columns(self) -> List[str]:
+        return list(self._codes)
+
+    def values(self, column: str) -> List[str]:
+        return self.df[column].cat.categories.astype(str).tolist()
+
+    def _match_codes(self, column: str, mask: np.ndarray) -> np.ndarray:
+        return np.isin(self._codes[column], np.flatnonzero(mask))
+
+    def filter(self, filters: Dict[str, Sequence[str]], search: str = "") -> np.ndarray:
+        """Row positions matching every column filter and, if given, containing the search text."""
+        rows = np.ones(len(self.df), dtype=bool)
+        for column, selected in filters.items():
+            if selected:
+                rows &= self._match_codes(column, self.df[column].cat.categories.isin(selected))
+
+        positions = np.flatnonzero(rows)
+        term = search.strip().lower()
+        if term and len(positions):
+            found = np.zeros(len(positions), dtype=bool)
+            for column, categories in self._categories.items():
+                matches = np.flatnonzero(categories.str.contains(term, regex=False))
+                found |= np.isin(self._codes[column][positions], matches)
+            for column in self._text_columns:
+                values = self.df[column].iloc[positions]
+                if not pd.api.types.is_string_dtype(values.dtype):
+                    values = values.astype("string")
+                found |= values.str.contains(term, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+            positions = positions[found]
+        return positions
+
+    def page(self, positions: np.ndarray, columns: Sequence[str], page: int, page_size: int) -> pd.DataFrame:
+        start = page * page_size
+        return self.df.iloc[positions[start:start + page_size]][list(columns)]
@@ -12,17 +12,22 @@ class Content:
     def create_tabs(self):
         st.sidebar.write(f"Machine: {self.machine}")
 
-        tab_data, tab_plots = st.tabs(["  Data", "Plots"])
+        tab_data, tab_changes, tab_plots = st.tabs(["  Data", "Changes", "Plots"])
 
         with tab_data:
             st.title(f"\U0001F4CB {self.machine} Data")
 
             if self.file_handler.correct_file is None:
+                # Snapshots do not depend on the CSV; keep rendering the other tabs
                 st.warning(f"No CSV available for machine '{self.machine}'")
-                return
+            else:
+                # Show filtered DataFrame
+                self.file_handler.show_filtered_data()
 
-            # Show filtered DataFrame
-            self.file_handler.show_filtered_data()
+        with tab_changes:
+            st.title(f"\U0001F504 {self.machine} Changes")
+
+            self.file_handler.show_changes()
 
         with tab_plots:
             st.title(f"\U0001F4CA {self.machine} Plots")
@@ -0,0 +1,140 @@
+"""Generate synthetic machine archives on local disk for benchmarking the parser."""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+from xml.sax.saxutils import escape, quoteattr
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.utils.definitions import SeriesConfigBase  # noqa: E402
+
+CSP_NAMESPACE = "http://www.codesmithtools.com/schema/csp.xsd"
+
+# File name -> base number of properties; real station/safety files are the large ones
+CSP_FILES: Dict[str, int] = {
+    "0_MetaDataProject.csp": 20,
+    "1_MachineConfiguration.csp": 60,
+    "2_StationSelection.csp": 40,
+    "3_StationConfiguration.csp": 400,
+    "6_SafetyConfiguration.csp": 200,
+}
+
+MU_VARIANTS = {
+    "tcgvl": "MU_Config.TcGVL",
+    "exp": "MU_CONFIG.EXP",
+}
+
+
+def get_property_name(file_stem: str, idx: int) -> str:
+    """Property names become XML attribute names in the output, so they must not start with a digit."""
+    return f"P{idx:04d}_{file_stem}"
+
+
+def make_csp(rng: random.Random, file_stem: str, property_count: int) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        f'<codeSmith xmlns="{CSP_NAMESPACE}">',
+        "  <propertySets>",
+        f'    <propertySet name="{file_stem}">',
+    ]
+    for idx in range(property_count):
+        value = escape(f"{file_stem}_{idx}_{rng.choice(('ON', 'OFF', rng.randint(0, 9999)))}")
+        lines.append(f"      <property name={quoteattr(get_property_name(file_stem, idx))}>{value}</property>")
+    lines += ["    </propertySet>", "  </propertySets>", "</codeSmith>", ""]
+    return "\n".join(lines)
+
+
+def make_mu_config(rng: random.Random, variant: str, version: str, filler: int = 80) -> str:
+    variables = [f"\tHMICFGgszProgramVersion : STRING(40) := '{version}';"]
+    for idx in range(filler):
+        variables.append(f"\tHMICFGgnValue{idx:03d} : INT := {rng.randint(0, 32767)};")
+    rng.shuffle(variables)
+    body = "VAR_GLOBAL\n" + "\n".join(variables) + "\nEND_VAR\n"
+
+    if variant == "tcgvl":
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<TcPlcObject Version="1.1.0.1">\n'
+            '  <GVL Name="MU_Config">\n'
+            f"    <Declaration><![CDATA[{body}]]></Declaration>\n"
+            "  </GVL>\n"
+            "</TcPlcObject>\n"
+        )
+    return "(* @NESTEDCOMMENTS := 'Yes' *)\n(* @PATH := '\\/MU' *)\n" + body
+
+
+def make_series_config(
+    root: Path, series: str = "Wxxx", variant: str = "tcgvl", csp_files: List[str] = None
+) -> SeriesConfigBase:
+    """Series config pointing at a generated archive (forward slashes work on every OS)."""
+    csp_files = list(CSP_FILES) if csp_files is None else csp_files
+    return SeriesConfigBase(
+        series,
+        str(root),
+        r"^W5\d{2}_\d{6}$",
+        [f"ControlUnit/{name}" for name in csp_files],
+        f"ControlUnit/{MU_VARIANTS[variant]}",
+        f"{series}/{series}_machines.xml",
+    )
+
+
+def generate_archive(
+    root: Path,
+    machines: int,
+    variant: str = "tcgvl",
+    property_scale: float = 1.0,
+    template_ratio: float = 0.5,
+    seed: int = 0,
+) -> SeriesConfigBase:
+    """
+    Write `machines` W5xx_nnnnnn directories under root.
+
+    Property counts vary around CSP_FILES * property_scale. A share of
+    template_ratio machines reuse byte-identical CSP files from a small pool
+    of templates, as machines built from the same template do.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    templates = {
+        name: [make_csp(rng, Path(name).stem, max(1, int(count * property_scale))) for _ in range(4)]
+        for name, count in CSP_FILES.items()
+    }
+
+    for idx in range(machines):
+        control_unit = root / f"W5{idx % 100:02d}_{idx:06d}" / "ControlUnit"
+        control_unit.mkdir(parents=True, exist_ok=True)
+
+        version = f"V{rng.randint(1, 3)}.{rng.randint(0, 9)}.{rng.randint(0, 20)}"
+        (control_unit / MU_VARIANTS[variant]).write_text(make_mu_config(rng, variant, version), encoding="utf-8")
+
+        for name, count in CSP_FILES.items():
+            if rng.random() < template_ratio:
+                content = rng.choice(templates[name])
+            else:
+                scaled = max(1, int(count * property_scale * rng.uniform(0.5, 1.5)))
+                content = make_csp(rng, Path(name).stem, scaled)
+            (control_unit / name).write_text(content, encoding="utf-8")
+
+    return make_series_config(root, variant=variant)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("root", type=Path, help="Directory to create the archive in")
+    parser.add_argument("--machines", type=int, default=100, help="Number of machine directories")
+    parser.add_argument("--variant", choices=sorted(MU_VARIANTS), default="tcgvl", help="MU config file variant")
+    parser.add_argument("--property-scale", type=float, default=1.0, help="Scale factor for CSP property counts")
+    parser.add_argument("--template-ratio", type=float, default=0.5, help="Share of machines using template CSP files")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_archive(args.root, args.machines, args.variant, args.property_scale, args.template_ratio, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Measure with tracemalloc the memory of the machine table behind the tabular
+outputs, and write the results as JSON.
+
+    python benchmarks/memory_benchmark.py --machines 50000 --output memory.json
+
+Machines are generated in memory with the property names and value mix of
+benchmarks/generate_archive.py. Like the strings the CSP parser returns, every
+name and value is a new string object per machine. The report compares the
+retained size and peak of a list of attribute dicts (the previous table
+layout) with MachineTable, and the peak of the CSV and JSON exports.
+A full-size dict table needs several GB; use --property-scale on small hosts.
+
+The peak of a whole extraction, as the CLI runs it with the per-series
+manifest and a CSV export, is measured on a generated archive of
+--run-machines machines: without a manifest, on a first run that writes it,
+and on a rerun that reuses it.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.generate_archive import CSP_FILES, generate_archive, get_property_name  # noqa: E402
+from benchmarks.run_benchmarks import quiet_parser_logs  # noqa: E402
+from core.utils.find_directories import find_directories  # noqa: E402
+from core.utils.machine_data import get_machine_data_from_directories  # noqa: E402
+from core.utils.manifest import MachineManifest, get_manifest_path  # noqa: E402
+from core.utils.sinks import CsvSink, JsonSink, MachineTable  # noqa: E402
+
+TEMPLATES_PER_FILE = 4
+
+
+def make_properties(rng: random.Random, file_stem: str, count: int) -> Iterator[tuple]:
+    for idx in range(count):
+        value = f"{file_stem}_{idx}_{rng.choice(('ON', 'OFF', rng.randint(0, 9999)))}"
+        yield get_property_name(file_stem, idx), value
+
+
+def generate_machines(machines: int, property_scale: float, template_ratio: float, seed: int) -> Iterator[Dict[str, str]]:
+    rng = random.Random(seed)
+    for idx in range(machines):
+        machine = {
+            "TYPE": f"W5{idx % 100:02d}",
+            "SN": f"{idx:06d}",
+            "SW_VERSION": f"V{rng.randint(1, 3)}.{rng.randint(0, 9)}.{rng.randint(0, 20)}",
+        }
+        for name, count in CSP_FILES.items():
+            stem = Path(name).stem
+            if rng.random() < template_ratio:
+                # Equal content to the other machines of the template, but new string objects
+                template = rng.randrange(TEMPLATES_PER_FILE)
+                properties = make_properties(random.Random(f"{seed}-{stem}-{template}"), stem, max(1, int(count * property_scale)))
+            else:
+                properties = make_properties(rng, stem, max(1, int(count * property_scale * rng.uniform(0.5, 1.5))))
+            machine.update(properties)
+        yield machine
+
+
+def traced(fn: Callable[[], object]) -> tuple:
+    """Run fn under tracemalloc; return its result, the bytes still held and the peak."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"retained_mb": round(current / 2**20, 1), "peak_mb": round(peak / 2**20, 1), "seconds": round(seconds, 2)}
+
+
+def build_dict_rows(args) -> list:
+    return list(generate_machines(args.machines, args.property_scale, args.template_ratio, args.seed))
+
+
+def build_machine_table(args) -> MachineTable:
+    table = MachineTable()
+    for machine in generate_machines(args.machines, args.property_scale, args.template_ratio, args.seed):
+        table.append(machine)
+    return table
+
+
+def measure_extraction(args, workdir: Path) -> dict:
+    """Peak of get_machine_data_from_directories without a manifest, with a new one and reusing it."""
+    series_info = generate_archive(
+        workdir / "archive", args.run_machines, property_scale=args.property_scale,
+        template_ratio=args.template_ratio, seed=args.seed,
+    )
+    found_dirs = find_directories(str(series_info.repository_path), series_info.regex_pattern)
+    quiet_parser_logs()
+
+    def run(name: str, use_manifest: bool) -> None:
+        out_dir = workdir / name
+        xml_path = out_dir / series_info.out_file_name
+        manifest = MachineManifest(get_manifest_path(out_dir, series_info), series_info) if use_manifest else None
+        get_machine_data_from_directories(
+            found_dirs, out_dir, series_info, manifest=manifest, sinks=[CsvSink(xml_path.with_suffix(".csv"))]
+        )
+
+    report = {"machines": args.run_machines}
+    _, report["without_manifest"] = traced(lambda: run("plain", False))
+    _, report["first_run"] = traced(lambda: run("manifest", True))
+    _, report["rerun"] = traced(lambda: run("manifest", True))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--machines", type=int, default=50000, help="Machines in the series")
+    parser.add_argument("--property-scale", type=float, default=1.0, help="Scale factor for CSP property counts")
+    parser.add_argument("--template-ratio", type=float, default=0.5, help="Share of machines using template CSP files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-dicts", action="store_true", help="Only measure MachineTable")
+    parser.add_argument("--run-machines", type=int, default=400, help="Machines in the archive for the extraction runs; 0 skips them")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machines": args.machines,
+        "property_scale": args.property_scale,
+    }
+
+    if not args.skip_dicts:
+        rows, report["dict_rows"] = traced(lambda: build_dict_rows(args))
+        del rows
+
+    table, report["machine_table"] = traced(lambda: build_machine_table(args))
+    report["columns"] = len(table.columns)
+    with tempfile.TemporaryDirectory() as tmp:
+        _, report["csv_export"] = traced(lambda: CsvSink(Path(tmp) / "machines.csv").write_table(table))
+        _, report["json_export"] = traced(lambda: JsonSink(Path(tmp) / "machines.json").write_table(table))
+    del table
+
+    if args.run_machines > 0:
+        with tempfile.TemporaryDirectory() as tmp:
+            report["extraction"] = measure_extraction(args, Path(tmp))
+
+    if "dict_rows" in report:
+        report["retained_ratio"] = round(
+            report["machine_table"]["retained_mb"] / report["dict_rows"]["retained_mb"], 3
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Time each parser stage on synthetic archives and write the results as JSON.
+
+    python benchmarks/run_benchmarks.py --sizes 100 1000 10000 50000 --output results.json
+    python benchmarks/run_benchmarks.py --sizes 1000 --compare results.json
+
+Generated archives are kept in --workdir and reused by later runs with the
+same parameters, so only the first run pays for generating them.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.generate_archive import MU_VARIANTS, generate_archive, make_series_config  # noqa: E402
+from core.utils.find_directories import find_directories  # noqa: E402
+from core.utils import machine_data  # noqa: E402
+from core.utils.sinks import CsvSink, JsonSink, MachineTable  # noqa: E402
+from core.utils.xml_writer import MachineXmlWriter  # noqa: E402
+
+
+def quiet_parser_logs() -> None:
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("core."):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+
+class StageTimer:
+    def __init__(self, machines: int):
+        self.machines = machines
+        self.stages: Dict[str, dict] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self.stages[name] = {
+            "seconds": round(seconds, 6),
+            "machines_per_second": round(self.machines / seconds, 1) if seconds > 0 else None,
+        }
+
+
+def prepare_archive(workdir: Path, machines: int, variant: str, property_scale: float, seed: int) -> Path:
+    root = workdir / f"archive_{variant}_{machines}_{property_scale:g}_{seed}"
+    marker = root / ".complete"
+    if not marker.exists():
+        shutil.rmtree(root, ignore_errors=True)
+        generate_archive(root, machines, variant=variant, property_scale=property_scale, seed=seed)
+        marker.touch()
+    return root
+
+
+def run_size(workdir: Path, machines: int, args) -> dict:
+    start = time.perf_counter()
+    root = prepare_archive(workdir, machines, args.variant, args.property_scale, args.seed)
+    setup_seconds = time.perf_counter() - start
+
+    series_info = make_series_config(root, variant=args.variant)
+    out_dir = workdir / f"output_{machines}"
+    shutil.rmtree(out_dir, ignore_errors=True)
+    xml_path = out_dir / series_info.out_file_name
+    xml_path.parent.mkdir(parents=True, exist_ok=True)
+    timer = StageTimer(machines)
+
+    with timer.stage("find_directories"):
+        found_dirs = sorted(find_directories(str(root), series_info.regex_pattern), key=machine_data.get_machine_sort_key)
+
+    with timer.stage("mu_version_scan"):
+        versions = [machine_data.get_software_version(d / series_info.mu_config_file) for d in found_dirs]
+
+    # Version plus four of the generated filler variables, read in the same pass
+    mu_variables = ["HMICFGgszProgramVersion", *(f"HMICFGgnValue{idx:03d}" for idx in (0, 20, 40, 79))]
+    with timer.stage("mu_multi_key_scan"):
+        for d in found_dirs:
+            machine_data.get_mu_variables(d / series_info.mu_config_file, mu_variables)
+
+    with timer.stage("csp_extraction"):
+        nodes = [machine_data.get_file_nodes(d, series_info.csp_files) for d in found_dirs]
+
+    table = MachineTable()
+    for dir_path, version, machine_nodes in zip(found_dirs, versions, nodes):
+        type_, sn = dir_path.name.split("_")
+        machine = {"TYPE": type_, "SN": sn}
+        if version is not None:
+            machine["SW_VERSION"] = version
+        machine.update(machine_nodes)
+        table.append(machine)
+
+    with timer.stage("xml_write"):
+        with MachineXmlWriter(xml_path) as writer:
+            for record in table.rows:
+                writer.write_machine(record.to_dict())
+
+    with timer.stage("csv_export"):
+        CsvSink(xml_path.with_suffix(".csv")).write_table(table)
+
+    with timer.stage("json_export"):
+        JsonSink(xml_path.with_suffix(".json")).write_table(table)
+
+    import pandas as pd
+
+    # Same call the Streamlit viewer makes for a CSV output
+    with timer.stage("app_load_csv"):
+        pd.read_csv(xml_path.with_suffix(".csv"), sep=",", dtype=str)
+
+    with timer.stage("end_to_end"):
+        machine_data.get_machine_data_from_directories(found_dirs, out_dir, series_info, workers=args.workers)
+
+    if args.process_workers > 0:
+        # Worker start-up is part of the stage, as it is for a CLI run
+        with timer.stage("end_to_end_process"):
+            pool = machine_data.create_process_pool(args.process_workers)
+            machine_data.set_process_pool(pool)
+            try:
+                machine_data.get_machine_data_from_directories(
+                    found_dirs, workdir / f"output_{machines}_process", series_info, workers=args.process_workers
+                )
+            finally:
+                machine_data.set_process_pool(None)
+                pool.shutdown()
+
+    result = {
+        "machines": machines,
+        "columns": len(table.columns),
+        "setup_seconds": round(setup_seconds, 3),
+        "stages": timer.stages,
+    }
+    if "end_to_end_process" in timer.stages:
+        result["process_speedup"] = round(
+            timer.stages["end_to_end"]["seconds"] / timer.stages["end_to_end_process"]["seconds"], 2
+        )
+    return result
+
+
+def compare(results: List[dict], baseline_path: Path, tolerance: float) -> List[str]:
+    """Return a line per stage that is slower than the baseline by more than tolerance."""
+    baseline = {entry["machines"]: entry for entry in json.loads(baseline_path.read_text())["results"]}
+    regressions = []
+    for entry in results:
+        reference = baseline.get(entry["machines"])
+        if reference is None:
+            continue
+        for stage, timing in entry["stages"].items():
+            before = reference["stages"].get(stage, {}).get("seconds")
+            if before and timing["seconds"] > before * (1 + tolerance):
+                regressions.append(
+                    f"{entry['machines']} machines, {stage}: {before:.3f}s -> {timing['seconds']:.3f}s"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="Numbers of machines to benchmark")
+    parser.add_argument("--variant", choices=sorted(MU_VARIANTS), default="tcgvl", help="MU config file variant")
+    parser.add_argument("--property-scale", type=float, default=1.0, help="Scale factor for CSP property counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="--workers for the end_to_end stage")
+    parser.add_argument(
+        "--process-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Workers for the end_to_end_process stage (--executor process); 0 skips it (default: CPU count)",
+    )
+    parser.add_argument("--workdir", type=Path, help="Where archives are generated (default: a temp directory)")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against --compare (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    quiet_parser_logs()
+    workdir = args.workdir or Path(tempfile.gettempdir()) / "machine_config_parser_bench"
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = [run_size(workdir, size, args) for size in args.sizes]
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "variant": args.variant,
+        "property_scale": args.property_scale,
+        "workers": args.workers,
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
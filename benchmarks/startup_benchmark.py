@@ -0,0 +1,98 @@
+"""
+Measure CLI startup from `python -X importtime` and write the results as JSON.
+
+    python benchmarks/startup_benchmark.py --runs 10 --output startup.json
+    python benchmarks/startup_benchmark.py -- --series Wxxx --help
+
+The CLI is started --runs times with the given arguments (default: --help).
+The report has the median wall time, the median total import time and the
+slowest top-level imports, and lists the heavy dependencies that were
+imported although the command does not need them.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+CLI_PATH = Path(__file__).resolve().parent.parent / "core" / "machine_config_parser.py"
+
+# Loaded only by the stages that need them (exports, CSP parsing, colored logs, --profile,
+# --executor process, --pipeline async)
+HEAVY_MODULES = ("pandas", "pyarrow", "lxml", "colorama", "cProfile", "pstats", "multiprocessing", "asyncio")
+
+
+def parse_importtime(stderr: str) -> Dict[str, dict]:
+    """Map every imported module to its self and cumulative import time in microseconds."""
+    modules: Dict[str, dict] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "top_level": not name[1:].startswith(" "),
+        }
+    return modules
+
+
+def measure_startup(cli_args: List[str], runs: int) -> dict:
+    wall_times: List[float] = []
+    import_times: List[int] = []
+    modules: Dict[str, dict] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", str(CLI_PATH), *cli_args],
+            capture_output=True,
+            text=True,
+            cwd=CLI_PATH.parent,
+        )
+        wall_times.append(time.perf_counter() - start)
+        modules = parse_importtime(completed.stderr)
+        import_times.append(sum(entry["cumulative_us"] for entry in modules.values() if entry["top_level"]))
+
+    top_level = sorted(
+        ((name, entry["cumulative_us"]) for name, entry in modules.items() if entry["top_level"]),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "args": cli_args,
+        "runs": runs,
+        "wall_seconds_median": round(statistics.median(wall_times), 4),
+        "import_seconds_median": round(statistics.median(import_times) / 1e6, 4),
+        "modules_imported": len(modules),
+        "slowest_imports": [{"module": name, "seconds": round(us / 1e6, 4)} for name, us in top_level[:15]],
+        "heavy_modules_imported": sorted(name for name in modules if name in HEAVY_MODULES),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of CLI starts")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("cli_args", nargs="*", help="Arguments for the CLI, after -- (default: --help)")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **measure_startup(args.cli_args or ["--help"], args.runs),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
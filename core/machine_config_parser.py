@@ -1,15 +1,454 @@
 import argparse
+import contextvars
+import csv
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from utils.find_directories import find_directories
-from utils.definitions import get_series_info, get_supported_series, DEFAULT_OUTFILES_PATH
-from utils.machine_data import get_machine_data_from_directories
-from utils.convert_xml import convert_xml_to_csv, convert_xml_to_json
-from utils.logger import configure_logger, log_info, log_warning, log_error, log_exception
+from typing import Dict, List, Optional, Set
+from utils.find_directories import find_series_directories
+from utils.definitions import (
+    SeriesConfigBase,
+    get_series_info,
+    get_supported_series,
+    DEFAULT_OUTFILES_PATH,
+    DEFAULT_QUEUE_SIZE,
+)
+from utils.machine_data import (
+    create_process_pool,
+    get_machine_data_from_directories,
+    set_file_cache,
+    set_io_policy,
+    set_parse_memo,
+    set_process_pool,
+)
+from utils.io_policy import IoPolicy, DEFAULT_READ_RETRIES, DEFAULT_RETRY_BACKOFF, DEFAULT_DEFERRED_TIMEOUT
+from utils.parse_memo import ParseMemo, DEFAULT_MEMO_ENTRIES
+from utils.metrics import RunMetrics, set_current_metrics
+from utils.file_cache import FileCache, DEFAULT_CACHE_SIZE_MB
+from utils.manifest import MachineManifest, get_manifest_path
+from utils.checkpoint import CheckpointJournal, get_checkpoint_path
+from utils.sinks import CsvSink, JsonSink, ParquetSink, FeatherSink
+from utils.sqlite_index import SqliteSink, DEFAULT_DB_NAME, query_machines
+from utils.snapshots import SnapshotSink, DEFAULT_SNAPSHOT_DB_NAME, diff_snapshots
+from utils.watch import RepositoryWatcher, DEFAULT_WATCH_INTERVAL, DEFAULT_VERIFY_INTERVAL
+from utils.logger import configure_logger, set_log_context, log_info, log_success, log_warning, log_error, log_exception
 
 logger = configure_logger(__name__)
 
 
+def scan_repositories(
+    series_infos: List[SeriesConfigBase], metrics: Optional[RunMetrics] = None, verbose: bool = True
+) -> Dict[str, List[Path]]:
+    """
+    List every distinct repository root once and route its entries to the
+    series stored there (e.g. T300 and T305 share the T30x_03 root).
+    """
+    series_by_root: Dict[Path, List[SeriesConfigBase]] = {}
+    for series_info in series_infos:
+        series_by_root.setdefault(Path(series_info.repository_path), []).append(series_info)
+
+    found: Dict[str, List[Path]] = {}
+    for repo_path, root_series in series_by_root.items():
+        # Validate repository path
+        if verbose:
+            log_info(logger, f"Checking repository path '{repo_path}'")
+
+        if not repo_path.exists():
+            log_error(logger, "Repository path not found." if verbose else f"Repository path not found: '{repo_path}'")
+            continue
+
+        if verbose:
+            log_info(logger, "Repository path exists.")
+
+        # Scan directories
+        patterns = {series_info.series: series_info.regex_pattern for series_info in root_series}
+        if metrics is None:
+            found.update(find_series_directories(str(repo_path), patterns))
+            continue
+        with metrics.stage("scan"):
+            found.update(find_series_directories(str(repo_path), patterns))
+        metrics.add("repositories_scanned")
+    return found
+
+
+class SeriesResult:
+    """Per-series line of the end-of-run summary."""
+
+    def __init__(self, series: str):
+        self.series = series
+        self.machines = 0
+        self.failures = 0
+        self.elapsed = 0.0
+        self.status = "ok"
+        self.metrics: Optional[RunMetrics] = None
+
+
+def process_series(
+    series_info: SeriesConfigBase,
+    found_dirs: List[Path],
+    out_dir: Path,
+    args,
+    io_limiter: Optional[threading.Semaphore] = None,
+    trusted: Optional[Set[str]] = None,
+    full: bool = False,
+    resume: bool = False,
+) -> SeriesResult:
+    series = series_info.series
+    result = SeriesResult(series)
+    log_info(logger, f"Processing series '{series}'")
+
+    if not found_dirs:
+        log_error(logger, f"No directories found matching pattern for '{series}'")
+        result.status = "no directories"
+        return result
+
+    log_info(logger, f"Found {len(found_dirs)} matching directories.")
+
+    # Generate XML
+    xml_output_name = series_info.out_file_name
+    xml_path = out_dir / xml_output_name
+
+    manifest = MachineManifest(get_manifest_path(out_dir, series_info), series_info)
+    if full:
+        manifest.clear()
+    elif trusted:
+        manifest.trust(trusted)
+
+    # Extra exports are fed from the same pass as the XML
+    sinks = []
+    if args.csv:
+        sinks.append(CsvSink(xml_path.with_suffix(".csv")))
+    if args.json:
+        sinks.append(JsonSink(xml_path.with_suffix(".json")))
+    if args.parquet:
+        sinks.append(ParquetSink(xml_path.with_suffix(".parquet")))
+    if args.feather:
+        sinks.append(FeatherSink(xml_path.with_suffix(".feather")))
+    if args.sqlite:
+        sinks.append(SqliteSink(args.sqlite, series, args.sqlite_index_attrs))
+    if args.snapshots:
+        sinks.append(SnapshotSink(args.snapshots, series))
+
+    checkpoint = CheckpointJournal(get_checkpoint_path(out_dir, series_info), resume=resume)
+
+    log_info(logger, f"Generating '{xml_output_name}'...")
+    try:
+        if args.pipeline == "async":
+            # asyncio is only needed here; keep it out of CLI startup
+            import asyncio
+            from utils.pipeline import write_machine_data_async
+
+            summary = asyncio.run(
+                write_machine_data_async(
+                    found_dirs,
+                    out_dir,
+                    series_info,
+                    readers=args.workers,
+                    queue_size=args.queue_size,
+                    manifest=manifest,
+                    sinks=sinks,
+                    io_limiter=io_limiter,
+                    checkpoint=checkpoint,
+                )
+            )
+        else:
+            summary = get_machine_data_from_directories(
+                found_dirs,
+                out_dir,
+                series_info,
+                workers=args.workers,
+                manifest=manifest,
+                sinks=sinks,
+                io_limiter=io_limiter,
+                checkpoint=checkpoint,
+            )
+    except Exception as ex:
+        log_exception(logger, "Error generating XML", ex)
+        log_warning(logger, "Completed machines are kept in the checkpoint; rerun with --resume to continue.")
+        result.status = "error"
+        return result
+    finally:
+        checkpoint.close()
+
+    result.machines = summary.machines
+    result.failures = summary.failures
+    if summary.unfinished:
+        result.status = f"{len(summary.unfinished)} unfinished"
+    log_info(logger, f"Generated XML: {xml_path}")
+    return result
+
+
+def _run_series(
+    series_info: SeriesConfigBase,
+    found_dirs: Optional[List[Path]],
+    out_dir: Path,
+    args,
+    io_limiter: threading.Semaphore,
+    trusted: Optional[Set[str]] = None,
+    full: bool = False,
+    resume: bool = False,
+) -> SeriesResult:
+    set_log_context(f"[{series_info.series}] ")
+    metrics = RunMetrics(series_info.series)
+    set_current_metrics(metrics)
+    profiler = None
+    if args.profile and found_dirs is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as ex:
+            # Only one profiler can be active per process since Python 3.12
+            log_warning(logger, f"Not profiling: {ex}")
+            profiler = None
+
+    start = time.perf_counter()
+    if found_dirs is None:
+        result = SeriesResult(series_info.series)
+        result.status = "repository not found"
+    else:
+        try:
+            result = process_series(series_info, found_dirs, out_dir, args, io_limiter, trusted, full, resume)
+        except Exception as ex:
+            log_exception(logger, "Unexpected error", ex)
+            result = SeriesResult(series_info.series)
+            result.status = "error"
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    result.elapsed = time.perf_counter() - start
+    result.metrics = metrics
+
+    if profiler is not None:
+        try:
+            write_profile(profiler, out_dir / Path(series_info.out_file_name).with_suffix(".profile"))
+        except Exception as ex:
+            log_exception(logger, "Error writing profile", ex)
+    return result
+
+
+def write_profile(profiler: "cProfile.Profile", base_path: Path) -> None:
+    """Dump raw pstats data (.pstats) and a readable report sorted by cumulative time (.txt)."""
+    import pstats
+
+    base_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path = base_path.with_name(base_path.name + ".txt")
+    profiler.dump_stats(base_path.with_name(base_path.name + ".pstats"))
+    with open(report_path, "w", encoding="utf-8") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats("cumulative").print_stats(50)
+    log_info(logger, f"Profile written: {report_path}")
+
+
+def write_metrics(path: Path, run_metrics: RunMetrics, results: List[SeriesResult]) -> None:
+    report = {
+        "run": run_metrics.to_dict(),
+        "series": [
+            {
+                "series": result.series,
+                "status": result.status,
+                "machines": result.machines,
+                "failures": result.failures,
+                "elapsed_seconds": round(result.elapsed, 6),
+                "metrics": result.metrics.to_dict() if result.metrics is not None else None,
+            }
+            for result in results
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    log_info(logger, f"Metrics written: {path}")
+
+
+def run_series(
+    series_infos: List[SeriesConfigBase],
+    found_by_series: Dict[str, List[Path]],
+    out_dir: Path,
+    args,
+    trusted: Optional[Dict[str, Set[str]]] = None,
+    full: bool = False,
+    resume: bool = False,
+) -> List[SeriesResult]:
+    """
+    Process all series concurrently. Each series reads its own archive and
+    writes its own output folder; the shared io_limiter keeps the total number
+    of machine directories read at once within --io-budget. trusted maps a
+    series to machines whose files are known to be unchanged. full and resume
+    apply to this run only (--full, --resume), so later --watch refreshes can
+    run incrementally with the same args.
+    """
+    io_budget = args.io_budget or args.workers * len(series_infos)
+    io_limiter = threading.BoundedSemaphore(io_budget)
+    # cProfile allows one active profiler per process (Python 3.12+), so profiled series run one at a time
+    series_workers = 1 if args.profile else max(1, len(series_infos))
+
+    with ThreadPoolExecutor(max_workers=series_workers, thread_name_prefix="series") as pool:
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                _run_series,
+                series_info,
+                found_by_series.get(series_info.series),
+                out_dir,
+                args,
+                io_limiter,
+                (trusted or {}).get(series_info.series),
+                full,
+                resume,
+            )
+            for series_info in series_infos
+        ]
+        return [future.result() for future in futures]
+
+
+def log_summary(results: List[SeriesResult]) -> None:
+    log_success(logger, f"{'Series':<10} {'Machines':>9} {'Failures':>9} {'Elapsed':>10}  Status")
+    for result in results:
+        log_success(
+            logger,
+            f"{result.series:<10} {result.machines:>9} {result.failures:>9} {result.elapsed:>9.1f}s  {result.status}",
+        )
+
+
+def watch_series(
+    series_infos: List[SeriesConfigBase],
+    found_by_series: Dict[str, List[Path]],
+    results: List[SeriesResult],
+    out_dir: Path,
+    args,
+) -> None:
+    """
+    Keep the outputs of the series current after the initial run: list the
+    repository roots every --watch seconds and refresh only the series with
+    new, changed or removed machines, re-reading only those machines.
+    """
+    watcher = RepositoryWatcher(series_infos, out_dir, args.watch_verify)
+    # The initial run refreshed every series; only failed ones start over
+    watcher.poll(found_by_series)
+    for result in results:
+        if result.status == "error":
+            watcher.forget(result.series)
+
+    log_info(logger, f"Watching {len(series_infos)} series every {args.watch:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.watch)
+            found_by_series = scan_repositories(series_infos, verbose=False)
+            refresh = watcher.poll(found_by_series)
+            if not refresh:
+                continue
+
+            for series, trusted in refresh.items():
+                checked = len(found_by_series[series]) - len(trusted)
+                log_info(logger, f"Refreshing '{series}': {checked} new or changed machines")
+            results = run_series(
+                [series_info for series_info in series_infos if series_info.series in refresh],
+                found_by_series,
+                out_dir,
+                args,
+                refresh,
+                # Refreshes are incremental and start from the outputs just written
+                full=False,
+                resume=False,
+            )
+            for result in results:
+                if result.status == "error":
+                    watcher.forget(result.series)
+            log_summary(results)
+    except KeyboardInterrupt:
+        log_info(logger, "Stopped watching.")
+
+
+def query_main(argv: List[str]) -> int:
+    """Look up machines in the SQLite index and print them as CSV."""
+    parser = argparse.ArgumentParser(prog="machine_config_parser query")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH / DEFAULT_DB_NAME,
+        help=f"SQLite index written with --sqlite (default: {DEFAULT_OUTFILES_PATH}/{DEFAULT_DB_NAME})"
+    )
+    parser.add_argument(
+        "--series",
+        nargs="+",
+        help="Restrict the lookup to these series"
+    )
+    parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="Condition NAME=VALUE, NAME!=VALUE or NAME~PATTERN (* as wildcard); repeatable, all must match"
+    )
+    parser.add_argument(
+        "--columns",
+        nargs="+",
+        default=[],
+        help="Attributes to print in addition to SERIES, TYPE, SN and SW_VERSION"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        rows = query_machines(args.db, args.series, args.where, args.columns)
+    except (FileNotFoundError, ValueError) as ex:
+        parser.error(str(ex))
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=["SERIES", "TYPE", "SN", "SW_VERSION", *args.columns])
+    writer.writeheader()
+    writer.writerows(rows)
+    return 0
+
+
+def diff_main(argv: List[str]) -> int:
+    """Print the changes of a series between two snapshots as CSV."""
+    parser = argparse.ArgumentParser(prog="machine_config_parser diff")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH / DEFAULT_SNAPSHOT_DB_NAME,
+        help=f"Snapshot database written with --snapshots (default: {DEFAULT_OUTFILES_PATH}/{DEFAULT_SNAPSHOT_DB_NAME})"
+    )
+    parser.add_argument(
+        "--series",
+        required=True,
+        help="Series to compare"
+    )
+    parser.add_argument(
+        "--from",
+        dest="old",
+        help="Snapshot id, or a date / ISO timestamp for the last snapshot taken by then (default: previous snapshot)"
+    )
+    parser.add_argument(
+        "--to",
+        dest="new",
+        help="Snapshot id, date or ISO timestamp (default: latest snapshot)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        diff = diff_snapshots(args.db, args.series, args.old, args.new)
+    except (FileNotFoundError, ValueError) as ex:
+        parser.error(str(ex))
+
+    log_info(
+        logger,
+        f"{args.series} snapshot {diff.old_id} -> {diff.new_id}: {len(diff.added)} added, "
+        f"{len(diff.removed)} removed, {diff.changed_machines} changed",
+    )
+    writer = csv.DictWriter(sys.stdout, fieldnames=["CHANGE", "TYPE", "SN", "ATTRIBUTE", "OLD", "NEW"])
+    writer.writeheader()
+    writer.writerows(diff.rows())
+    return 0
+
+
 def main():
+    if sys.argv[1:2] == ["query"]:
+        sys.exit(query_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["diff"]:
+        sys.exit(diff_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         formatter_class=lambda prog: argparse.RawDescriptionHelpFormatter(
             prog, width=200, max_help_position=50
@@ -32,76 +471,240 @@ def main():
         action="store_true",
         help="Export results as JSON"
     )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Export results as Parquet (typed, dictionary-encoded columns)"
+    )
+    parser.add_argument(
+        "--feather",
+        action="store_true",
+        help="Export results as Arrow IPC / Feather"
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        nargs="?",
+        const=Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH / DEFAULT_DB_NAME,
+        help=f"Keep machines in a SQLite index for fast lookups (default path: {DEFAULT_OUTFILES_PATH}/{DEFAULT_DB_NAME})"
+    )
+    parser.add_argument(
+        "--sqlite-index-attrs",
+        nargs="+",
+        default=[],
+        help="Attributes that get their own index in the SQLite index"
+    )
+    parser.add_argument(
+        "--snapshots",
+        type=Path,
+        nargs="?",
+        const=Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH / DEFAULT_SNAPSHOT_DB_NAME,
+        help=f"Record a versioned snapshot of every series that changed, for the diff subcommand (default path: {DEFAULT_OUTFILES_PATH}/{DEFAULT_SNAPSHOT_DB_NAME})"
+    )
+    parser.add_argument(
+        "--mu-vars",
+        nargs="+",
+        default=[],
+        metavar="NAME",
+        help="Additional MU config variables (e.g. HMICFGgnStations) stored as machine attributes"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of machine directories read in parallel (default: 1)"
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="Read machines on threads (network shares) or parse them in worker processes (local disk / cache)"
+    )
+    parser.add_argument(
+        "--pipeline",
+        choices=["sync", "async"],
+        default="sync",
+        help="async: run scan, read (--workers readers), parse and write as concurrent stages with bounded queues"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"Capacity of each queue between --pipeline async stages (default: {DEFAULT_QUEUE_SIZE})"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-parse every machine instead of reusing unchanged ones from the manifest"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted series from their checkpoint journal instead of starting over"
+    )
+    parser.add_argument(
+        "--io-budget",
+        type=int,
+        default=0,
+        help="Maximum machine directories read at once across all series (default: workers x series)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Mirror the remote MU config and CSP files in this local cache directory"
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f"Size cap of the local cache; least recently used files are evicted (default: {DEFAULT_CACHE_SIZE_MB})"
+    )
+
+    parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=DEFAULT_MEMO_ENTRIES,
+        help=f"Parsed CSP files kept in memory by content hash; 0 disables (default: {DEFAULT_MEMO_ENTRIES})"
+    )
+    parser.add_argument(
+        "--memo-store",
+        type=Path,
+        help="SQLite file that keeps parsed CSP files between runs"
+    )
+
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=0.0,
+        help="Seconds before a file operation on the share is retried; 0 disables timeouts (default: 0)"
+    )
+    parser.add_argument(
+        "--read-retries",
+        type=int,
+        default=DEFAULT_READ_RETRIES,
+        help=f"Hedged retries after a timeout before the machine is deferred (default: {DEFAULT_READ_RETRIES})"
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=DEFAULT_RETRY_BACKOFF,
+        help=f"Initial backoff in seconds between retries, doubled each time (default: {DEFAULT_RETRY_BACKOFF})"
+    )
+    parser.add_argument(
+        "--deferred-timeout",
+        type=float,
+        default=DEFAULT_DEFERRED_TIMEOUT,
+        help=f"Timeout for deferred machines retried at the end of a series (default: {DEFAULT_DEFERRED_TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        help="Write stage timings, counters and per-machine latency percentiles to this JSON file"
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        nargs="?",
+        const=DEFAULT_WATCH_INTERVAL,
+        metavar="SECONDS",
+        help=f"After the run, poll the repositories every SECONDS (default: {DEFAULT_WATCH_INTERVAL:g}) and refresh the outputs of series whose machines changed"
+    )
+    parser.add_argument(
+        "--watch-verify",
+        type=float,
+        default=DEFAULT_VERIFY_INTERVAL,
+        metavar="SECONDS",
+        help=f"With --watch, seconds between checks of the files of all known machines (default: {DEFAULT_VERIFY_INTERVAL:g})"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write a cProfile report per series next to its output (<name>.profile.txt / .pstats)"
+    )
 
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.io_budget < 0:
+        parser.error("--io-budget must not be negative")
+    if args.queue_size < 1:
+        parser.error("--queue-size must be at least 1")
+    if args.watch is not None and args.watch <= 0:
+        parser.error("--watch interval must be positive")
+    if args.pipeline == "async" and args.executor == "process":
+        parser.error("--pipeline async reads and parses on threads; it cannot be combined with --executor process")
+
     # Ensure at least one output format if XML is not the final target
-    if not (args.csv or args.json):
+    if not (args.csv or args.json or args.parquet or args.feather or args.sqlite or args.snapshots):
         log_warning(logger, "No export format selected. Only XML will be generated.")
 
     # Create output directory
     out_dir = Path(__file__).parent.parent / DEFAULT_OUTFILES_PATH
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for series in args.series:
+    file_cache = None
+    if args.cache_dir:
+        file_cache = FileCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+        set_file_cache(file_cache)
+        log_info(logger, f"Using file cache '{args.cache_dir}' ({file_cache.total_bytes // (1024 * 1024)} MB in use)")
 
-        log_info(logger, f"Processing series '{series}'")
+    io_policy = None
+    if args.read_timeout > 0:
+        io_policy = IoPolicy(args.read_timeout, args.read_retries, args.retry_backoff, args.deferred_timeout)
+        set_io_policy(io_policy)
 
-        # Load config for this series
+    parse_memo = None
+    if args.memo_size > 0:
+        parse_memo = ParseMemo(args.memo_size, args.memo_store)
+        set_parse_memo(parse_memo)
+
+    # Load config for every requested series
+    series_infos: List[SeriesConfigBase] = []
+    for series in dict.fromkeys(args.series):
         series_info = get_series_info(series)
         if series_info is None:
             log_error(logger, f"Invalid series '{series}'.")
             log_warning(logger, f"Supported: {', '.join(get_supported_series())}.")
             continue
+        series_infos.append(series_info.with_mu_variables({name: name for name in args.mu_vars}))
 
-        # Validate repository path
-        repo_path = Path(series_info.repository_path)
-        log_info(logger, f"Checking repository path '{repo_path}'")
-
-        if not repo_path.exists():
-            log_error(logger, "Repository path not found.")
-            continue
-
-        log_info(logger, "Repository path exists.")
+    process_pool = None
+    if args.executor == "process":
+        process_pool = create_process_pool(args.workers, file_cache, io_policy, args.memo_size, args.memo_store)
+        set_process_pool(process_pool)
+        log_info(logger, f"Parsing machines in {args.workers} worker processes")
 
-        # Scan directories
-        found_dirs = find_directories(str(repo_path), series_info.regex_pattern)
-        if not found_dirs:
-            log_error(logger, f"No directories found matching pattern for '{series}'")
-            continue
+    run_metrics = RunMetrics("run")
+    found_by_series = scan_repositories(series_infos, run_metrics)
+    try:
+        with run_metrics.stage("series"):
+            results = run_series(series_infos, found_by_series, out_dir, args, full=args.full, resume=args.resume)
+        log_summary(results)
 
-        log_info(logger, f"Found {len(found_dirs)} matching directories.")
+        if args.metrics_out:
+            write_metrics(args.metrics_out, run_metrics, results)
 
-        # Generate XML
-        xml_output_name = series_info.out_file_name
-        xml_path = out_dir / xml_output_name
+        if args.watch is not None:
+            watch_series(series_infos, found_by_series, results, out_dir, args)
+    finally:
+        if process_pool is not None:
+            set_process_pool(None)
+            process_pool.shutdown()
 
-        log_info(logger, f"Generating '{xml_output_name}'...")
-        try:
-            get_machine_data_from_directories(found_dirs, out_dir, series_info)
-        except Exception as ex:
-            log_exception(logger, "Error generating XML", ex)
-            continue
+    if file_cache is not None:
+        log_info(logger, f"File cache: {file_cache.hits} hits, {file_cache.misses} misses")
 
-        log_info(logger, f"Generated XML: {xml_path}")
-
-        # CSV Export
-        if args.csv:
-            csv_path = xml_path.with_suffix(".csv")
-            try:
-                convert_xml_to_csv(xml_path, csv_path)
-                log_info(logger, f"Generated CSV: {csv_path}")
-            except Exception as ex:
-                log_exception(logger, "Error generating CSV", ex)
-
-        # JSON Export
-        if args.json:
-            json_path = xml_path.with_suffix(".json")
-            try:
-                convert_xml_to_json(xml_path, json_path)
-                log_info(logger, f"Generated JSON: {json_path}")
-            except Exception as ex:
-                log_exception(logger, "Error generating JSON", ex)
+    if parse_memo is not None:
+        # With --executor process the workers keep their own memos and report to the series metrics
+        hits, misses = parse_memo.hits, parse_memo.misses
+        if process_pool is not None:
+            counters = [result.metrics.counters for result in results if result.metrics is not None]
+            hits = sum(c.get("memo_hits", 0) for c in counters)
+            misses = sum(c.get("memo_misses", 0) for c in counters)
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        log_info(logger, f"Parse memo: {hits} hits, {misses} misses ({hit_rate:.1%} hit rate)")
+        parse_memo.close()
 
 if __name__ == "__main__":
     main()
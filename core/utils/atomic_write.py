@@ -0,0 +1,66 @@
+"""Replace output files in one step, so readers never see a partially written file."""
+
+import glob
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# A reader holding the target open on Windows makes os.replace fail for a moment
+REPLACE_RETRIES = 10
+REPLACE_RETRY_DELAY = 0.2
+
+# Temporary files untouched for this long were left by a run that was killed
+STALE_TEMPORARY_SECONDS = 60 * 60
+
+
+def temporary_path(path: Path) -> Path:
+    """Sibling of path to write to first; on the same volume, so the rename is atomic."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+def remove_stale_temporaries(path: Path) -> None:
+    """
+    Delete the temporary siblings of path that killed runs left behind.
+    Files another run is still writing are recent (or locked) and are kept.
+    """
+    path = Path(path)
+    own_path = temporary_path(path)
+    stale_before = time.time() - STALE_TEMPORARY_SECONDS
+    for tmp_path in path.parent.glob(f"{glob.escape(path.name)}.*.tmp"):
+        try:
+            if tmp_path != own_path and tmp_path.stat().st_mtime < stale_before:
+                tmp_path.unlink()
+        except OSError:
+            continue
+
+
+def replace_file(tmp_path: Path, path: Path) -> None:
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
+
+
+@contextmanager
+def atomic_output(path: Path) -> Iterator[Path]:
+    """
+    Yield a temporary path to write the new content to. It replaces path
+    when the block completes and is removed if the block fails, leaving the
+    previous file in place.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    remove_stale_temporaries(path)
+    tmp_path = temporary_path(path)
+    try:
+        yield tmp_path
+        replace_file(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
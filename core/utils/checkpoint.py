@@ -0,0 +1,91 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .definitions import SeriesConfigBase
+from .manifest import FileSignature
+
+DEFAULT_FSYNC_EVERY = 50
+
+
+def get_checkpoint_path(output_directory: Path, series_info: SeriesConfigBase) -> Path:
+    return output_directory / Path(series_info.out_file_name).with_suffix(".checkpoint.jsonl")
+
+
+def _load_entries(path: Path) -> Tuple[Dict[str, dict], int]:
+    """Journal entries by directory name and the size of the valid part; a torn last line is ignored."""
+    entries: Dict[str, dict] = {}
+    valid_size = 0
+    if not Path(path).is_file():
+        return entries, valid_size
+
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            entries[entry["dir"]] = entry
+            valid_size += len(line)
+    return entries, valid_size
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the machines finished in the current run.
+
+    Every entry is flushed to the OS immediately and fsync'ed in batches, so
+    an interrupted run loses at most the machines that were in flight.
+    Entries keep the manifest signature of the machine's files when there is
+    one, so a resumed run can hand completed machines on to the manifest.
+    """
+
+    def __init__(self, path: Path, resume: bool = False, fsync_every: int = DEFAULT_FSYNC_EVERY):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.completed: Dict[str, Dict[str, str]] = {}
+        self.signatures: Dict[str, FileSignature] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and self.path.is_file():
+            entries, valid_size = _load_entries(self.path)
+            for name, entry in entries.items():
+                self.completed[name] = entry["attributes"]
+                if entry.get("files") is not None:
+                    self.signatures[name] = entry["files"]
+            self._file = open(self.path, "r+b")
+            self._file.truncate(valid_size)
+            self._file.seek(valid_size)
+        else:
+            self._file = open(self.path, "wb")
+        self._unsynced = 0
+
+    def record(self, dir_name: str, attributes: Dict[str, str], signature: Optional[FileSignature] = None) -> None:
+        if dir_name in self.completed:
+            return
+        entry = {"dir": dir_name, "attributes": attributes}
+        if signature is not None:
+            entry["files"] = signature
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        self._file.write(line.encode("utf-8"))
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def finish(self) -> None:
+        """The run completed and its outputs are final; the journal is no longer needed."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -1,5 +1,4 @@
 from pathlib import Path
-import pandas as pd
 
 
 def convert_xml_to_csv(xml_path: Path, csv_path: Path):
@@ -9,6 +8,8 @@ def convert_xml_to_csv(xml_path: Path, csv_path: Path):
     if not xml_path.exists():
         raise FileNotFoundError(f"XML file not found: {xml_path}")
 
+    import pandas as pd
+
     try:
         df = pd.read_xml(xml_path)
     except Exception as exc:
@@ -27,6 +28,8 @@ def convert_xml_to_json(xml_path: Path, json_path: Path):
     if not xml_path.exists():
         raise FileNotFoundError(f"XML file not found: {xml_path}")
 
+    import pandas as pd
+
     try:
         df = pd.read_xml(xml_path)
     except Exception as exc:
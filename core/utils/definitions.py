@@ -1,5 +1,8 @@
+import copy
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+
+from .mu_config import DEFAULT_MU_VARIABLES
 
 class SeriesConfigBase:
     def __init__(
@@ -9,7 +12,8 @@ class SeriesConfigBase:
         regex_pattern: str,
         csp_files: List[str],
         mu_config_file: str,
-        out_file_name: str
+        out_file_name: str,
+        mu_variables: Optional[Dict[str, str]] = None
     ):
         self.series = series
         self.repository_path = Path(repository_path)
@@ -17,12 +21,23 @@ class SeriesConfigBase:
         self.csp_files = csp_files
         self.mu_config_file = mu_config_file
         self.out_file_name = out_file_name
+        # MU config variable -> machine attribute
+        self.mu_variables = dict(DEFAULT_MU_VARIABLES if mu_variables is None else mu_variables)
+
+    def with_mu_variables(self, mu_variables: Dict[str, str]) -> "SeriesConfigBase":
+        """Copy of this config that also reads mu_variables; the shared config is not changed."""
+        series_info = copy.copy(self)
+        series_info.mu_variables = {**self.mu_variables, **mu_variables}
+        return series_info
 
     def __repr__(self):
         return f"<{self.series} Config @ {self.repository_path}>"
 
 DEFAULT_OUTFILES_PATH: Path = Path("output")
 
+# Capacity of each queue between the --pipeline async stages (see pipeline.py)
+DEFAULT_QUEUE_SIZE = 32
+
 ALL_SERIES_CONFIGS: List[SeriesConfigBase] = [
     SeriesConfigBase(
         "Wxxx",
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .logger import configure_logger, log_warning
+
+logger = configure_logger(__name__)
+
+DEFAULT_CACHE_SIZE_MB = 1024
+
+# Layout: <root>/<first two hex digits>/<sha256 hex digest of remote path, size and mtime>
+FAN_OUT_PATTERN = re.compile(r"^[0-9a-f]{2}$")
+ENTRY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+TMP_PATTERN = re.compile(r"^[0-9a-f]{64}\.\d+\.\d+\.tmp$")
+
+# Temp files older than this are left over from a crashed run
+STALE_TMP_SECONDS = 3600
+
+
+class FileCache:
+    """
+    Local on-disk mirror of remote config files.
+
+    Entries are keyed by remote path plus size and mtime, so a changed remote
+    file simply maps to a new entry. The total size is capped; the least
+    recently used entries are evicted first. Usage order is persisted through
+    the mtime of the cached files, so it survives between runs.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        entries = []
+        for fan_out in self.root.iterdir():
+            if not (fan_out.is_dir() and FAN_OUT_PATTERN.match(fan_out.name)):
+                continue
+            for entry_path in fan_out.iterdir():
+                # Only files named like cache entries are ours; anything else in the directory is left alone
+                if ENTRY_PATTERN.match(entry_path.name) and entry_path.name[:2] == fan_out.name:
+                    st = entry_path.stat()
+                    entries.append((st.st_mtime_ns, entry_path.name, st.st_size))
+                elif TMP_PATTERN.match(entry_path.name) and entry_path.name[:2] == fan_out.name:
+                    self._remove_stale_tmp(entry_path)
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def _remove_stale_tmp(tmp_path: Path) -> None:
+        # Other processes sharing the cache may still be writing their temp files
+        try:
+            if time.time() - tmp_path.stat().st_mtime > STALE_TMP_SECONDS:
+                tmp_path.unlink()
+        except OSError:
+            pass
+
+    @staticmethod
+    def make_key(remote_path: Path, size: int, mtime_ns: int) -> str:
+        return hashlib.sha256(f"{remote_path}|{size}|{mtime_ns}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def read_bytes(self, remote_path: Path) -> Optional[bytes]:
+        """
+        Return the content of remote_path, from the local copy when it is
+        cached and copying it on a miss, or None when the remote file does
+        not exist.
+
+        A hit is opened while the lock is held, so a concurrent eviction
+        cannot remove the entry between the lookup and the open.
+        """
+        try:
+            st = os.stat(remote_path)
+        except FileNotFoundError:
+            return None
+
+        key = self.make_key(remote_path, st.st_size, st.st_mtime_ns)
+        local_path = self._entry_path(key)
+
+        cached_file = None
+        with self._lock:
+            if key in self._entries:
+                try:
+                    cached_file = open(local_path, "rb")
+                    os.utime(local_path)
+                    self._entries.move_to_end(key)
+                except FileNotFoundError:
+                    # Removed behind our back; copy it again
+                    self._total_bytes -= self._entries.pop(key)
+        if cached_file is not None:
+            with cached_file:
+                data = cached_file.read()
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        try:
+            data = Path(remote_path).read_bytes()
+        except FileNotFoundError:
+            return None
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per thread and process; worker processes may share the cache directory
+        tmp_path = local_path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, local_path)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = len(data)
+                self._total_bytes += len(data)
+            self._evict(keep=key)
+        return data
+
+    def _evict(self, keep: str) -> None:
+        # Caller holds the lock
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                self._entries.move_to_end(key)
+                continue
+            try:
+                self._entry_path(key).unlink(missing_ok=True)
+            except OSError as ex:
+                # Still open elsewhere (Windows); retry on a later eviction
+                log_warning(logger, f"Could not evict cache entry {key}: {ex}")
+                self._entries.move_to_end(key)
+                break
+            del self._entries[key]
+            self._total_bytes -= size
@@ -1,9 +1,33 @@
 from pathlib import Path
 import re
-from typing import List
+from typing import Dict, List
 import os
 
 def find_directories(path: str, regex_pattern: str) -> List[Path]:
     pattern = re.compile(regex_pattern)
     with os.scandir(path) as it:
         return [Path(entry.path) for entry in it if entry.is_dir() and pattern.match(entry.name)]
+
+def find_series_directories(path: str, patterns: Dict[str, str]) -> Dict[str, List[Path]]:
+    """
+    List path once and route each matching directory to its series.
+
+    patterns maps series name to its regex_pattern. They are combined into one
+    compiled regex that rejects unrelated entries in a single match, so the
+    listing cost barely grows with the number of series sharing a root.
+    Entries that pass are then matched against each series pattern, so an
+    entry matching several patterns goes to every one of those series.
+    """
+    compiled = {name: re.compile(pattern) for name, pattern in patterns.items()}
+    prefilter = re.compile("|".join(f"(?:{pattern})" for pattern in patterns.values()))
+    found: Dict[str, List[Path]] = {name: [] for name in patterns}
+
+    with os.scandir(path) as it:
+        for entry in it:
+            if not prefilter.match(entry.name) or not entry.is_dir():
+                continue
+            entry_path = Path(entry.path)
+            for name, pattern in compiled.items():
+                if pattern.match(entry.name):
+                    found[name].append(entry_path)
+    return found
@@ -0,0 +1,151 @@
+import contextvars
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, List, TypeVar
+
+from .metrics import count
+
+T = TypeVar("T")
+
+DEFAULT_READ_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_DEFERRED_TIMEOUT = 120.0
+
+# Threads shared by all file operation attempts; stuck attempts hold one each until they return
+IO_ATTEMPT_WORKERS = 32
+
+# Set while deferred machines are retried at the end of a series, see IoPolicy.slow_path
+_slow_path: contextvars.ContextVar[bool] = contextvars.ContextVar("io_slow_path", default=False)
+
+
+def enter_slow_path() -> contextvars.Token:
+    """Switch the current context to the deferred (single long attempt) mode; undo with IoPolicy.reset."""
+    return _slow_path.set(True)
+
+
+def in_slow_path() -> bool:
+    """Whether the current context runs deferred work, see IoPolicy.slow_path."""
+    return _slow_path.get()
+
+
+class AttemptExecutor:
+    """
+    Small pool of daemon threads for file operation attempts.
+
+    concurrent.futures.ThreadPoolExecutor joins its threads at interpreter
+    exit, so a read hanging on the file server would keep the process alive;
+    these threads are daemons and are started only when no idle one is left.
+    """
+
+    def __init__(self, max_workers: int = IO_ATTEMPT_WORKERS):
+        self.max_workers = max_workers
+        self.threads = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._backlog = 0
+
+    def submit(self, fn: Callable[..., T], *args) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._queue.put((future, fn, args))
+            if self._idle:
+                self._idle -= 1
+            elif self.threads < self.max_workers:
+                self.threads += 1
+                threading.Thread(target=self._work, daemon=True, name=f"io-attempt-{self.threads}").start()
+            else:
+                self._backlog += 1
+        return future
+
+    def _work(self) -> None:
+        while True:
+            future, fn, args = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                self._release()
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as ex:
+                self._release()
+                future.set_exception(ex)
+            else:
+                # Free the thread before waking the caller, whose next attempt can then reuse it
+                self._release()
+                future.set_result(result)
+
+    def _release(self) -> None:
+        with self._lock:
+            # Either pick up work that found no free thread or wait as an idle thread
+            if self._backlog:
+                self._backlog -= 1
+            else:
+                self._idle += 1
+
+
+_attempts = AttemptExecutor()
+
+
+class ReadTimeoutError(TimeoutError):
+    """A file operation did not finish within the configured timeout and retries."""
+
+
+class IoPolicy:
+    """
+    Run blocking file operations under a timeout with hedged retries.
+
+    When an attempt exceeds `timeout`, a new attempt is started after an
+    exponential backoff while the earlier ones keep running; whichever
+    finishes first wins. Attempts run on a shared pool of daemon threads, so a
+    read stuck on the file server can be abandoned without blocking the process. When all
+    attempts time out, ReadTimeoutError is raised and the caller can defer the
+    work. Deferred work runs inside slow_path(), where a single attempt gets
+    `deferred_timeout`.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        retries: int = DEFAULT_READ_RETRIES,
+        backoff: float = DEFAULT_RETRY_BACKOFF,
+        deferred_timeout: float = DEFAULT_DEFERRED_TIMEOUT,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.deferred_timeout = deferred_timeout
+
+    @staticmethod
+    def _start(fn: Callable[..., T], args: tuple) -> Future:
+        # Attempts run in the caller's context so metrics and log prefixes carry over
+        return _attempts.submit(contextvars.copy_context().run, fn, *args)
+
+    def call(self, fn: Callable[..., T], *args) -> T:
+        if _slow_path.get():
+            timeout, retries = self.deferred_timeout, 0
+        else:
+            timeout, retries = self.timeout, self.retries
+
+        attempts: List[Future] = [self._start(fn, args)]
+        for attempt in range(retries + 1):
+            done, _ = wait(attempts, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done and attempt < retries:
+                # Keep waiting on the running attempts during the backoff
+                done, _ = wait(attempts, timeout=self.backoff * 2 ** attempt, return_when=FIRST_COMPLETED)
+                if not done:
+                    count("read_retries")
+                    attempts.append(self._start(fn, args))
+            if done:
+                return next(iter(done)).result()
+
+        count("read_timeouts")
+        raise ReadTimeoutError(f"timed out after {len(attempts)} attempt(s) of {timeout:g}s")
+
+    def slow_path(self) -> contextvars.Token:
+        """Switch the current context to the deferred (single long attempt) mode."""
+        return enter_slow_path()
+
+    @staticmethod
+    def reset(token: contextvars.Token) -> None:
+        _slow_path.reset(token)
@@ -1,10 +1,35 @@
 """Centralized logging configuration for Machine Config Parser."""
 
+import contextvars
 import logging
-from colorama import init, Fore
+import threading
 
-# Initialize colorama for cross-platform colored terminal output
-init(autoreset=True)
+# colorama's Fore, initialized on the first log call so that imports stay cheap
+_fore = None
+_fore_lock = threading.Lock()
+
+# Prefix added to every log line, e.g. "[Wxxx] " while a series is processed
+_log_context: contextvars.ContextVar[str] = contextvars.ContextVar("log_context", default="")
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _log_context.get()
+        return True
+
+
+def set_log_context(prefix: str) -> None:
+    """
+    Set the prefix for log lines emitted from the current context.
+
+    Worker threads do not inherit it automatically; submit their work through
+    contextvars.copy_context().run to keep the prefix.
+    """
+    _log_context.set(prefix)
+
+
+def get_log_context() -> str:
+    return _log_context.get()
 
 
 def configure_logger(name: str, level: int = logging.INFO) -> logging.Logger:
@@ -27,35 +52,52 @@ def configure_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         # Create console handler with formatting
         handler = logging.StreamHandler()
         formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)-8s] %(name)s: %(message)s",
+            "%(asctime)s [%(levelname)-8s] %(name)s: %(context)s%(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         handler.setFormatter(formatter)
+        handler.addFilter(_ContextFilter())
         logger.addHandler(handler)
     
     return logger
 
 
+def _colors():
+    """Initialize colorama for cross-platform colored terminal output on first use."""
+    global _fore
+    with _fore_lock:
+        if _fore is None:
+            from colorama import init, Fore
+            init(autoreset=True)
+            _fore = Fore
+    return _fore
+
+
 def log_info(logger: logging.Logger, message: str) -> None:
     """Log an info message."""
-    logger.info(f"{Fore.CYAN}{message}{Fore.RESET}")
+    fore = _colors()
+    logger.info(f"{fore.CYAN}{message}{fore.RESET}")
 
 
 def log_success(logger: logging.Logger, message: str) -> None:
     """Log a success message (green)."""
-    logger.info(f"{Fore.GREEN}{message}{Fore.RESET}")
+    fore = _colors()
+    logger.info(f"{fore.GREEN}{message}{fore.RESET}")
 
 
 def log_warning(logger: logging.Logger, message: str) -> None:
     """Log a warning message (yellow)."""
-    logger.warning(f"{Fore.YELLOW}{message}{Fore.RESET}")
+    fore = _colors()
+    logger.warning(f"{fore.YELLOW}{message}{fore.RESET}")
 
 
 def log_error(logger: logging.Logger, message: str) -> None:
     """Log an error message (red)."""
-    logger.error(f"{Fore.RED}{message}{Fore.RESET}")
+    fore = _colors()
+    logger.error(f"{fore.RED}{message}{fore.RESET}")
 
 
 def log_exception(logger: logging.Logger, message: str, exc: Exception) -> None:
     """Log an exception with context."""
-    logger.exception(f"{Fore.RED}{message}: {exc}{Fore.RESET}")
+    fore = _colors()
+    logger.exception(f"{fore.RED}{message}: {exc}{fore.RESET}")
@@ -1,25 +1,210 @@
-import re
+import contextvars
+import io
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple
-from utils.definitions import SeriesConfigBase
-from utils.logger import configure_logger, log_info, log_warning, log_error
+from typing import Dict, Iterator, List, Optional, Tuple
+from .definitions import SeriesConfigBase
+from .checkpoint import CheckpointJournal
+from .file_cache import FileCache
+from .io_policy import IoPolicy, ReadTimeoutError, in_slow_path
+from .mu_config import MuValue, format_mu_value, scan_mu_config
+from .parse_memo import ParseMemo, get_content_key
+from .manifest import MachineManifest
+from .metrics import RunMetrics, count, current_metrics, measure, set_current_metrics, stage
+from .logger import configure_logger, get_log_context, set_log_context, log_info, log_warning, log_error
+from .sinks import SinkSet, XmlSink
 
 logger = configure_logger(__name__)
 
 CS_NAMESPACE = {"cs": "http://www.codesmithtools.com/schema/csp.xsd"}
 
-def get_codesmith_nodes(file_path: Path, node_name: str = "property") -> List[ET.Element]:
-    if not file_path.is_file():
-        log_warning(logger, f"File not found: {file_path}")
-        return []
+_NOT_LOADED = object()
+
+# lxml module, None when it is not installed; imported on the first parse, see _get_lxml
+lxml_etree = _NOT_LOADED
+
+# Process-wide local mirror of the remote config files, see set_file_cache
+_file_cache: Optional[FileCache] = None
+
+def set_file_cache(file_cache: Optional[FileCache]) -> None:
+    """Read every MU config and CSP file through file_cache (None reads the share directly)."""
+    global _file_cache
+    _file_cache = file_cache
+
+# Process-wide memo of parsed CSP files keyed by content, see set_parse_memo
+_parse_memo: Optional[ParseMemo] = None
+
+def set_parse_memo(parse_memo: Optional[ParseMemo]) -> None:
+    """Serve byte-identical CSP files from parse_memo instead of parsing them again."""
+    global _parse_memo
+    _parse_memo = parse_memo
+
+# Process-wide timeouts and retries for file operations, see set_io_policy
+_io_policy: Optional[IoPolicy] = None
+
+def set_io_policy(io_policy: Optional[IoPolicy]) -> None:
+    """Run every file operation on the share under io_policy (None runs them directly)."""
+    global _io_policy
+    _io_policy = io_policy
+
+# Worker processes that extract machines instead of threads, see set_process_pool
+_process_pool: Optional["ProcessPoolExecutor"] = None
+
+# Machine directories sent to a worker process at once
+PROCESS_BATCH_SIZE = 16
+
+def set_process_pool(process_pool: Optional["ProcessPoolExecutor"]) -> None:
+    """Extract machines on this process pool; the caller shuts it down."""
+    global _process_pool
+    _process_pool = process_pool
+
+def create_process_pool(
+    workers: int,
+    file_cache: Optional[FileCache] = None,
+    io_policy: Optional[IoPolicy] = None,
+    memo_entries: int = 0,
+    memo_store: Optional[Path] = None,
+) -> "ProcessPoolExecutor":
+    """
+    Start worker processes configured like this one. Workers use the same
+    cache directory, io policy and memo store; each keeps its own in-memory
+    parse memo.
+    """
+    # Only --executor process needs these; keep them out of CLI startup
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_config = None if file_cache is None else (file_cache.root, file_cache.max_bytes)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        # Same behaviour on Linux and Windows, and safe while series threads are running
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_process_worker,
+        initargs=(cache_config, io_policy, memo_entries, memo_store),
+    )
+
+def _init_process_worker(
+    cache_config, io_policy: Optional[IoPolicy], memo_entries: int, memo_store: Optional[Path]
+) -> None:
+    set_file_cache(FileCache(*cache_config) if cache_config is not None else None)
+    set_io_policy(io_policy)
+    parse_memo = ParseMemo(memo_entries, memo_store) if memo_entries > 0 else None
+    if parse_memo is not None:
+        import multiprocessing.util
+
+        # Pool workers leave through os._exit, which skips atexit; write the last batch to the store
+        multiprocessing.util.Finalize(parse_memo, parse_memo.close, exitpriority=10)
+    set_parse_memo(parse_memo)
+
+def _guarded(fn, *args):
+    if _io_policy is None:
+        return fn(*args)
+    return _io_policy.call(fn, *args)
+
+def resolve_config_file(file_path: Path) -> Optional[Path]:
+    """Return file_path if it exists on the share, or None. Reads through the file cache use read_config_file."""
+    with measure("resolve"):
+        return file_path if _guarded(file_path.is_file) else None
+
+def read_config_bytes(local_path: Path) -> bytes:
+    data = _guarded(local_path.read_bytes)
+    count("bytes_read", len(data))
+    count("files_read")
+    return data
+
+def read_config_file(file_path: Path) -> Optional[bytes]:
+    """Content of a config file, from the file cache when one is set, or None if it does not exist."""
+    if _file_cache is None:
+        local_path = resolve_config_file(file_path)
+        return None if local_path is None else read_config_bytes(local_path)
+
+    with measure("resolve"):
+        data = _guarded(_file_cache.read_bytes, file_path)
+    if data is not None:
+        count("bytes_read", len(data))
+        count("files_read")
+    return data
 
+def _get_lxml():
+    global lxml_etree
+    if lxml_etree is _NOT_LOADED:
+        try:
+            from lxml import etree as lxml_etree
+        except ImportError:  # pragma: no cover - lxml is optional
+            lxml_etree = None
+    return lxml_etree
+
+
+def get_parse_errors() -> tuple:
+    lxml = _get_lxml()
+    return (ET.ParseError,) if lxml is None else (ET.ParseError, lxml.XMLSyntaxError)
+
+
+def iter_codesmith_properties(source, node_name: str = "property") -> Iterator[Tuple[str, str]]:
+    """
+    Stream (name, text) pairs of the CodeSmith nodes in source (a path or a
+    binary file object) in document order.
+
+    Elements are cleared as soon as they have been read, so memory stays flat
+    regardless of the file size. lxml is used when it is installed.
+    """
+    tag = f"{{{CS_NAMESPACE['cs']}}}{node_name}"
+
+    lxml = _get_lxml()
+    if lxml is not None:
+        for _, elem in lxml.iterparse(source, events=("end",), tag=tag):
+            yield elem.get("name"), elem.text or ""
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        return
+
+    for _, elem in ET.iterparse(source, events=("end",)):
+        if elem.tag == tag:
+            yield elem.get("name"), elem.text or ""
+        elem.clear()
+
+def parse_codesmith_bytes(data: bytes, node_name: str = "property") -> List[Tuple[str, str]]:
+    """Parse a CSP file that was already read, through the parse memo when one is set."""
+    if _parse_memo is None:
+        return list(iter_codesmith_properties(io.BytesIO(data), node_name=node_name))
+
+    key = get_content_key(data, node_name)
+    nodes = _parse_memo.get(key)
+    if nodes is None:
+        count("memo_misses")
+        nodes = list(iter_codesmith_properties(io.BytesIO(data), node_name=node_name))
+        _parse_memo.put(key, nodes)
+    else:
+        count("memo_hits")
+    return list(nodes)
+
+def get_codesmith_properties(file_path: Path, node_name: str = "property") -> List[Tuple[str, str]]:
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        nodes = root.findall(f".//cs:{node_name}", CS_NAMESPACE)
-        return nodes
-    except ET.ParseError as e:
+        if _parse_memo is None and _io_policy is None and _file_cache is None:
+            local_path = resolve_config_file(file_path)
+            if local_path is None:
+                log_warning(logger, f"File not found: {file_path}")
+                return []
+            with measure("csp_read_parse"), open(local_path, "rb") as f:
+                nodes = list(iter_codesmith_properties(f, node_name=node_name))
+                count("bytes_read", f.tell())
+            count("files_read")
+            return nodes
+
+        # Read up front: the read can then be timed out and its bytes hashed
+        data = read_config_file(file_path)
+        if data is None:
+            log_warning(logger, f"File not found: {file_path}")
+            return []
+        with measure("csp_read_parse"):
+            return parse_codesmith_bytes(data, node_name)
+    except get_parse_errors() as e:
         log_error(logger, f"Failed to parse {file_path}: {e}")
         return []
 
@@ -27,47 +212,399 @@ def get_file_nodes(base_path: Path, files: List[str], node_name: str = "property
     node_list: List[Tuple[str, str]] = []
     for file in files:
         file_path = base_path / file
-        nodes = get_codesmith_nodes(file_path, node_name=node_name)
+        nodes = get_codesmith_properties(file_path, node_name=node_name)
         if nodes:
-            for node in nodes:
-                name = node.get("name")
-                value = node.text or ""
-                node_list.append((name, value))
+            node_list.extend(nodes)
         else:
             log_warning(logger, f"File '{file}' has no '{node_name}' nodes.")
     return node_list
 
-def get_machine_data_from_directories(found_dirs: List[Path], output_directory: Path, series_info: SeriesConfigBase):
+def get_machine_sort_key(dir_path: Path) -> Tuple[str, str]:
+    """Sort machine directories by serial number, then by full name."""
+    return dir_path.name.split("_")[-1], dir_path.name
+
+def _scan_mu_file(local_path: Path, names: List[str]) -> Tuple[Dict[str, MuValue], int]:
+    with open(local_path, "rb") as f:
+        return scan_mu_config(f, names), f.tell()
+
+def get_mu_variables(mu_file: Path, names: List[str]) -> Dict[str, MuValue]:
+    """Return the typed values of the requested variables found in an MU config file."""
+    if _file_cache is not None:
+        # Cached copies are local; scanning the whole file costs less than another round trip
+        data = read_config_file(mu_file)
+        if data is None:
+            return {}
+        with measure("mu_read"):
+            return scan_mu_config(io.BytesIO(data), names)
+
+    local_path = resolve_config_file(mu_file)
+    if local_path is None:
+        return {}
+
+    with measure("mu_read"):
+        values, bytes_read = _guarded(_scan_mu_file, local_path, names)
+    count("bytes_read", bytes_read)
+    count("files_read")
+    return values
+
+def get_software_version(mu_file: Path) -> Optional[str]:
+    """Return the HMICFGgszProgramVersion string of an MU config file, if present."""
+    values = get_mu_variables(mu_file, ["HMICFGgszProgramVersion"])
+    if "HMICFGgszProgramVersion" not in values:
+        return None
+    return format_mu_value(values["HMICFGgszProgramVersion"])
+
+def read_machine_header(dir_path: Path, series_info: SeriesConfigBase) -> Dict[str, str]:
+    """TYPE and SN from the directory name plus the configured MU config variables."""
+    type_, sn = dir_path.name.split("_")
+    machine = {"TYPE": type_, "SN": sn}
+
+    # Read software version and the other configured MU variables in one pass
+    values = get_mu_variables(dir_path / series_info.mu_config_file, list(series_info.mu_variables))
+    for name, attribute in series_info.mu_variables.items():
+        if name in values:
+            machine[attribute] = format_mu_value(values[name])
+    return machine
+
+def extract_machine(dir_path: Path, series_info: SeriesConfigBase) -> Dict[str, str]:
+    machine = read_machine_header(dir_path, series_info)
+
+    # Process CSP files
+    nodes = get_file_nodes(dir_path, series_info.csp_files)
+    for name, value in nodes:
+        machine[name] = value
+
+    return machine
+
+# Returned instead of machine attributes when a directory timed out and was deferred
+DEFERRED = object()
+
+class ExtractionSummary:
+    """Outcome of one get_machine_data_from_directories run."""
+
+    def __init__(self, directories: int):
+        self.directories = directories
+        self.machines = 0
+        self.failures = 0
+        self.reused = 0
+        self.deferred = 0
+        self.unfinished: List[str] = []
+
+    def __repr__(self):
+        return f"<ExtractionSummary machines={self.machines} failures={self.failures} reused={self.reused}>"
+
+def _extract_machine_safe(
+    dir_path: Path,
+    series_info: SeriesConfigBase,
+    manifest: Optional[MachineManifest] = None,
+    io_limiter: Optional[threading.Semaphore] = None,
+) -> Optional[Dict[str, str]]:
+    try:
+        if io_limiter is None:
+            return _extract_timed(dir_path, series_info, manifest)
+        with io_limiter:
+            return _extract_timed(dir_path, series_info, manifest)
+    except ReadTimeoutError as ex:
+        log_warning(logger, f"Deferring {dir_path.name}: {ex}")
+        return DEFERRED
+    except Exception as ex:
+        log_error(logger, f"Failed to extract {dir_path.name}: {ex}")
+        return None
+
+def _extract_timed(
+    dir_path: Path, series_info: SeriesConfigBase, manifest: Optional[MachineManifest]
+) -> Dict[str, str]:
+    metrics = current_metrics()
+    if metrics is None:
+        return _extract_or_reuse(dir_path, series_info, manifest)
+
+    start = time.perf_counter()
+    try:
+        return _extract_or_reuse(dir_path, series_info, manifest)
+    finally:
+        metrics.record_machine(dir_path.name, time.perf_counter() - start)
+
+def _extract_or_reuse(
+    dir_path: Path, series_info: SeriesConfigBase, manifest: Optional[MachineManifest]
+) -> Dict[str, str]:
+    if manifest is None:
+        return extract_machine(dir_path, series_info)
+
+    signature = _guarded(manifest.signature, dir_path)
+    machine = manifest.lookup(dir_path, signature)
+    if machine is None:
+        machine = extract_machine(dir_path, series_info)
+        manifest.update(dir_path, signature, machine)
+    return machine
+
+# DEFERRED is an identity sentinel; this marker stands in for it across processes
+_DEFERRED_MARKER = "deferred"
+
+def _extract_batch(
+    dir_paths: List[Path], series_info: SeriesConfigBase, log_prefix: str, slow_path: bool
+) -> Tuple[List[object], RunMetrics]:
+    """
+    Worker process side of the process executor. Machines come back as tuples
+    of (name, value) pairs, together with the metrics collected for them.
+    """
+    set_log_context(log_prefix)
+    metrics = RunMetrics(series_info.series)
+    set_current_metrics(metrics)
+    token = _io_policy.slow_path() if slow_path and _io_policy is not None else None
+    results: List[object] = []
+    try:
+        for dir_path in dir_paths:
+            machine = _extract_machine_safe(dir_path, series_info)
+            if machine is DEFERRED:
+                results.append(_DEFERRED_MARKER)
+            elif machine is None:
+                results.append(None)
+            else:
+                results.append(tuple(machine.items()))
+    finally:
+        if token is not None:
+            IoPolicy.reset(token)
+        set_current_metrics(None)
+    return results, metrics
+
+def _iter_machine_data_processes(
+    found_dirs: List[Path],
+    series_info: SeriesConfigBase,
+    workers: int,
+    manifest: Optional[MachineManifest],
+) -> Iterator[Tuple[Path, Optional[Dict[str, str]]]]:
+    """
+    Ship batches of directories to the process pool and yield the machines in
+    the order of found_dirs. Manifest lookups and updates stay in this process;
+    only changed machines are sent to the workers.
+    """
+    log_prefix = get_log_context()
+    slow_path = in_slow_path()
+    metrics = current_metrics()
+
+    def submit(batch: List[Path]):
+        reused: Dict[Path, Dict[str, str]] = {}
+        signatures = {}
+        todo: List[Path] = []
+        for dir_path in batch:
+            if manifest is not None:
+                signature = _guarded(manifest.signature, dir_path)
+                machine = manifest.lookup(dir_path, signature)
+                if machine is not None:
+                    reused[dir_path] = machine
+                    continue
+                signatures[dir_path] = signature
+            todo.append(dir_path)
+        future = _process_pool.submit(_extract_batch, todo, series_info, log_prefix, slow_path) if todo else None
+        return batch, reused, signatures, todo, future
+
+    batches = (found_dirs[idx:idx + PROCESS_BATCH_SIZE] for idx in range(0, len(found_dirs), PROCESS_BATCH_SIZE))
+    pending = deque(submit(batch) for batch in islice(batches, max(1, workers) * 2))
+    while pending:
+        batch, reused, signatures, todo, future = pending.popleft()
+        parsed: Dict[Path, object] = {}
+        if future is not None:
+            try:
+                results, batch_metrics = future.result()
+            except Exception as ex:
+                log_error(logger, f"Worker process failed on {todo[0].name}..{todo[-1].name}: {ex}")
+                results, batch_metrics = [None] * len(todo), None
+            if metrics is not None and batch_metrics is not None:
+                metrics.merge(batch_metrics)
+            parsed = dict(zip(todo, results))
+
+        for dir_path in batch:
+            if dir_path in reused:
+                yield dir_path, reused[dir_path]
+                continue
+            result = parsed[dir_path]
+            if result == _DEFERRED_MARKER:
+                yield dir_path, DEFERRED
+            elif result is None:
+                yield dir_path, None
+            else:
+                machine = dict(result)
+                if manifest is not None:
+                    manifest.update(dir_path, signatures[dir_path], machine)
+                yield dir_path, machine
+
+        for next_batch in islice(batches, 1):
+            pending.append(submit(next_batch))
+
+def iter_machine_data(
+    found_dirs: List[Path],
+    series_info: SeriesConfigBase,
+    workers: int = 1,
+    manifest: Optional[MachineManifest] = None,
+    io_limiter: Optional[threading.Semaphore] = None,
+    completed: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Iterator[Tuple[Path, Optional[Dict[str, str]]]]:
+    """
+    Yield (directory, machine attributes) in the order of found_dirs.
+
+    With workers > 1 the directories are read on a thread pool. A bounded
+    window of submitted directories keeps memory flat while a slow directory
+    only delays its own result, not the reads queued behind it.
+
+    When a manifest is given, machines whose files are unchanged since the
+    last run are taken from it and only the changed ones are parsed.
+
+    io_limiter is a semaphore shared between concurrently processed series;
+    it caps the number of directories being read at once across all of them.
+
+    Directories listed in completed (from a checkpoint journal) are not read
+    again; their recorded attributes are yielded instead.
+
+    When a process pool is set (see set_process_pool), directories are parsed
+    in worker processes instead of threads; io_limiter does not apply there.
+    """
+    if completed:
+        pending_dirs = [dir_path for dir_path in found_dirs if dir_path.name not in completed]
+        fresh = iter_machine_data(pending_dirs, series_info, workers, manifest, io_limiter)
+        for dir_path in found_dirs:
+            if dir_path.name in completed:
+                yield dir_path, dict(completed[dir_path.name])
+            else:
+                yield next(fresh)
+        return
+
+    if _process_pool is not None:
+        yield from _iter_machine_data_processes(found_dirs, series_info, workers, manifest)
+        return
+
+    if workers <= 1:
+        for dir_path in found_dirs:
+            yield dir_path, _extract_machine_safe(dir_path, series_info, manifest, io_limiter)
+        return
+
+    def submit(pool: ThreadPoolExecutor, dir_path: Path):
+        # Run in a copy of the caller's context so log prefixes carry over
+        context = contextvars.copy_context()
+        return pool.submit(context.run, _extract_machine_safe, dir_path, series_info, manifest, io_limiter)
+
+    dirs_iter = iter(found_dirs)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=series_info.series) as pool:
+        pending = deque((dir_path, submit(pool, dir_path)) for dir_path in islice(dirs_iter, workers * 4))
+        while pending:
+            dir_path, future = pending.popleft()
+            yield dir_path, future.result()
+            for next_dir in islice(dirs_iter, 1):
+                pending.append((next_dir, submit(pool, next_dir)))
+
+def get_machine_data_from_directories(
+    found_dirs: List[Path],
+    output_directory: Path,
+    series_info: SeriesConfigBase,
+    workers: int = 1,
+    manifest: Optional[MachineManifest] = None,
+    sinks: Optional[List[object]] = None,
+    io_limiter: Optional[threading.Semaphore] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+) -> ExtractionSummary:
+    """
+    Extract every machine in found_dirs and write it to the series XML plus
+    any extra sinks (CSV, JSON, ...) in a single pass.
+
+    With a checkpoint journal every finished machine is recorded as it is
+    written; machines already in a resumed journal are taken from it. The
+    journal is removed once all outputs are complete.
+    """
     output_directory.mkdir(parents=True, exist_ok=True)
     xml_path = output_directory / series_info.out_file_name
-    xml_path.parent.mkdir(parents=True, exist_ok=True)
+    found_dirs = sorted(found_dirs, key=get_machine_sort_key)
+    summary = ExtractionSummary(len(found_dirs))
+
+    completed = resume_completed(checkpoint, manifest, found_dirs)
+    machines = iter_machine_data(found_dirs, series_info, workers, manifest, io_limiter, completed)
+    deferred_dirs: List[Path] = []
 
-    root = ET.Element("repository")
+    def write(dir_path: Path, machine: Dict[str, str]) -> None:
+        # Append the machine; the XML on disk stays well-formed
+        with measure("sink_write"):
+            sink_set.write(machine)
+            if checkpoint is not None:
+                signature = manifest.recorded_signature(dir_path.name) if manifest is not None else None
+                checkpoint.record(dir_path.name, machine, signature)
+        summary.machines += 1
 
-    for idx, dir_path in enumerate(found_dirs, start=1):
-        log_info(logger, f"Copying properties from {dir_path.name} [{idx}/{len(found_dirs)}]")
+    with SinkSet([XmlSink(xml_path), *(sinks or [])]) as sink_set:
+        with stage("extract"):
+            for idx, (dir_path, machine) in enumerate(machines, start=1):
+                log_info(logger, f"Copying properties from {dir_path.name} [{idx}/{len(found_dirs)}]")
+                if machine is DEFERRED:
+                    deferred_dirs.append(dir_path)
+                elif machine is None:
+                    summary.failures += 1
+                    sink_set.retain(*dir_path.name.split("_")[:2])
+                else:
+                    write(dir_path, machine)
 
-        type_, sn = dir_path.name.split("_")
-        machine = ET.SubElement(root, "machine", TYPE=type_, SN=sn)
+        if deferred_dirs:
+            # Slow path: one long attempt per file, after the regular machines are done
+            summary.deferred = len(deferred_dirs)
+            log_warning(logger, f"Retrying {len(deferred_dirs)} deferred machines")
+            token = _io_policy.slow_path()
+            try:
+                with stage("deferred"):
+                    for dir_path, machine in iter_machine_data(deferred_dirs, series_info, workers, manifest, io_limiter):
+                        if machine is DEFERRED or machine is None:
+                            summary.failures += 1
+                            summary.unfinished.append(dir_path.name)
+                            sink_set.retain(*dir_path.name.split("_")[:2])
+                        else:
+                            write(dir_path, machine)
+            finally:
+                IoPolicy.reset(token)
 
-        # Read software version
-        mu_file = dir_path / series_info.mu_config_file
-        if mu_file.exists():
-            for line in mu_file.read_text(encoding="utf-8").splitlines():
-                if "HMICFGgszProgramVersion" in line:
-                    match = re.search(r"'(.*?)'", line)
-                    if match:
-                        sw_version = match.group(1)
-                        machine.set("SW_VERSION", sw_version)
+            if summary.unfinished:
+                log_error(logger, f"No complete data for {len(summary.unfinished)} machines: {', '.join(summary.unfinished)}")
 
-        # Process CSP files
-        nodes = get_file_nodes(dir_path, series_info.csp_files)
-        for name, value in nodes:
-            machine.set(name, value)
+        with stage("export"):
+            sink_set.close()
 
-        # Indent XML and save after each machine
-        ET.indent(root, space="  ")
-        ET.ElementTree(root).write(xml_path, encoding="utf-8", xml_declaration=True)
+    finish_extraction(summary, manifest, checkpoint)
+    return summary
 
-        #if (idx > 10):
-        #    break
+def resume_completed(
+    checkpoint: Optional[CheckpointJournal],
+    manifest: Optional[MachineManifest],
+    found_dirs: List[Path],
+) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Machines already completed according to a resumed checkpoint journal.
+    Those still present go into the manifest with the signature recorded
+    in the journal, so the next run reuses them like any other machine.
+    """
+    completed = checkpoint.completed if checkpoint is not None else None
+    if not completed:
+        return completed
+    log_info(logger, f"Resuming: {len(completed)} machines already completed")
+    if manifest is not None:
+        for dir_path in found_dirs:
+            signature = checkpoint.signatures.get(dir_path.name)
+            if signature is not None and dir_path.name in completed:
+                manifest.update(dir_path, signature, completed[dir_path.name])
+    return completed
+
+def finish_extraction(
+    summary: ExtractionSummary,
+    manifest: Optional[MachineManifest] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+) -> None:
+    """Record the counters, save the manifest and retire the checkpoint once the outputs are closed."""
+    count("machines", summary.machines)
+    count("failures", summary.failures)
+
+    if manifest is not None:
+        summary.reused = manifest.reused
+        count("reused", manifest.reused)
+        log_info(logger, f"Reused {manifest.reused} of {summary.directories} machines from manifest")
+        with stage("manifest_save"):
+            manifest.save()
+
+    if checkpoint is not None:
+        if summary.unfinished:
+            # Keep the journal so --resume only retries the unfinished machines
+            checkpoint.close()
+        else:
+            checkpoint.finish()
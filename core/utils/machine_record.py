@@ -0,0 +1,99 @@
+"""Compact in-memory representation of extracted machines for tabular outputs."""
+
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class ColumnSchema:
+    """
+    Attribute names of a table in first-seen order.
+
+    Every name is stored once, interned, and identified by its position;
+    records keep only their values, so the few hundred property names of a
+    series are not repeated for every machine.
+    """
+
+    __slots__ = ("names", "_ids")
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def column_id(self, name: str) -> int:
+        """Id of a column, adding it at the end when it is new."""
+        column_id = self._ids.get(name)
+        if column_id is None:
+            column_id = self._ids[sys.intern(name)] = len(self.names)
+            self.names.append(sys.intern(name))
+        return column_id
+
+    def get(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class MachineRecord:
+    """
+    Attribute values of one machine in a tuple indexed by column id.
+
+    The tuple ends at the last column the machine has, so records created
+    before a column first appeared stay valid; missing values are None.
+    """
+
+    __slots__ = ("schema", "values")
+
+    def __init__(self, schema: ColumnSchema, values: Tuple[Optional[str], ...]):
+        self.schema = schema
+        self.values = values
+
+    @classmethod
+    def from_dict(
+        cls, schema: ColumnSchema, machine: Dict[str, str], value_pool: Optional[Dict[str, str]] = None
+    ) -> "MachineRecord":
+        """
+        Build a record, adding new attribute names to schema. With a
+        value_pool, equal values of different machines share one string.
+        """
+        ids = [schema.column_id(name) for name in machine]
+        values: List[Optional[str]] = [None] * (max(ids) + 1 if ids else 0)
+        for column_id, value in zip(ids, machine.values()):
+            if value_pool is not None:
+                value = value_pool.setdefault(value, value)
+            values[column_id] = value
+        return cls(schema, tuple(values))
+
+    def get(self, name: str, default=None):
+        column_id = self.schema.get(name)
+        if column_id is None or column_id >= len(self.values) or self.values[column_id] is None:
+            return default
+        return self.values[column_id]
+
+    def __getitem__(self, name: str) -> str:
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        for name, value in zip(self.schema.names, self.values):
+            if value is not None:
+                yield name, value
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self.items())
+
+    def row(self, width: int) -> Tuple[Optional[str], ...]:
+        """Values padded with None to the first width columns of the schema."""
+        missing = width - len(self.values)
+        return self.values + (None,) * missing if missing > 0 else self.values
+
+    def __len__(self) -> int:
+        return sum(1 for value in self.values if value is not None)
+
+    def __repr__(self) -> str:
+        return f"MachineRecord({self.to_dict()!r})"
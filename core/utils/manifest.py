@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .atomic_write import atomic_output
+from .definitions import SeriesConfigBase
+
+# Version 2: a header line, then one line per machine, so the file is read and written as a stream
+MANIFEST_VERSION = 2
+
+FileSignature = Dict[str, Optional[List[int]]]
+
+# A FileSignature as (size, mtime_ns) tuples in the order of MachineManifest.files
+PackedSignature = Tuple[Optional[Tuple[int, int]], ...]
+
+# Attribute names of a machine in their order, and its values in the same order
+Attributes = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def get_manifest_path(output_directory: Path, series_info: SeriesConfigBase) -> Path:
+    return output_directory / Path(series_info.out_file_name).with_suffix(".manifest.json")
+
+
+def get_relevant_files(series_info: SeriesConfigBase) -> List[str]:
+    return [series_info.mu_config_file, *series_info.csp_files]
+
+
+def get_file_signature(dir_path: Path, files: List[str]) -> FileSignature:
+    """Return [size, mtime_ns] per relative file path, or None for missing files."""
+    signature: FileSignature = {}
+    for file in files:
+        try:
+            st = os.stat(dir_path / file)
+            signature[file] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            signature[file] = None
+    return signature
+
+
+class MachineManifest:
+    """
+    Per-series record of the files behind each machine and the attributes
+    extracted from them.
+
+    A machine whose files still have the same size and mtime is served from
+    the manifest instead of being read and parsed again. Like the rows of a
+    MachineTable, attributes are kept compact: machines with the same
+    attribute names share one tuple of names, equal values share one string,
+    and the file is loaded and saved one machine at a time.
+    """
+
+    def __init__(self, path: Path, series_info: SeriesConfigBase):
+        self.path = Path(path)
+        self.series = series_info.series
+        self.files = get_relevant_files(series_info)
+        self.mu_variables = dict(series_info.mu_variables)
+        self.reused = 0
+        self._names: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._values: Dict[str, str] = {}
+        self._entries: Dict[str, Tuple[PackedSignature, Attributes]] = {}
+        self._seen: Dict[str, Tuple[PackedSignature, Attributes]] = {}
+        self._trusted: Set[str] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _pack(self, signature: FileSignature) -> PackedSignature:
+        return tuple(None if signature.get(file) is None else tuple(signature[file]) for file in self.files)
+
+    def _unpack(self, packed: PackedSignature) -> FileSignature:
+        return {file: None if stat is None else list(stat) for file, stat in zip(self.files, packed)}
+
+    def _compact(self, attributes: Dict[str, str]) -> Attributes:
+        names = tuple(sys.intern(name) for name in attributes)
+        values = tuple(self._values.setdefault(value, value) for value in attributes.values())
+        return self._names.setdefault(names, names), values
+
+    def _load(self) -> None:
+        if not self.path.is_file():
+            return
+        entries: Dict[str, Tuple[PackedSignature, Attributes]] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if (
+                    header.get("version") != MANIFEST_VERSION
+                    or header.get("files") != self.files
+                    or header.get("mu_variables") != self.mu_variables
+                ):
+                    return
+                for line in f:
+                    entry = json.loads(line)
+                    entries[entry["dir"]] = (self._pack(entry["files"]), self._compact(entry["attributes"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget previous entries so every machine is parsed again."""
+        self._entries = {}
+
+    def trust(self, names: Iterable[str]) -> None:
+        """
+        Machines known to be unchanged, e.g. checked moments ago by --watch:
+        their recorded signature is used without stat'ing their files again.
+        """
+        self._trusted = set(names)
+
+    def signature(self, dir_path: Path) -> FileSignature:
+        entry = self._entries.get(dir_path.name)
+        if entry is not None and dir_path.name in self._trusted:
+            return self._unpack(entry[0])
+        return get_file_signature(dir_path, self.files)
+
+    def changed(self, dirs: Iterable[Path]) -> List[Path]:
+        """Directories that are new or whose files changed since the manifest was saved."""
+        changed = []
+        for dir_path in dirs:
+            entry = self._entries.get(dir_path.name)
+            if entry is None or entry[0] != self._pack(get_file_signature(dir_path, self.files)):
+                changed.append(dir_path)
+        return changed
+
+    def lookup(self, dir_path: Path, signature: FileSignature) -> Optional[Dict[str, str]]:
+        entry = self._entries.get(dir_path.name)
+        if entry is None or entry[0] != self._pack(signature):
+            return None
+        with self._lock:
+            self._seen[dir_path.name] = entry
+            self.reused += 1
+        return dict(zip(*entry[1]))
+
+    def update(self, dir_path: Path, signature: FileSignature, attributes: Dict[str, str]) -> None:
+        with self._lock:
+            self._seen[dir_path.name] = (self._pack(signature), self._compact(attributes))
+
+    def recorded_signature(self, dir_name: str) -> Optional[FileSignature]:
+        """Signature of a machine already looked up or updated in this run."""
+        with self._lock:
+            entry = self._seen.get(dir_name)
+        return None if entry is None else self._unpack(entry[0])
+
+    def save(self) -> None:
+        """Write the machines seen in this run; directories that disappeared are dropped."""
+        header = {"version": MANIFEST_VERSION, "series": self.series, "files": self.files, "mu_variables": self.mu_variables}
+        with atomic_output(self.path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            for name, (packed, attributes) in self._seen.items():
+                entry = {"dir": name, "files": self._unpack(packed), "attributes": dict(zip(*attributes))}
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._entries = self._seen
+        self._seen = {}
+        self.reused = 0
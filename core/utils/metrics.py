@@ -0,0 +1,162 @@
+"""Counters, stage timings and latency percentiles for parser runs."""
+
+import contextvars
+import heapq
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SLOWEST = 10
+
+# Metrics of the series processed in the current context, see set_current_metrics
+_current_metrics: contextvars.ContextVar[Optional["RunMetrics"]] = contextvars.ContextVar(
+    "current_metrics", default=None
+)
+
+
+def set_current_metrics(metrics: Optional["RunMetrics"]) -> None:
+    _current_metrics.set(metrics)
+
+
+def current_metrics() -> Optional["RunMetrics"]:
+    return _current_metrics.get()
+
+
+def count(counter: str, amount: int = 1) -> None:
+    """Add to a counter of the current metrics, if any."""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.add(counter, amount)
+
+
+@contextmanager
+def measure(timer: str):
+    """Accumulate the time of the block into a timer of the current metrics, if any."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.timed(timer):
+        yield
+
+
+@contextmanager
+def stage(name: str):
+    """Time the block as a pipeline stage of the current metrics, if any."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name):
+        yield
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class RunMetrics:
+    """
+    Metrics of one series run.
+
+    Counters and cumulative timers may be updated from worker threads.
+    Stages are wall-clock sections of the pipeline; timers accumulate time
+    spent in an operation across all threads (e.g. CSP parsing).
+    """
+
+    def __init__(self, name: str, slowest: int = DEFAULT_SLOWEST):
+        self.name = name
+        self.slowest = slowest
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, float] = {}
+        self.stages: Dict[str, float] = {}
+        self._latencies: List[float] = []
+        self._slowest: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def add_time(self, timer: str, seconds: float) -> None:
+        with self._lock:
+            self.timers[timer] = self.timers.get(timer, 0.0) + seconds
+
+    @contextmanager
+    def timed(self, timer: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(timer, time.perf_counter() - start)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def record_machine(self, directory: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            if len(self._slowest) < self.slowest:
+                heapq.heappush(self._slowest, (seconds, directory))
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (seconds, directory))
+
+    def merge(self, other: "RunMetrics") -> None:
+        """Add counters, timers and machine latencies collected elsewhere, e.g. in a worker process."""
+        for counter, amount in other.counters.items():
+            self.add(counter, amount)
+        for timer, seconds in other.timers.items():
+            self.add_time(timer, seconds)
+        with self._lock:
+            self._latencies.extend(other._latencies)
+            for entry in other._slowest:
+                if len(self._slowest) < self.slowest:
+                    heapq.heappush(self._slowest, entry)
+                elif entry[0] > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, entry)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            slowest = sorted(self._slowest, reverse=True)
+            counters = dict(self.counters)
+            timers = dict(self.timers)
+
+        elapsed = sum(self.stages.values())
+        files = counters.get("files_read", 0)
+        return {
+            "name": self.name,
+            "stages_seconds": {name: round(value, 6) for name, value in self.stages.items()},
+            "timers_seconds": {name: round(value, 6) for name, value in timers.items()},
+            "counters": counters,
+            "files_per_second": round(files / elapsed, 1) if elapsed > 0 else None,
+            "bytes_per_second": round(counters.get("bytes_read", 0) / elapsed, 1) if elapsed > 0 else None,
+            "machine_latency_seconds": {
+                "count": len(latencies),
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else None,
+            },
+            "slowest_directories": [{"directory": name, "seconds": round(sec, 6)} for sec, name in slowest],
+        }
@@ -0,0 +1,123 @@
+"""Single-pass scanner for variable declarations in MU config files (.TcGVL / .EXP)."""
+
+import re
+from functools import lru_cache
+from typing import BinaryIO, Dict, FrozenSet, Iterable, Union
+
+# Variables read from every MU config file, mapped to the machine attribute they fill
+DEFAULT_MU_VARIABLES: Dict[str, str] = {"HMICFGgszProgramVersion": "SW_VERSION"}
+
+MuValue = Union[str, int, float, bool]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+INTEGER_TYPES = {
+    "SINT", "INT", "DINT", "LINT", "USINT", "UINT", "UDINT", "ULINT", "BYTE", "WORD", "DWORD", "LWORD",
+}
+REAL_TYPES = {"REAL", "LREAL"}
+
+# 16#FF, 2#1010, 8#17 and 1_000 style integer literals
+_RADIX_LITERAL = re.compile(r"^(?:(\d+)#)?([0-9A-Fa-f_]+)$")
+
+
+@lru_cache(maxsize=32)
+def compile_declaration_pattern(names: FrozenSet[str]) -> "re.Pattern[bytes]":
+    """'NAME : TYPE := VALUE;' for any of names, to be matched at the start of a line."""
+    alternation = b"|".join(re.escape(name.encode("ascii")) for name in sorted(names))
+    return re.compile(
+        rb"[ \t]*(" + alternation + rb")[ \t]*(?:AT[ \t]+\S+[ \t]*)?:[ \t]*([A-Za-z_]\w*)[^:;\n]*:=[ \t]*"
+        rb"('(?:\$.|[^'\n])*'|[^;\n]*?)[ \t]*;"
+    )
+
+
+def parse_mu_value(type_name: str, literal: str) -> MuValue:
+    """Convert an IEC 61131-3 literal to a Python value based on its declared type."""
+    type_name = type_name.upper()
+    if literal.startswith("'") and literal.endswith("'") and len(literal) >= 2:
+        text = literal[1:-1]
+        return re.sub(r"\$(.)", r"\1", text) if "$" in text else text
+    if type_name == "BOOL":
+        return literal.upper() in ("TRUE", "1")
+    try:
+        if type_name in INTEGER_TYPES:
+            # Typed literals such as INT#5 or DWORD#16#FF
+            value = literal.split("#", 1)[1] if literal.upper().startswith(type_name + "#") else literal
+            sign = -1 if value.startswith("-") else 1
+            match = _RADIX_LITERAL.match(value.lstrip("+-"))
+            if match:
+                return sign * int(match.group(2).replace("_", ""), int(match.group(1) or 10))
+        if type_name in REAL_TYPES:
+            return float(literal.replace("_", ""))
+    except ValueError:
+        pass
+    return literal
+
+
+def format_mu_value(value: MuValue) -> str:
+    """Attribute text of a scanned value; booleans use the PLC spelling."""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def _in_block_comment(data: bytes, pos: int, in_block: bool) -> bool:
+    """Whether pos lies inside a (* ... *) comment; in_block is the state at the start of data."""
+    opened = data.rfind(b"(*", 0, pos)
+    closed = data.rfind(b"*)", 0, pos)
+    if opened < 0 and closed < 0:
+        return in_block
+    return opened > closed
+
+
+def scan_mu_config(source: BinaryIO, names: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, MuValue]:
+    """
+    Return the typed values of the requested variables in one pass over a
+    binary file object, stopping as soon as all of them were found.
+
+    The file is read in chunks of whole lines. Each name is located with a
+    plain substring search and only its line is matched against the
+    declaration regex, so unrelated lines never reach Python code.
+    Commented-out declarations are ignored.
+    """
+    wanted = frozenset(names)
+    values: Dict[str, MuValue] = {}
+    if not wanted:
+        return values
+
+    pattern = compile_declaration_pattern(wanted)
+    carry = b""
+    in_block = False
+    while True:
+        chunk = source.read(chunk_size)
+        # Buffered reads only come back short at the end of the file
+        last = len(chunk) < chunk_size
+        data = carry + chunk
+        if not last:
+            # Keep a trailing partial line for the next chunk
+            cut = data.rfind(b"\n") + 1
+            data, carry = data[:cut], data[cut:]
+        has_comments = in_block or b"(*" in data
+
+        for name in wanted.difference(values):
+            encoded = name.encode("ascii")
+            pos = data.find(encoded)
+            while pos >= 0:
+                line_start = data.rfind(b"\n", 0, pos) + 1
+                match = pattern.match(data, line_start)
+                if (
+                    match
+                    and match.group(1) == encoded
+                    and not (has_comments and _in_block_comment(data, line_start, in_block))
+                ):
+                    values[name] = parse_mu_value(
+                        match.group(2).decode("ascii"), match.group(3).decode("utf-8", "replace")
+                    )
+                    break
+                pos = data.find(encoded, pos + 1)
+        if len(values) == len(wanted):
+            return values
+
+        if last:
+            return values
+        if has_comments:
+            in_block = _in_block_comment(data, len(data), in_block)
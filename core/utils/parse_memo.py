@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+DEFAULT_MEMO_ENTRIES = 4096
+
+# New results written to the SQLite store per transaction
+STORE_BATCH_SIZE = 256
+
+Nodes = Tuple[Tuple[str, str], ...]
+
+
+def get_content_key(data: bytes, node_name: str) -> str:
+    return f"{node_name}:{hashlib.blake2b(data, digest_size=20).hexdigest()}"
+
+
+class ParseMemo:
+    """
+    Map the digest of a CSP file to its extracted (name, value) pairs.
+
+    Machines built from the same template share byte-identical files; those
+    cost one hash instead of one XML parse. An in-process LRU is backed by an
+    optional SQLite store that keeps results between runs. New results are
+    written to the store in batches, so worker processes sharing it only
+    hold its write lock while a batch is committed.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMO_ENTRIES, store_path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Nodes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = None
+        self._pending: List[Tuple[str, str]] = []
+        if store_path is not None:
+            Path(store_path).parent.mkdir(parents=True, exist_ok=True)
+            self._store = sqlite3.connect(str(store_path), timeout=60, check_same_thread=False)
+            self._store.execute("PRAGMA journal_mode=WAL")
+            self._store.execute("CREATE TABLE IF NOT EXISTS parse_memo (key TEXT PRIMARY KEY, nodes TEXT NOT NULL)")
+            self._store.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Optional[Nodes]:
+        with self._lock:
+            nodes = self._entries.get(key)
+            if nodes is not None:
+                self._entries.move_to_end(key)
+            elif self._store is not None:
+                row = self._store.execute("SELECT nodes FROM parse_memo WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    nodes = tuple((name, value) for name, value in json.loads(row[0]))
+                    self._remember(key, nodes)
+
+            if nodes is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return nodes
+
+    def put(self, key: str, nodes: List[Tuple[str, str]]) -> None:
+        nodes = tuple(nodes)
+        with self._lock:
+            self._remember(key, nodes)
+            if self._store is not None:
+                self._pending.append((key, json.dumps(nodes, separators=(",", ":"))))
+                if len(self._pending) >= STORE_BATCH_SIZE:
+                    self._flush()
+
+    def _flush(self) -> None:
+        # Caller holds the lock
+        if self._pending:
+            with self._store:
+                self._store.executemany("INSERT OR REPLACE INTO parse_memo (key, nodes) VALUES (?, ?)", self._pending)
+            self._pending = []
+
+    def _remember(self, key: str, nodes: Nodes) -> None:
+        # Caller holds the lock
+        self._entries[key] = nodes
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._store is not None:
+                self._flush()
+                self._store.close()
+                self._store = None
@@ -0,0 +1,337 @@
+"""
+asyncio extraction pipeline: scan -> read -> parse -> write.
+
+Stages are connected by bounded queues, so reads from the file share overlap
+with CSP parsing and output writes, and memory stays bounded by the queue
+sizes instead of the number of machines.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from .checkpoint import CheckpointJournal
+from .definitions import DEFAULT_QUEUE_SIZE, SeriesConfigBase
+from .find_directories import find_directories
+from .io_policy import IoPolicy, ReadTimeoutError, enter_slow_path
+from .logger import configure_logger, log_info, log_warning, log_error
+from .machine_data import (
+    DEFERRED,
+    ExtractionSummary,
+    _guarded,
+    finish_extraction,
+    get_machine_sort_key,
+    get_parse_errors,
+    parse_codesmith_bytes,
+    read_config_file,
+    read_machine_header,
+    resume_completed,
+)
+from .manifest import MachineManifest
+from .metrics import current_metrics, measure, stage
+from .sinks import SinkSet, XmlSink
+
+logger = configure_logger(__name__)
+
+DEFAULT_READERS = 8
+
+# Tells the next stage that no more items follow
+_END = object()
+
+
+class RawMachine:
+    """A machine whose files were read but whose CSP files are not parsed yet."""
+
+    def __init__(self, dir_path: Path, header: Dict[str, str], csp_data: List[Tuple[str, Optional[bytes]]]):
+        self.dir_path = dir_path
+        self.header = header
+        self.csp_data = csp_data
+        self.signature = None
+        self.started = time.perf_counter()
+
+
+def read_machine(
+    dir_path: Path,
+    series_info: SeriesConfigBase,
+    manifest: Optional[MachineManifest] = None,
+    io_limiter: Optional[threading.Semaphore] = None,
+) -> Union[Dict[str, str], RawMachine]:
+    """
+    Read stage, run on a worker thread: the MU variables and the raw CSP
+    bytes of a machine, or its attributes when the manifest still has them.
+    """
+    if io_limiter is None:
+        return _read_machine(dir_path, series_info, manifest)
+    with io_limiter:
+        return _read_machine(dir_path, series_info, manifest)
+
+
+def _read_machine(
+    dir_path: Path, series_info: SeriesConfigBase, manifest: Optional[MachineManifest]
+) -> Union[Dict[str, str], RawMachine]:
+    started = time.perf_counter()
+    signature = None
+    if manifest is not None:
+        signature = _guarded(manifest.signature, dir_path)
+        machine = manifest.lookup(dir_path, signature)
+        if machine is not None:
+            return machine
+
+    header = read_machine_header(dir_path, series_info)
+    csp_data: List[Tuple[str, Optional[bytes]]] = []
+    with measure("csp_read"):
+        for file in series_info.csp_files:
+            csp_data.append((file, read_config_file(dir_path / file)))
+
+    raw = RawMachine(dir_path, header, csp_data)
+    raw.signature = signature
+    raw.started = started
+    return raw
+
+
+def parse_machine(
+    raw: RawMachine, manifest: Optional[MachineManifest] = None, node_name: str = "property"
+) -> Dict[str, str]:
+    """Parse stage: add the CSP properties to a machine from read_machine."""
+    machine = dict(raw.header)
+    for file, data in raw.csp_data:
+        nodes: List[Tuple[str, str]] = []
+        if data is None:
+            log_warning(logger, f"File not found: {raw.dir_path / file}")
+        else:
+            try:
+                with measure("csp_parse"):
+                    nodes = parse_codesmith_bytes(data, node_name)
+            except get_parse_errors() as e:
+                log_error(logger, f"Failed to parse {raw.dir_path / file}: {e}")
+        if nodes:
+            machine.update(nodes)
+        else:
+            log_warning(logger, f"File '{file}' has no '{node_name}' nodes.")
+
+    if manifest is not None:
+        manifest.update(raw.dir_path, raw.signature, machine)
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.record_machine(raw.dir_path.name, time.perf_counter() - raw.started)
+    return machine
+
+
+def _run_in(executor: ThreadPoolExecutor, fn, *args) -> asyncio.Future:
+    # run_in_executor does not carry context variables (log prefix, metrics) over by itself
+    context = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, fn, *args))
+
+
+async def iter_machine_data_async(
+    found_dirs: List[Path],
+    series_info: SeriesConfigBase,
+    readers: int = DEFAULT_READERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    manifest: Optional[MachineManifest] = None,
+    io_limiter: Optional[threading.Semaphore] = None,
+    completed: Optional[Dict[str, Dict[str, str]]] = None,
+) -> AsyncIterator[Tuple[Path, Optional[Dict[str, str]]]]:
+    """
+    Yield (directory, machine attributes) in the order of found_dirs, like
+    iter_machine_data: None for machines that failed, DEFERRED for timeouts.
+
+    A scan task feeds the directories to `readers` read tasks, whose file
+    reads run on a thread pool. The raw bytes go to a parse task. Every
+    queue holds at most queue_size items, and so does the backlog of results
+    waiting for a slower directory ahead of them.
+    """
+    loop = asyncio.get_running_loop()
+    dir_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    raw_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    order_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    read_pool = ThreadPoolExecutor(readers, thread_name_prefix=f"{series_info.series}-read")
+    parse_pool = ThreadPoolExecutor(1, thread_name_prefix=f"{series_info.series}-parse")
+
+    async def scan():
+        for dir_path in found_dirs:
+            result = loop.create_future()
+            await order_queue.put((dir_path, result))
+            if completed and dir_path.name in completed:
+                result.set_result(dict(completed[dir_path.name]))
+            else:
+                await dir_queue.put((dir_path, result))
+        await order_queue.put(_END)
+        for _ in range(readers):
+            await dir_queue.put(_END)
+
+    async def read():
+        while (item := await dir_queue.get()) is not _END:
+            dir_path, result = item
+            try:
+                raw = await _run_in(read_pool, read_machine, dir_path, series_info, manifest, io_limiter)
+            except ReadTimeoutError as ex:
+                log_warning(logger, f"Deferring {dir_path.name}: {ex}")
+                result.set_result(DEFERRED)
+            except Exception as ex:
+                log_error(logger, f"Failed to extract {dir_path.name}: {ex}")
+                result.set_result(None)
+            else:
+                if isinstance(raw, RawMachine):
+                    await raw_queue.put((raw, result))
+                else:
+                    result.set_result(raw)
+
+    async def read_all():
+        await asyncio.gather(*(read() for _ in range(readers)))
+        await raw_queue.put(_END)
+
+    async def parse():
+        while (item := await raw_queue.get()) is not _END:
+            raw, result = item
+            try:
+                result.set_result(await _run_in(parse_pool, parse_machine, raw, manifest))
+            except Exception as ex:
+                log_error(logger, f"Failed to extract {raw.dir_path.name}: {ex}")
+                result.set_result(None)
+
+    tasks = [asyncio.create_task(scan()), asyncio.create_task(read_all()), asyncio.create_task(parse())]
+    try:
+        while (item := await order_queue.get()) is not _END:
+            dir_path, result = item
+            yield dir_path, await result
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        read_pool.shutdown(wait=False, cancel_futures=True)
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def extract_series(
+    series_info: SeriesConfigBase,
+    found_dirs: Optional[List[Path]] = None,
+    readers: int = DEFAULT_READERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    manifest: Optional[MachineManifest] = None,
+) -> AsyncIterator[Dict[str, str]]:
+    """
+    Yield the machines of a series in SN order:
+
+        async for machine in extract_series(get_series_info("Wxxx")):
+            ...
+
+    The repository is listed when found_dirs is not given. Machines that
+    could not be read are logged and skipped.
+    """
+    if found_dirs is None:
+        found_dirs = await asyncio.to_thread(
+            find_directories, str(series_info.repository_path), series_info.regex_pattern
+        )
+    found_dirs = sorted(found_dirs, key=get_machine_sort_key)
+
+    async for dir_path, machine in iter_machine_data_async(found_dirs, series_info, readers, queue_size, manifest):
+        if machine is DEFERRED:
+            log_warning(logger, f"Skipping {dir_path.name}: read timed out")
+        elif machine is not None:
+            yield machine
+
+
+async def write_machine_data_async(
+    found_dirs: List[Path],
+    output_directory: Path,
+    series_info: SeriesConfigBase,
+    readers: int = DEFAULT_READERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    manifest: Optional[MachineManifest] = None,
+    sinks: Optional[List[object]] = None,
+    io_limiter: Optional[threading.Semaphore] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+) -> ExtractionSummary:
+    """
+    Pipeline counterpart of get_machine_data_from_directories, with the same
+    outputs. Sink writes are the last stage and run on their own thread behind
+    a bounded queue, so a slow output disk does not stall the reads.
+    """
+    output_directory.mkdir(parents=True, exist_ok=True)
+    xml_path = output_directory / series_info.out_file_name
+    found_dirs = sorted(found_dirs, key=get_machine_sort_key)
+    summary = ExtractionSummary(len(found_dirs))
+
+    completed = resume_completed(checkpoint, manifest, found_dirs)
+    write_pool = ThreadPoolExecutor(1, thread_name_prefix=f"{series_info.series}-write")
+    deferred_dirs: List[Path] = []
+
+    def write(dir_path: Path, machine: Dict[str, str]) -> None:
+        # Append the machine; the XML on disk stays well-formed
+        with measure("sink_write"):
+            sink_set.write(machine)
+            if checkpoint is not None:
+                signature = manifest.recorded_signature(dir_path.name) if manifest is not None else None
+                checkpoint.record(dir_path.name, machine, signature)
+        summary.machines += 1
+
+    async def extract(dirs: List[Path], deferred: bool, completed=None) -> None:
+        write_queue: asyncio.Queue = asyncio.Queue(queue_size)
+        errors: List[Exception] = []
+
+        async def writer():
+            while (item := await write_queue.get()) is not _END:
+                if errors:
+                    continue
+                try:
+                    await _run_in(write_pool, write, *item)
+                except Exception as ex:
+                    errors.append(ex)
+
+        writer_task = asyncio.create_task(writer())
+        try:
+            machines = iter_machine_data_async(dirs, series_info, readers, queue_size, manifest, io_limiter, completed)
+            idx = 0
+            async for dir_path, machine in machines:
+                if errors:
+                    break
+                idx += 1
+                if not deferred:
+                    log_info(logger, f"Copying properties from {dir_path.name} [{idx}/{len(dirs)}]")
+                if machine is DEFERRED and not deferred:
+                    deferred_dirs.append(dir_path)
+                elif machine is None or machine is DEFERRED:
+                    summary.failures += 1
+                    if deferred:
+                        summary.unfinished.append(dir_path.name)
+                    sink_set.retain(*dir_path.name.split("_")[:2])
+                else:
+                    await write_queue.put((dir_path, machine))
+        finally:
+            await write_queue.put(_END)
+            await writer_task
+        if errors:
+            raise errors[0]
+
+    try:
+        with SinkSet([XmlSink(xml_path), *(sinks or [])]) as sink_set:
+            with stage("extract"):
+                await extract(found_dirs, deferred=False, completed=completed)
+
+            if deferred_dirs:
+                # Slow path: one long attempt per file, after the regular machines are done
+                summary.deferred = len(deferred_dirs)
+                log_warning(logger, f"Retrying {len(deferred_dirs)} deferred machines")
+                token = enter_slow_path()
+                try:
+                    with stage("deferred"):
+                        await extract(deferred_dirs, deferred=True)
+                finally:
+                    IoPolicy.reset(token)
+
+                if summary.unfinished:
+                    log_error(logger, f"No complete data for {len(summary.unfinished)} machines: {', '.join(summary.unfinished)}")
+
+            with stage("export"):
+                await _run_in(write_pool, sink_set.close)
+    finally:
+        write_pool.shutdown(wait=False)
+
+    finish_extraction(summary, manifest, checkpoint)
+    return summary
@@ -0,0 +1,265 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .atomic_write import atomic_output, remove_stale_temporaries, replace_file, temporary_path
+from .logger import configure_logger, log_info, log_exception
+from .machine_record import ColumnSchema, MachineRecord
+from .xml_writer import MachineXmlWriter, insert_machines
+
+logger = configure_logger(__name__)
+
+# Attributes stored dictionary-encoded in columnar exports regardless of cardinality
+DICTIONARY_COLUMNS = ("TYPE", "SW_VERSION")
+
+# Other columns are dictionary-encoded when distinct values are at most this share of rows
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def get_row_sort_key(machine) -> Tuple[str, str]:
+    """Output order of machines: by SN, then TYPE, like the sorted machine directories."""
+    return machine.get("SN", ""), machine.get("TYPE", "")
+
+
+class MachineTable:
+    """
+    Extracted machines plus the union of their attribute names, in first-seen order.
+
+    Rows are MachineRecords over one shared ColumnSchema, and equal values
+    of different machines share one string, so a series costs a tuple of
+    references per machine instead of a dict with its own copy of every
+    property name.
+    """
+
+    def __init__(self):
+        self.schema = ColumnSchema()
+        self.rows: List[MachineRecord] = []
+        self._values: Dict[str, str] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.schema.names)
+
+    def append(self, machine: Dict[str, str]) -> None:
+        self.rows.append(MachineRecord.from_dict(self.schema, machine, self._values))
+
+    def sort(self, key) -> None:
+        self.rows.sort(key=key)
+
+    def iter_rows(self) -> Iterator[Tuple[Optional[str], ...]]:
+        """Every row as a tuple aligned with columns, None for missing values."""
+        width = len(self.schema)
+        for record in self.rows:
+            yield record.row(width)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        column_id = self.schema.column_id(name)
+        return [record.values[column_id] if column_id < len(record.values) else None for record in self.rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class XmlSink:
+    """
+    Streams machines into the XML repository document. The document is
+    written next to the output and replaces it when complete, so readers keep
+    the previous version until then.
+
+    Machines arriving out of SN order, such as deferred machines retried
+    after the others, are held back and merged into place on close.
+    """
+
+    label = "XML"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        remove_stale_temporaries(self.path)
+        self._tmp_path = temporary_path(self.path)
+        self._writer = MachineXmlWriter(self._tmp_path)
+        self._last_key: Optional[Tuple[str, str]] = None
+        self._late: List[Dict[str, str]] = []
+
+    def write(self, machine: Dict[str, str]) -> None:
+        key = get_row_sort_key(machine)
+        if self._last_key is not None and key < self._last_key:
+            self._late.append(machine)
+            return
+        self._last_key = key
+        self._writer.write_machine(machine)
+
+    def close(self) -> None:
+        if self._writer.closed:
+            return
+        self._writer.close()
+        if self._late:
+            insert_machines(self._tmp_path, self._late, get_row_sort_key)
+            self._late = []
+        replace_file(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Keep the previous document; the checkpoint journal has the machines written so far."""
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class CsvSink:
+    label = "CSV"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write_table(self, table: MachineTable) -> None:
+        with atomic_output(self.path) as tmp_path, open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            # csv writes None as an empty field, like DictWriter does for missing keys
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(table.columns)
+            writer.writerows(table.iter_rows())
+
+
+class JsonSink:
+    label = "JSON"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write_table(self, table: MachineTable) -> None:
+        # Same document as json.dump(records, indent=2), without building all records first
+        columns = table.columns
+        with atomic_output(self.path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+            separator = "[\n  "
+            for row in table.iter_rows():
+                f.write(separator)
+                f.write(json.dumps(dict(zip(columns, row)), indent=2).replace("\n", "\n  "))
+                separator = ",\n  "
+            f.write("[]" if separator.startswith("[") else "\n]")
+
+
+def compact_column(name: str, column, rows: int):
+    """
+    A pandas column as nullable strings, or as a categorical (dictionary-encoded
+    in Arrow) for DICTIONARY_COLUMNS and columns with few distinct values.
+    Categorical columns are returned as they are.
+    """
+    import pandas as pd
+
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column
+    column = column.astype("string")
+    if name in DICTIONARY_COLUMNS or column.nunique(dropna=True) <= max(1, int(rows * DICTIONARY_MAX_RATIO)):
+        column = column.astype("category")
+    return column
+
+
+def table_to_dataframe(table: MachineTable):
+    """Build a typed DataFrame for columnar exports, with columns as in compact_column."""
+    import pandas as pd
+
+    # Built one column at a time, so only a single column of Python objects exists at once
+    columns = {}
+    for name in table.columns:
+        columns[name] = compact_column(name, pd.Series(table.column(name), dtype="string"), len(table))
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(table)))
+
+
+def _require_pyarrow(label: str) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(f"{label} export requires the 'pyarrow' package") from exc
+
+
+class ParquetSink:
+    label = "Parquet"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write_table(self, table: MachineTable) -> None:
+        _require_pyarrow(self.label)
+        with atomic_output(self.path) as tmp_path:
+            table_to_dataframe(table).to_parquet(tmp_path, index=False)
+
+
+class FeatherSink:
+    """Arrow IPC (Feather v2) file."""
+
+    label = "Feather"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write_table(self, table: MachineTable) -> None:
+        _require_pyarrow(self.label)
+        with atomic_output(self.path) as tmp_path:
+            table_to_dataframe(table).to_feather(tmp_path)
+
+
+class SinkSet:
+    """
+    Fan every extracted machine out to all requested outputs in one pass.
+
+    Streaming sinks (write/close) receive machines as they are produced.
+    Tabular sinks (write_table) are written on close from a single shared
+    MachineTable, so the column union is computed once for all of them.
+    Machines written out of SN order end up in order in the XML and the
+    tables; the SQLite index and snapshots are keyed by TYPE and SN.
+    """
+
+    def __init__(self, sinks: List[object]):
+        self.streaming = [sink for sink in sinks if hasattr(sink, "write")]
+        self.tabular = [sink for sink in sinks if hasattr(sink, "write_table")]
+        self.table = MachineTable() if self.tabular else None
+        self.count = 0
+        self._closed = False
+        self._last_key: Optional[Tuple[str, str]] = None
+        self._ordered = True
+
+    def write(self, machine: Dict[str, str]) -> None:
+        for sink in self.streaming:
+            sink.write(machine)
+        if self.table is not None:
+            self.table.append(machine)
+        self.count += 1
+
+        key = get_row_sort_key(machine)
+        if self._last_key is not None and key < self._last_key:
+            self._ordered = False
+        else:
+            self._last_key = key
+
+    def retain(self, type_: str, sn: str) -> None:
+        """Tell incremental sinks that a machine still exists although it was not written."""
+        for sink in self.streaming:
+            if hasattr(sink, "retain"):
+                sink.retain(type_, sn)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        for sink in self.streaming:
+            sink.close()
+
+        if self.table is not None and not self._ordered:
+            self.table.sort(key=get_row_sort_key)
+
+        for sink in self.tabular:
+            try:
+                sink.write_table(self.table)
+                log_info(logger, f"Generated {sink.label}: {sink.path}")
+            except Exception as ex:
+                log_exception(logger, f"Error generating {sink.label}", ex)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for sink in self.streaming:
+                getattr(sink, "abort", sink.close)()
@@ -0,0 +1,309 @@
+"""Versioned per-series snapshots of the extracted machines and the change reports between them."""
+
+import json
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .logger import configure_logger, log_info
+from .sqlite_index import get_content_hash
+
+logger = configure_logger(__name__)
+
+DEFAULT_SNAPSHOT_DB_NAME = "snapshots.sqlite"
+
+# A snapshot only stores the machines that changed since the previous one of
+# the series: content_hash is the new content, NULL marks a removed machine.
+# The state of a machine at snapshot N is its last change with snapshot_id <= N.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    series TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    machines INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    changed INTEGER NOT NULL,
+    removed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_changes (
+    series TEXT NOT NULL,
+    type TEXT NOT NULL,
+    sn TEXT NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    content_hash TEXT,
+    PRIMARY KEY (series, type, sn, snapshot_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshot_changes_snapshot ON snapshot_changes (series, snapshot_id);
+CREATE TABLE IF NOT EXISTS contents (
+    content_hash TEXT PRIMARY KEY,
+    attributes BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Content hash of every machine of a series as of a snapshot
+STATE_AT_SQL = """
+SELECT c.type, c.sn, c.content_hash FROM snapshot_changes c
+WHERE c.series = ? AND c.snapshot_id = (
+    SELECT MAX(l.snapshot_id) FROM snapshot_changes l
+    WHERE l.series = c.series AND l.type = c.type AND l.sn = c.sn AND l.snapshot_id <= ?
+)
+"""
+
+HASH_AT_SQL = """
+SELECT content_hash FROM snapshot_changes
+WHERE series = ? AND type = ? AND sn = ? AND snapshot_id <= ?
+ORDER BY snapshot_id DESC LIMIT 1
+"""
+
+SnapshotRef = Union[int, str, None]
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def pack_attributes(machine: Dict[str, str]) -> bytes:
+    return zlib.compress(json.dumps(machine, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack_attributes(data: bytes) -> Dict[str, str]:
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class SnapshotSink:
+    """
+    Streaming sink that records a new snapshot of a series when the run
+    changed anything.
+
+    Only added, changed and removed machines are stored, and identical
+    contents are stored once, so a snapshot costs space in proportion to
+    the changes rather than to the archive.
+    """
+
+    label = "Snapshot"
+
+    def __init__(self, db_path: Path, series: str):
+        self.path = Path(db_path)
+        self.series = series
+        self.snapshot_id: Optional[int] = None
+        self._conn = connect(self.path)
+        latest = self._conn.execute("SELECT MAX(id) FROM snapshots WHERE series = ?", (series,)).fetchone()[0]
+        self._known: Dict[Tuple[str, str], str] = {
+            (type_, sn): content_hash
+            for type_, sn, content_hash in self._conn.execute(STATE_AT_SQL, (series, latest or 0))
+            if content_hash is not None
+        }
+        self._seen = set()
+        self._changes: Dict[Tuple[str, str], Tuple[str, Dict[str, str]]] = {}
+
+    def write(self, machine: Dict[str, str]) -> None:
+        key = (machine.get("TYPE", ""), machine.get("SN", ""))
+        self._seen.add(key)
+        content_hash = get_content_hash(machine)
+        if self._known.get(key) != content_hash:
+            self._changes[key] = (content_hash, machine)
+
+    def retain(self, type_: str, sn: str) -> None:
+        """A machine that could not be read in this run keeps its previous state."""
+        self._seen.add((type_, sn))
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        removed = [key for key in self._known if key not in self._seen]
+        added = sum(1 for key in self._changes if key not in self._known)
+        try:
+            if not self._changes and not removed:
+                log_info(logger, f"Snapshots {self.path}: {self.series} unchanged since the last snapshot")
+                return
+
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO snapshots (series, created_at, machines, added, changed, removed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self.series,
+                        datetime.now().isoformat(timespec="seconds"),
+                        len(self._seen),
+                        added,
+                        len(self._changes) - added,
+                        len(removed),
+                    ),
+                )
+                self.snapshot_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO contents (content_hash, attributes) VALUES (?, ?)",
+                    [(content_hash, pack_attributes(machine)) for content_hash, machine in self._changes.values()],
+                )
+                self._conn.executemany(
+                    "INSERT INTO snapshot_changes (series, type, sn, snapshot_id, content_hash) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        *((self.series, type_, sn, self.snapshot_id, content_hash)
+                          for (type_, sn), (content_hash, _) in self._changes.items()),
+                        *((self.series, type_, sn, self.snapshot_id, None) for type_, sn in removed),
+                    ],
+                )
+            log_info(
+                logger,
+                f"Snapshot {self.snapshot_id} of {self.series}: {added} added, "
+                f"{len(self._changes) - added} changed, {len(removed)} removed",
+            )
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def abort(self) -> None:
+        """An interrupted run does not describe the archive; record nothing."""
+        if self._conn is None:
+            return
+        self._conn.close()
+        self._conn = None
+
+
+class SnapshotDiff:
+    """Changes of a series between two snapshots."""
+
+    def __init__(self, series: str, old_id: int, new_id: int):
+        self.series = series
+        self.old_id = old_id
+        self.new_id = new_id
+        self.added: List[Dict[str, str]] = []
+        self.removed: List[Dict[str, str]] = []
+        # One entry per changed attribute: TYPE, SN, ATTRIBUTE, OLD, NEW
+        self.changed: List[Dict[str, Optional[str]]] = []
+
+    @property
+    def changed_machines(self) -> int:
+        return len({(row["TYPE"], row["SN"]) for row in self.changed})
+
+    def rows(self) -> List[Dict[str, Optional[str]]]:
+        """The report as flat rows with a CHANGE column (added, removed or changed)."""
+        rows: List[Dict[str, Optional[str]]] = []
+        for change, machines in (("added", self.added), ("removed", self.removed)):
+            for machine in machines:
+                rows.append({
+                    "CHANGE": change,
+                    "TYPE": machine.get("TYPE"),
+                    "SN": machine.get("SN"),
+                    "ATTRIBUTE": "SW_VERSION",
+                    "OLD": machine.get("SW_VERSION") if change == "removed" else None,
+                    "NEW": machine.get("SW_VERSION") if change == "added" else None,
+                })
+        rows.extend({"CHANGE": "changed", **row} for row in self.changed)
+        rows.sort(key=lambda row: (row["SN"] or "", row["TYPE"] or ""))
+        return rows
+
+
+def list_snapshots(db_path: Path, series: str) -> List[Dict[str, Union[int, str]]]:
+    """Snapshots of a series, newest first."""
+    if not Path(db_path).is_file():
+        return []
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.execute(
+            "SELECT id, created_at, machines, added, changed, removed FROM snapshots WHERE series = ? ORDER BY id DESC",
+            (series,),
+        )
+        header = [column[0] for column in cursor.description]
+        return [dict(zip(header, row)) for row in cursor]
+    finally:
+        conn.close()
+
+
+def resolve_snapshot(conn: sqlite3.Connection, series: str, ref: SnapshotRef, default_offset: int = 0) -> int:
+    """
+    Snapshot id for a reference: an id, a date or ISO timestamp (the last
+    snapshot taken up to then), or None for the latest snapshot minus
+    default_offset. 0 stands for the empty state before the first snapshot.
+    """
+    if ref is None:
+        row = conn.execute(
+            "SELECT id FROM snapshots WHERE series = ? ORDER BY id DESC LIMIT 1 OFFSET ?", (series, default_offset)
+        ).fetchone()
+        return row[0] if row else 0
+    if isinstance(ref, int) or str(ref).isdigit():
+        snapshot_id = int(ref)
+        if snapshot_id and conn.execute(
+            "SELECT 1 FROM snapshots WHERE series = ? AND id = ?", (series, snapshot_id)
+        ).fetchone() is None:
+            raise ValueError(f"Snapshot {snapshot_id} of {series} not found")
+        return snapshot_id
+
+    try:
+        moment = datetime.fromisoformat(ref)
+    except ValueError:
+        raise ValueError(f"Invalid snapshot '{ref}', expected an id, a date or an ISO timestamp") from None
+    if len(ref) == 10:
+        # A bare date includes the whole day
+        moment = moment.replace(hour=23, minute=59, second=59)
+    row = conn.execute(
+        "SELECT MAX(id) FROM snapshots WHERE series = ? AND created_at <= ?",
+        (series, moment.isoformat(timespec="seconds")),
+    ).fetchone()
+    return row[0] or 0
+
+
+def diff_snapshots(
+    db_path: Path, series: str, old: SnapshotRef = None, new: SnapshotRef = None
+) -> SnapshotDiff:
+    """
+    Compare two snapshots of a series (default: the previous and the latest).
+
+    Only machines with a recorded change between the two snapshots are
+    looked at, and attributes are compared only where the content hashes
+    differ, so the cost follows the number of changes.
+    """
+    if not Path(db_path).is_file():
+        raise FileNotFoundError(f"Snapshot database not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        new_id = resolve_snapshot(conn, series, new)
+        old_id = resolve_snapshot(conn, series, old, default_offset=1)
+        if old_id > new_id:
+            old_id, new_id = new_id, old_id
+        diff = SnapshotDiff(series, old_id, new_id)
+
+        touched = conn.execute(
+            "SELECT DISTINCT type, sn FROM snapshot_changes WHERE series = ? AND snapshot_id > ? AND snapshot_id <= ?",
+            (series, old_id, new_id),
+        ).fetchall()
+        contents: Dict[str, Dict[str, str]] = {}
+
+        def load(content_hash: str) -> Dict[str, str]:
+            if content_hash not in contents:
+                row = conn.execute("SELECT attributes FROM contents WHERE content_hash = ?", (content_hash,)).fetchone()
+                contents[content_hash] = unpack_attributes(row[0])
+            return contents[content_hash]
+
+        for type_, sn in touched:
+            old_hash = conn.execute(HASH_AT_SQL, (series, type_, sn, old_id)).fetchone() if old_id else None
+            new_hash = conn.execute(HASH_AT_SQL, (series, type_, sn, new_id)).fetchone()
+            old_hash = old_hash[0] if old_hash else None
+            new_hash = new_hash[0] if new_hash else None
+            if old_hash == new_hash:
+                # Changed and changed back in between
+                continue
+            if old_hash is None:
+                diff.added.append(load(new_hash))
+            elif new_hash is None:
+                diff.removed.append(load(old_hash))
+            else:
+                before, after = load(old_hash), load(new_hash)
+                for name in sorted(before.keys() | after.keys()):
+                    if before.get(name) != after.get(name):
+                        diff.changed.append(
+                            {"TYPE": type_, "SN": sn, "ATTRIBUTE": name, "OLD": before.get(name), "NEW": after.get(name)}
+                        )
+    finally:
+        conn.close()
+
+    for machines in (diff.added, diff.removed):
+        machines.sort(key=lambda machine: (machine.get("SN", ""), machine.get("TYPE", "")))
+    diff.changed.sort(key=lambda row: (row["SN"], row["TYPE"], row["ATTRIBUTE"]))
+    return diff
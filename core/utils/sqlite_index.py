@@ -0,0 +1,226 @@
+"""SQLite index of extracted machines with indexed attribute lookups."""
+
+import hashlib
+import json
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .logger import configure_logger, log_info
+
+logger = configure_logger(__name__)
+
+DEFAULT_DB_NAME = "machines.sqlite"
+
+# Attributes with their own partial index in addition to (name, value)
+DEFAULT_HOT_ATTRIBUTES: Tuple[str, ...] = ()
+
+# Attributes stored as columns of the machines table
+MACHINE_COLUMNS = {"TYPE": "type", "SN": "sn", "SW_VERSION": "sw_version"}
+
+# Changed machines buffered in memory and written per transaction
+COMMIT_EVERY = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (
+    series TEXT NOT NULL,
+    type TEXT NOT NULL,
+    sn TEXT NOT NULL,
+    sw_version TEXT,
+    content_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (series, type, sn)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    series TEXT NOT NULL,
+    type TEXT NOT NULL,
+    sn TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (series, type, sn, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_machines_sn ON machines (sn);
+CREATE INDEX IF NOT EXISTS idx_machines_type ON machines (type);
+CREATE INDEX IF NOT EXISTS idx_machines_sw_version ON machines (sw_version);
+CREATE INDEX IF NOT EXISTS idx_attributes_name_value ON attributes (name, value);
+"""
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def create_hot_indexes(conn: sqlite3.Connection, attributes: Iterable[str]) -> None:
+    for name in attributes:
+        index_name = "idx_hot_" + re.sub(r"\W", "_", name)
+        literal = name.replace("'", "''")
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "{index_name}" ON attributes (value) WHERE name = \'{literal}\''
+        )
+
+
+def get_content_hash(machine: Dict[str, str]) -> str:
+    payload = json.dumps(sorted(machine.items()), separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SqliteSink:
+    """
+    Streaming sink that keeps one series up to date in the SQLite index.
+
+    Machines whose content hash did not change are left untouched, changed
+    ones are rewritten and machines that disappeared are removed on close.
+    Changed machines are buffered and written in batches, each in its own
+    short transaction, so the write lock is never held while the series is
+    still reading from the share and other series can use the same file.
+    """
+
+    label = "SQLite"
+
+    def __init__(self, db_path: Path, series: str, hot_attributes: Sequence[str] = DEFAULT_HOT_ATTRIBUTES):
+        self.path = Path(db_path)
+        self.series = series
+        self.updated = 0
+        self.unchanged = 0
+        self._conn = connect(self.path)
+        create_hot_indexes(self._conn, hot_attributes)
+        self._conn.commit()
+        self._known: Dict[Tuple[str, str], str] = {
+            (type_, sn): content_hash
+            for type_, sn, content_hash in self._conn.execute(
+                "SELECT type, sn, content_hash FROM machines WHERE series = ?", (series,)
+            )
+        }
+        self._seen = set()
+        self._pending: List[Tuple[str, Dict[str, str]]] = []
+
+    def write(self, machine: Dict[str, str]) -> None:
+        key = (machine.get("TYPE", ""), machine.get("SN", ""))
+        self._seen.add(key)
+        content_hash = get_content_hash(machine)
+        if self._known.get(key) == content_hash:
+            self.unchanged += 1
+            return
+
+        self._pending.append((content_hash, machine))
+        if len(self._pending) >= COMMIT_EVERY:
+            with self._conn:
+                self._write_pending()
+
+    def _write_pending(self) -> None:
+        # Runs inside a transaction of the caller
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        for content_hash, machine in self._pending:
+            type_, sn = machine.get("TYPE", ""), machine.get("SN", "")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO machines (series, type, sn, sw_version, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.series, type_, sn, machine.get("SW_VERSION"), content_hash, updated_at),
+            )
+            self._conn.execute("DELETE FROM attributes WHERE series = ? AND type = ? AND sn = ?", (self.series, type_, sn))
+            self._conn.executemany(
+                "INSERT INTO attributes (series, type, sn, name, value) VALUES (?, ?, ?, ?, ?)",
+                [(self.series, type_, sn, name, value) for name, value in machine.items() if name not in MACHINE_COLUMNS],
+            )
+        self.updated += len(self._pending)
+        self._pending = []
+
+    def retain(self, type_: str, sn: str) -> None:
+        """Keep the stored row of a machine that could not be read in this run."""
+        self._seen.add((type_, sn))
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        removed = [key for key in self._known if key not in self._seen]
+        with self._conn:
+            self._write_pending()
+            for type_, sn in removed:
+                self._conn.execute("DELETE FROM machines WHERE series = ? AND type = ? AND sn = ?", (self.series, type_, sn))
+                self._conn.execute("DELETE FROM attributes WHERE series = ? AND type = ? AND sn = ?", (self.series, type_, sn))
+        self._conn.close()
+        self._conn = None
+        log_info(
+            logger,
+            f"SQLite index {self.path}: {self.updated} updated, {self.unchanged} unchanged, {len(removed)} removed",
+        )
+
+    def abort(self) -> None:
+        """Keep what was written so far but do not treat unseen machines as removed."""
+        if self._conn is None:
+            return
+        with self._conn:
+            self._write_pending()
+        self._conn.close()
+        self._conn = None
+
+
+def parse_condition(condition: str) -> Tuple[str, str, str]:
+    """Split 'NAME=VALUE', 'NAME!=VALUE' or 'NAME~PATTERN' (* as wildcard) into (name, op, value)."""
+    match = re.match(r"^(.+?)(!=|=|~)(.*)$", condition)
+    if not match:
+        raise ValueError(f"Invalid condition '{condition}', expected NAME=VALUE, NAME!=VALUE or NAME~PATTERN")
+    return match.group(1).strip(), match.group(2), match.group(3)
+
+
+def query_machines(
+    db_path: Path,
+    series: Optional[Sequence[str]] = None,
+    where: Sequence[str] = (),
+    columns: Sequence[str] = (),
+) -> List[Dict[str, Optional[str]]]:
+    """
+    Return the machines matching every condition in where, with TYPE, SN,
+    SW_VERSION and the requested attribute columns.
+    """
+    clauses: List[str] = []
+    params: List[str] = []
+
+    if series:
+        clauses.append(f"m.series IN ({', '.join('?' * len(series))})")
+        params.extend(series)
+
+    for condition in where:
+        name, op, value = parse_condition(condition)
+        sql_op = {"=": "=", "!=": "!=", "~": "LIKE"}[op]
+        if op == "~":
+            value = value.replace("*", "%")
+
+        if name in MACHINE_COLUMNS:
+            clauses.append(f"m.{MACHINE_COLUMNS[name]} {sql_op} ?")
+            params.append(value)
+        else:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM attributes a WHERE a.series = m.series AND a.type = m.type "
+                f"AND a.sn = m.sn AND a.name = ? AND a.value {sql_op} ?)"
+            )
+            params.extend([name, value])
+
+    select = ["m.series", "m.type", "m.sn", "m.sw_version"]
+    for idx, name in enumerate(columns):
+        select.append(
+            f"(SELECT a{idx}.value FROM attributes a{idx} WHERE a{idx}.series = m.series "
+            f"AND a{idx}.type = m.type AND a{idx}.sn = m.sn AND a{idx}.name = ?)"
+        )
+    sql = f"SELECT {', '.join(select)} FROM machines m"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY m.series, m.sn, m.type"
+
+    if not Path(db_path).is_file():
+        raise FileNotFoundError(f"SQLite index not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute(sql, [*columns, *params]).fetchall()
+    finally:
+        conn.close()
+
+    header = ["SERIES", "TYPE", "SN", "SW_VERSION", *columns]
+    return [dict(zip(header, row)) for row in rows]
@@ -0,0 +1,108 @@
+"""Stat-based change detection for --watch."""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
+
+from .definitions import SeriesConfigBase
+from .manifest import FileSignature, MachineManifest, get_file_signature, get_manifest_path, get_relevant_files
+
+# Seconds between listings of the repository roots
+DEFAULT_WATCH_INTERVAL = 10.0
+
+# Seconds between checks of the files of every known machine
+DEFAULT_VERIFY_INTERVAL = 600.0
+
+
+class RepositoryWatcher:
+    """
+    Decide after each listing of the repository roots which series need
+    their outputs refreshed, and which of their machines are known to be
+    unchanged.
+
+    A listing shows new and removed machine directories for the cost of one
+    directory read per root. Machines that appeared since the last full check
+    are stat'ed on every poll, so files still being copied are picked up as
+    they land. Changed files in other machines need a stat per file, so they
+    are only looked for every verify_interval seconds, against the manifest
+    written by the last refresh.
+    """
+
+    def __init__(
+        self,
+        series_infos: List[SeriesConfigBase],
+        out_dir: Path,
+        verify_interval: float = DEFAULT_VERIFY_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.series_infos = {series_info.series: series_info for series_info in series_infos}
+        self.out_dir = Path(out_dir)
+        self.verify_interval = verify_interval
+        self._clock = clock
+        self._last_verify = clock()
+        self._known: Dict[str, FrozenSet[str]] = {}
+        self._recent: Dict[str, Dict[str, FileSignature]] = {}
+
+    def poll(self, found: Dict[str, List[Path]]) -> Dict[str, Set[str]]:
+        """
+        Series to refresh, mapped to the names of their machines whose files
+        need not be checked again. A series seen for the first time is
+        refreshed in full.
+        """
+        now = self._clock()
+        verify = now - self._last_verify >= self.verify_interval
+        if verify:
+            self._last_verify = now
+
+        refresh: Dict[str, Set[str]] = {}
+        for series, dirs in found.items():
+            if series not in self.series_infos:
+                continue
+            dirs_by_name = {dir_path.name: dir_path for dir_path in dirs}
+            names = frozenset(dirs_by_name)
+            previous = self._known.get(series)
+            recent = self._recent.setdefault(series, {})
+            self._known[series] = names
+
+            if previous is None:
+                refresh[series] = set()
+            elif verify:
+                recent.clear()
+                changed = self._verify(series, dirs)
+                if changed is not None:
+                    refresh[series] = set(names - changed)
+            else:
+                changed = self._check_recent(series, dirs_by_name, names - previous)
+                if changed or previous - names:
+                    refresh[series] = set(names - changed)
+        return refresh
+
+    def forget(self, series: str) -> None:
+        """The last refresh of series failed; refresh it in full on the next poll."""
+        self._known.pop(series, None)
+        self._recent.pop(series, None)
+
+    def _check_recent(self, series: str, dirs_by_name: Dict[str, Path], added: FrozenSet[str]) -> Set[str]:
+        files = get_relevant_files(self.series_infos[series])
+        recent = self._recent[series]
+        changed = set(added)
+        for name in added:
+            recent[name] = None
+        for name in list(recent):
+            if name not in dirs_by_name:
+                del recent[name]
+                continue
+            signature = get_file_signature(dirs_by_name[name], files)
+            if signature != recent[name]:
+                recent[name] = signature
+                changed.add(name)
+        return changed
+
+    def _verify(self, series: str, dirs: List[Path]) -> Optional[Set[str]]:
+        """Names of new or changed machines, or None when the outputs are current."""
+        series_info = self.series_infos[series]
+        manifest = MachineManifest(get_manifest_path(self.out_dir, series_info), series_info)
+        changed = {dir_path.name for dir_path in manifest.changed(dirs)}
+        if not changed and len(manifest) == len(dirs):
+            return None
+        return changed
@@ -0,0 +1,75 @@
+import os
+import xml.etree.ElementTree as ET
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List
+
+XML_HEADER = b"<?xml version='1.0' encoding='utf-8'?>\n<repository>\n"
+XML_FOOTER = b"</repository>"
+
+
+class MachineXmlWriter:
+    """
+    Incrementally write <machine> elements into a <repository> document.
+
+    Each machine is appended in front of the closing tag, so the file on disk
+    is a complete document after every write and the cost per machine does
+    not depend on how many machines were written before.
+    """
+
+    def __init__(self, xml_path: Path):
+        self.xml_path = Path(xml_path)
+        self.xml_path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._file = open(self.xml_path, "wb")
+        self._file.write(XML_HEADER)
+        self._tail = self._file.tell()
+        self._file.write(XML_FOOTER)
+        self._file.flush()
+
+    def write_machine(self, attributes: Dict[str, str]) -> None:
+        element = ET.Element("machine", attributes)
+        data = b"  " + ET.tostring(element, encoding="utf-8", xml_declaration=False) + b"\n"
+
+        self._file.seek(self._tail)
+        self._file.write(data)
+        self._file.write(XML_FOOTER)
+        self._file.flush()
+        self._tail += len(data)
+        self.count += 1
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def insert_machines(xml_path: Path, machines: List[Dict[str, str]], key: Callable[[Dict[str, str]], tuple]) -> None:
+    """
+    Insert machines into a document written by MachineXmlWriter whose
+    machines are ordered by key, keeping that order. The document is read
+    and rewritten once, one line at a time.
+    """
+    xml_path = Path(xml_path)
+    pending = deque(sorted(machines, key=key))
+    merged_path = xml_path.with_name(f"{xml_path.name}.merge")
+    with open(xml_path, "rb") as src, MachineXmlWriter(merged_path) as writer:
+        for line in src:
+            if not line.startswith(b"  <machine"):
+                continue
+            attributes = ET.fromstring(line).attrib
+            while pending and key(pending[0]) < key(attributes):
+                writer.write_machine(pending.popleft())
+            writer.write_machine(attributes)
+        for machine in pending:
+            writer.write_machine(machine)
+    os.replace(merged_path, xml_path)
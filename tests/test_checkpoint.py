@@ -0,0 +1,97 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+import core.utils.machine_data as machine_data
+from core.utils.checkpoint import CheckpointJournal
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.manifest import MachineManifest
+
+from test_machine_data import make_machine, make_series
+
+
+def test_torn_last_line_is_dropped_on_resume(tmp_path: Path):
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record("W501_000001", {"SN": "000001"})
+    journal.close()
+    with open(path, "ab") as f:
+        f.write(b'{"dir":"W501_0000')
+
+    journal = CheckpointJournal(path, resume=True)
+    assert list(journal.completed) == ["W501_000001"]
+    journal.record("W501_000002", {"SN": "000002"})
+    journal.close()
+
+    journal = CheckpointJournal(path, resume=True)
+    assert journal.completed == {"W501_000001": {"SN": "000001"}, "W501_000002": {"SN": "000002"}}
+    journal.close()
+
+
+def test_interrupted_run_resumes_without_rereading_completed_machines(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    out_dir = tmp_path / "output"
+    series = make_series()
+    dirs = [make_machine(repo, f"W501_00000{i}", "V1.0", {"Index": str(i)}) for i in range(1, 6)]
+    journal_path = tmp_path / "output" / "journal.jsonl"
+
+    original = machine_data.extract_machine
+
+    def flaky(dir_path, series_info):
+        if dir_path.name == "W501_000004":
+            raise KeyboardInterrupt
+        return original(dir_path, series_info)
+
+    monkeypatch.setattr(machine_data, "extract_machine", flaky)
+    journal = CheckpointJournal(journal_path)
+    with pytest.raises(KeyboardInterrupt):
+        get_machine_data_from_directories(dirs, out_dir, series, checkpoint=journal)
+    journal.close()
+
+    read = []
+    monkeypatch.setattr(machine_data, "extract_machine", lambda d, s: read.append(d.name) or original(d, s))
+    get_machine_data_from_directories(dirs, out_dir, series, checkpoint=CheckpointJournal(journal_path, resume=True))
+
+    assert read == ["W501_000004", "W501_000005"]
+    assert not journal_path.exists()
+    machines = ET.parse(out_dir / series.out_file_name).getroot().findall("machine")
+    assert [m.get("Index") for m in machines] == ["1", "2", "3", "4", "5"]
+
+
+def test_machines_restored_from_the_checkpoint_are_reused_by_the_next_run(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    out_dir = tmp_path / "output"
+    series = make_series()
+    dirs = [make_machine(repo, f"W501_00000{i}", "V1.0", {"Index": str(i)}) for i in range(1, 5)]
+    journal_path = out_dir / "journal.jsonl"
+    manifest_path = out_dir / "machines.manifest.json"
+
+    original = machine_data.extract_machine
+
+    def flaky(dir_path, series_info):
+        if dir_path.name == "W501_000003":
+            raise KeyboardInterrupt
+        return original(dir_path, series_info)
+
+    monkeypatch.setattr(machine_data, "extract_machine", flaky)
+    with pytest.raises(KeyboardInterrupt):
+        get_machine_data_from_directories(
+            dirs, out_dir, series, manifest=MachineManifest(manifest_path, series), checkpoint=CheckpointJournal(journal_path)
+        )
+
+    monkeypatch.setattr(machine_data, "extract_machine", original)
+    get_machine_data_from_directories(
+        dirs,
+        out_dir,
+        series,
+        manifest=MachineManifest(manifest_path, series),
+        checkpoint=CheckpointJournal(journal_path, resume=True),
+    )
+
+    read = []
+    monkeypatch.setattr(machine_data, "extract_machine", lambda d, s: read.append(d.name) or original(d, s))
+    summary = get_machine_data_from_directories(dirs, out_dir, series, manifest=MachineManifest(manifest_path, series))
+
+    assert read == []
+    assert summary.reused == 4
@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from test_machine_data import make_machine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs the CLI against generated series T300 and T305, writing to the given output folder
+DRIVER = """
+import sys
+from pathlib import Path
+
+sys.path.insert(0, {core!r})
+import machine_config_parser
+from utils import definitions
+
+repo, out_dir = Path(sys.argv[1]), Path(sys.argv[2])
+definitions.ALL_SERIES_CONFIGS[:] = [
+    definitions.SeriesConfigBase(
+        series,
+        str(repo),
+        rf"^{{series}}_\\d{{{{6}}}}$",
+        ["ControlUnit/0_MetaDataProject.csp"],
+        "ControlUnit/MU_Config.TcGVL",
+        f"{{series}}/{{series}}_machines.xml",
+    )
+    for series in ("T300", "T305")
+]
+machine_config_parser.DEFAULT_OUTFILES_PATH = out_dir
+sys.argv = ["machine_config_parser", *sys.argv[3:]]
+machine_config_parser.main()
+""".format(core=str(ROOT / "core"))
+
+
+def run_cli(repo: Path, out_dir: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", DRIVER, str(repo), str(out_dir), *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_profile_with_several_series_writes_every_report(tmp_path: Path):
+    repo = tmp_path / "repo"
+    for idx in range(3):
+        make_machine(repo, f"T300_{idx:06d}", "V1.0", {"Index": str(idx)})
+        make_machine(repo, f"T305_{idx:06d}", "V2.0", {"Index": str(idx)})
+    out_dir = tmp_path / "output"
+    metrics_path = tmp_path / "metrics.json"
+
+    completed = run_cli(repo, out_dir, "--series", "T300", "T305", "--profile", "--metrics-out", str(metrics_path))
+
+    assert completed.returncode == 0, completed.stderr
+    for series in ("T300", "T305"):
+        assert (out_dir / series / f"{series}_machines.profile.txt").is_file()
+        assert (out_dir / series / f"{series}_machines.profile.pstats").is_file()
+    report = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert [(entry["series"], entry["status"], entry["machines"]) for entry in report["series"]] == [
+        ("T300", "ok", 3),
+        ("T305", "ok", 3),
+    ]
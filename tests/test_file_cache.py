@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+from core.utils.file_cache import FileCache
+
+
+def test_fetch_copies_once_and_follows_remote_changes(tmp_path: Path):
+    remote = tmp_path / "share" / "MU_Config.TcGVL"
+    remote.parent.mkdir()
+    remote.write_text("version 1", encoding="utf-8")
+    cache = FileCache(tmp_path / "cache", max_bytes=1024)
+
+    assert cache.read_bytes(remote) == b"version 1"
+    assert cache.read_bytes(remote) == b"version 1"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    remote.write_text("version 2!", encoding="utf-8")
+    st = os.stat(remote)
+    os.utime(remote, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.read_bytes(remote) == b"version 2!"
+    assert cache.read_bytes(tmp_path / "share" / "missing.csp") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    share = tmp_path / "share"
+    share.mkdir()
+    files = []
+    for name in "abc":
+        path = share / f"{name}.csp"
+        path.write_bytes(b"x" * 40)
+        files.append(path)
+    cache = FileCache(tmp_path / "cache", max_bytes=100)
+
+    def entry(path: Path) -> Path:
+        st = path.stat()
+        key = FileCache.make_key(path, st.st_size, st.st_mtime_ns)
+        return tmp_path / "cache" / key[:2] / key
+
+    cache.read_bytes(files[0])
+    cache.read_bytes(files[1])
+    cache.read_bytes(files[0])  # a is now more recent than b
+    cache.read_bytes(files[2])
+
+    assert entry(files[0]).exists() and entry(files[2]).exists()
+    assert not entry(files[1]).exists()
+    assert cache.total_bytes == 80
+    assert FileCache(tmp_path / "cache", max_bytes=100).total_bytes == 80
+
+
+def test_unrelated_files_in_the_cache_directory_are_left_alone(tmp_path: Path):
+    root = tmp_path / "output"
+    key = FileCache.make_key(tmp_path / "gone.csp", 40, 1)
+    unrelated = [root / "Wxxx" / "Wxxx_machines.csv", root / "ab" / "notes.txt", root / key[:2] / f"{key}.tmp"]
+    for path in unrelated:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"y" * 80)
+    stale_tmp = root / key[:2] / f"{key}.123.456.tmp"
+    stale_tmp.write_bytes(b"z")
+    os.utime(stale_tmp, (0, 0))
+
+    share = tmp_path / "share"
+    share.mkdir()
+    for name in "ab":
+        (share / f"{name}.csp").write_bytes(b"x" * 40)
+    cache = FileCache(root, max_bytes=50)
+    assert cache.total_bytes == 0
+
+    cache.read_bytes(share / "a.csp")
+    cache.read_bytes(share / "b.csp")
+
+    assert all(path.exists() for path in unrelated)
+    assert not stale_tmp.exists()
+    assert cache.total_bytes == 40
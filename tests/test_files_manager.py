@@ -0,0 +1,98 @@
+import gc
+import sys
+import weakref
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from app import table_query  # noqa: E402
+
+# The app imports its modules by bare name, as `streamlit run app/app.py` puts app/ on the path.
+# Adding app/ to sys.path here would shadow the app package with app/app.py.
+sys.modules.setdefault("table_query", table_query)
+
+import os  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+from app.files_manager import Files, get_file_fingerprint, load_data_file, load_table_index  # noqa: E402
+
+
+def write_csv(path: Path, rows: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["TYPE,SN,SW_VERSION"] + [f"W50{i % 2},{i:06d},V{i % 3}" for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def make_files(tmp_path: Path, csv_path: Path) -> Files:
+    files = Files("Wxxx")
+    files.base_folder = tmp_path
+    files.correct_file = csv_path
+    return files
+
+
+def test_data_tab_renders_through_the_table_index(tmp_path: Path):
+    files = make_files(tmp_path, write_csv(tmp_path / "Wxxx" / "Wxxx_machines.csv", 120))
+
+    files.show_data()
+    files.show_filtered_data()
+
+    index = load_table_index(*files.fingerprint)
+    assert index.df is files.df
+    assert "TYPE" in index.filterable_columns
+    assert len(index.filter({"TYPE": ["W501"]})) == 60
+
+
+def test_loaded_frame_is_reloaded_when_the_file_changes(tmp_path: Path):
+    csv_path = write_csv(tmp_path / "machines.csv", 10)
+    first = load_data_file(*get_file_fingerprint(csv_path))
+    assert load_data_file(*get_file_fingerprint(csv_path)) is first
+
+    # Same size, newer mtime
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    touched = load_data_file(*get_file_fingerprint(csv_path))
+    assert touched is not first
+
+    # Same mtime, different size
+    mtime_ns = csv_path.stat().st_mtime_ns
+    write_csv(csv_path, 12)
+    os.utime(csv_path, ns=(mtime_ns, mtime_ns))
+    grown = load_data_file(*get_file_fingerprint(csv_path))
+    assert grown is not touched
+    assert len(grown) == 12
+
+
+def test_loaded_frame_keeps_compact_dtypes(tmp_path: Path):
+    csv_path = tmp_path / "machines.csv"
+    rows = ["TYPE,SN,SW_VERSION,Lanes"] + [f"W501,{i:06d},V{i},{i % 2}" for i in range(10)]
+    csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    df = load_data_file(*get_file_fingerprint(csv_path))
+
+    # TYPE and SW_VERSION are always categoricals, like in the Parquet export
+    assert isinstance(df["TYPE"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["SW_VERSION"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Lanes"].dtype, pd.CategoricalDtype)
+    assert df["SN"].dtype == "string"
+
+
+def test_a_regenerated_file_replaces_the_cached_version(tmp_path: Path):
+    csv_path = write_csv(tmp_path / "machines.csv", 10)
+    fingerprint = get_file_fingerprint(csv_path)
+    old_frame = weakref.ref(load_data_file(*fingerprint))
+    old_index = weakref.ref(load_table_index(*fingerprint))
+    assert load_table_index(*fingerprint) is old_index()
+
+    write_csv(csv_path, 12)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    index = load_table_index(*get_file_fingerprint(csv_path))
+    gc.collect()
+
+    assert len(index.df) == 12
+    assert old_frame() is None
+    assert old_index() is None
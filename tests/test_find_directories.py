@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from core.utils.find_directories import find_directories, find_series_directories
+
+
+def test_find_series_directories_routes_entries_in_one_pass(tmp_path: Path):
+    for name in ["T300_000001", "T305_000002", "T300_000003", "T301_000004", "T300_12"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "T305_000005").write_text("not a directory")
+
+    found = find_series_directories(str(tmp_path), {"T300": r"^T300_\d{6}$", "T305": r"^T305_\d{6}$"})
+
+    assert sorted(p.name for p in found["T300"]) == ["T300_000001", "T300_000003"]
+    assert [p.name for p in found["T305"]] == ["T305_000002"]
+    assert sorted(found["T300"]) == sorted(find_directories(str(tmp_path), r"^T300_\d{6}$"))
+
+
+def test_find_series_directories_gives_overlapping_matches_to_every_series(tmp_path: Path):
+    for name in ["W501_000001", "W502_000002", "W601_000003"]:
+        (tmp_path / name).mkdir()
+    patterns = {"W5xx": r"^W5\d{2}_\d{6}$", "W50x": r"^W50\d_\d{6}$", "Wxxx": r"^W\d{3}_\d{6}$"}
+
+    found = find_series_directories(str(tmp_path), patterns)
+
+    for series, pattern in patterns.items():
+        assert sorted(found[series]) == sorted(find_directories(str(tmp_path), pattern))
+    assert len(found["W50x"]) == 2
+    assert len(found["Wxxx"]) == 3
@@ -0,0 +1,32 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from benchmarks.generate_archive import generate_archive
+from core.utils.find_directories import find_directories
+from core.utils.machine_data import extract_machine, get_machine_data_from_directories
+
+
+@pytest.mark.parametrize("variant", ["tcgvl", "exp"])
+def test_generated_archive_is_parsable(tmp_path: Path, variant: str):
+    series_info = generate_archive(tmp_path, 5, variant=variant, property_scale=0.1)
+
+    found = sorted(find_directories(str(tmp_path), series_info.regex_pattern))
+    assert len(found) == 5
+
+    machine = extract_machine(found[0], series_info)
+    assert machine["SN"] == "000000"
+    assert machine["SW_VERSION"].startswith("V")
+    assert any(name.endswith("_3_StationConfiguration") for name in machine)
+
+
+def test_output_of_a_generated_archive_is_valid_xml(tmp_path: Path):
+    series_info = generate_archive(tmp_path / "archive", 3, property_scale=0.1)
+    found = find_directories(str(tmp_path / "archive"), series_info.regex_pattern)
+
+    get_machine_data_from_directories(found, tmp_path / "out", series_info)
+
+    machines = ET.parse(tmp_path / "out" / series_info.out_file_name).getroot().findall("machine")
+    assert len(machines) == 3
+    assert "P0000_3_StationConfiguration" in machines[0].attrib
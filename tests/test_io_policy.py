@@ -0,0 +1,88 @@
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import core.utils.io_policy as io_policy
+import core.utils.machine_data as machine_data
+from core.utils.io_policy import IoPolicy, ReadTimeoutError
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.sinks import CsvSink
+
+from test_machine_data import make_machine, make_series
+
+
+class SlowFilesystem:
+    """Path.read_bytes replacement that delays the n-th read of selected machines."""
+
+    def __init__(self, delays):
+        # machine directory name -> list of delays for its successive CSP reads
+        self.delays = delays
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.read_bytes = Path.read_bytes
+
+    def __call__(self, path: Path) -> bytes:
+        machine = path.parent.parent.name
+        if path.suffix == ".csp" and machine in self.delays:
+            with self.lock:
+                call = self.calls.get(machine, 0)
+                self.calls[machine] = call + 1
+            schedule = self.delays[machine]
+            time.sleep(schedule[min(call, len(schedule) - 1)])
+        return self.read_bytes(path)
+
+
+def test_policy_returns_first_finished_attempt():
+    delays = iter([1.0, 0.0])
+    policy = IoPolicy(timeout=0.05, retries=1, backoff=0.0)
+
+    start = time.perf_counter()
+    assert policy.call(lambda: time.sleep(next(delays)) or "done") == "done"
+    assert time.perf_counter() - start < 0.5
+
+    with pytest.raises(ReadTimeoutError):
+        IoPolicy(timeout=0.02, retries=1, backoff=0.0).call(time.sleep, 0.5)
+
+
+def test_attempts_share_a_bounded_set_of_threads():
+    policy = IoPolicy(timeout=1.0, retries=0)
+    before = threading.active_count()
+    for idx in range(200):
+        assert policy.call(lambda value: value, idx) == idx
+    # Sequential calls reuse an idle thread instead of starting one per attempt
+    assert threading.active_count() - before <= 1
+    assert io_policy._attempts.threads <= io_policy.IO_ATTEMPT_WORKERS
+
+
+def test_stragglers_are_hedged_deferred_and_reported(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W501_00000{i}", "V1.0", {"Index": str(i)}) for i in range(1, 6)]
+    slow_fs = SlowFilesystem({
+        "W501_000002": [0.5, 0.0],           # first attempt hangs, the hedged retry wins
+        "W501_000003": [0.5, 0.5, 0.0],      # times out twice, succeeds on the slow path
+        "W501_000004": [5.0],                # never finishes
+    })
+    monkeypatch.setattr(Path, "read_bytes", lambda path: slow_fs(path))
+    monkeypatch.setattr(
+        machine_data, "_io_policy", IoPolicy(timeout=0.1, retries=1, backoff=0.0, deferred_timeout=0.3)
+    )
+    out_dir = tmp_path / "output"
+    series = make_series()
+    xml_path = out_dir / series.out_file_name
+
+    summary = get_machine_data_from_directories(
+        dirs, out_dir, series, workers=2, sinks=[CsvSink(xml_path.with_suffix(".csv"))]
+    )
+
+    assert summary.machines == 4
+    assert summary.deferred == 2
+    assert summary.unfinished == ["W501_000004"]
+
+    xml_sns = [m.get("SN") for m in ET.parse(xml_path).getroot().findall("machine")]
+    assert xml_sns == ["000001", "000002", "000003", "000005"]
+    csv_sns = pd.read_csv(xml_path.with_suffix(".csv"), dtype=str)["SN"].tolist()
+    assert csv_sns == ["000001", "000002", "000003", "000005"]
@@ -0,0 +1,184 @@
+import xml.etree.ElementTree as ET
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from core.utils.definitions import SeriesConfigBase
+import core.utils.logger as logger
+import core.utils.machine_data as machine_data
+from core.utils.machine_data import get_machine_data_from_directories
+import core.utils.parse_memo as parse_memo
+from core.utils.parse_memo import ParseMemo, get_content_key
+from core.utils.xml_writer import MachineXmlWriter
+
+CSP_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<codeSmith xmlns="http://www.codesmithtools.com/schema/csp.xsd">
+  <propertySets>
+    <propertySet name="Main">
+{properties}
+    </propertySet>
+  </propertySets>
+</codeSmith>
+"""
+
+
+def make_machine(root: Path, name: str, version: str, properties: dict) -> Path:
+    machine_dir = root / name / "ControlUnit"
+    machine_dir.mkdir(parents=True)
+    (machine_dir / "MU_Config.TcGVL").write_text(
+        f"\tHMICFGgszProgramVersion : STRING(20) := '{version}';\n", encoding="utf-8"
+    )
+    body = "\n".join(f'      <property name="{k}">{escape(v)}</property>' for k, v in properties.items())
+    (machine_dir / "0_MetaDataProject.csp").write_text(
+        CSP_TEMPLATE.format(properties=body), encoding="utf-8"
+    )
+    return root / name
+
+
+def make_series(out_file_name: str = "Wxxx/Wxxx_machines.xml") -> SeriesConfigBase:
+    return SeriesConfigBase(
+        "Wxxx",
+        "unused",
+        r"^W5\d{2}_\d{6}$",
+        ["ControlUnit/0_MetaDataProject.csp"],
+        "ControlUnit/MU_Config.TcGVL",
+        out_file_name,
+    )
+
+
+def test_get_machine_data_from_directories(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [
+        make_machine(repo, "W501_000001", "V1.0", {"Customer": "ACME", "Line": "1"}),
+        make_machine(repo, "W502_000002", "V2.0", {"Customer": "Foo & Bar"}),
+    ]
+    out_dir = tmp_path / "output"
+
+    get_machine_data_from_directories(dirs, out_dir, make_series())
+
+    root = ET.parse(out_dir / "Wxxx" / "Wxxx_machines.xml").getroot()
+    machines = root.findall("machine")
+    assert [m.get("SN") for m in machines] == ["000001", "000002"]
+    assert machines[0].attrib == {"TYPE": "W501", "SN": "000001", "SW_VERSION": "V1.0", "Customer": "ACME", "Line": "1"}
+    assert machines[1].get("Customer") == "Foo & Bar"
+
+
+def test_parallel_extraction_keeps_sn_order_and_skips_broken(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W50{i % 3}_00000{i}", f"V{i}", {"Index": str(i)}) for i in range(9, 0, -1)]
+    dirs.append(make_machine(repo, "W501_000005_old", "V0", {}))
+    out_dir = tmp_path / "output"
+
+    get_machine_data_from_directories(dirs, out_dir, make_series(), workers=4)
+
+    machines = ET.parse(out_dir / "Wxxx" / "Wxxx_machines.xml").getroot().findall("machine")
+    assert [m.get("SN") for m in machines] == [f"00000{i}" for i in range(1, 10)]
+    assert [m.get("Index") for m in machines] == [str(i) for i in range(1, 10)]
+
+
+
+def test_concurrent_series_share_the_io_budget_and_keep_their_log_prefix(tmp_path: Path, monkeypatch):
+    io_limiter = threading.BoundedSemaphore(2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+    contexts = {}
+    original = machine_data.extract_machine
+
+    def tracked(dir_path, series_info):
+        with lock:
+            active.append(dir_path.name)
+            peak.append(len(active))
+            contexts[dir_path.name] = logger._log_context.get()
+        time.sleep(0.01)
+        try:
+            return original(dir_path, series_info)
+        finally:
+            with lock:
+                active.remove(dir_path.name)
+
+    monkeypatch.setattr(machine_data, "extract_machine", tracked)
+
+    def run(series: str):
+        logger.set_log_context(f"[{series}] ")
+        dirs = [make_machine(tmp_path / series, f"W501_{series}{i:04d}", "V1.0", {"Index": str(i)}) for i in range(6)]
+        return get_machine_data_from_directories(
+            dirs, tmp_path / "output" / series, make_series(), workers=3, io_limiter=io_limiter
+        )
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = {series: pool.submit(contextvars.copy_context().run, run, series) for series in ("00", "11")}
+        summaries = {series: future.result() for series, future in futures.items()}
+
+    assert max(peak) <= 2
+    assert [summary.machines for summary in summaries.values()] == [6, 6]
+    # Worker threads log with the prefix of the series they read for
+    assert len(contexts) == 12
+    assert all(prefix == f"[{name[5:7]}] " for name, prefix in contexts.items())
+
+def test_xml_writer_is_valid_after_each_machine(tmp_path: Path):
+    xml_path = tmp_path / "machines.xml"
+    with MachineXmlWriter(xml_path) as writer:
+        assert ET.parse(xml_path).getroot().tag == "repository"
+        writer.write_machine({"TYPE": "W501", "SN": "000001"})
+        writer.write_machine({"TYPE": "W501", "SN": "000002"})
+        assert len(ET.parse(xml_path).getroot()) == 2
+
+
+def test_streaming_properties_match_full_parse(tmp_path: Path, monkeypatch):
+    csp = tmp_path / "3_StationConfiguration.csp"
+    body = "\n".join(
+        f'      <property name="Station{i}">{escape(f"value <{i}>")}</property>' for i in range(50)
+    )
+    csp.write_text(
+        CSP_TEMPLATE.format(properties=body + '\n      <property name="Empty" />'), encoding="utf-8"
+    )
+    nodes = ET.parse(csp).getroot().findall(".//cs:property", machine_data.CS_NAMESPACE)
+    expected = [(node.get("name"), node.text or "") for node in nodes]
+
+    assert machine_data.get_codesmith_properties(csp) == expected
+    monkeypatch.setattr(machine_data, "lxml_etree", None)
+    assert machine_data.get_codesmith_properties(csp) == expected
+
+
+def test_unparsable_csp_is_reported(tmp_path: Path, caplog):
+    csp = tmp_path / "broken.csp"
+    csp.write_text("<codeSmith><property name='x'>", encoding="utf-8")
+
+    assert machine_data.get_codesmith_properties(csp) == []
+    assert machine_data.get_codesmith_properties(tmp_path / "missing.csp") == []
+    assert "Failed to parse" in caplog.text
+    assert "File not found" in caplog.text
+
+
+def test_identical_csp_files_are_parsed_once(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W501_00000{i}", "V1.0", {"Template": "A"}) for i in range(1, 4)]
+    memo = ParseMemo(store_path=tmp_path / "memo.sqlite")
+    monkeypatch.setattr(machine_data, "_parse_memo", memo)
+
+    get_machine_data_from_directories(dirs, tmp_path / "output", make_series())
+    memo.close()
+
+    assert (memo.hits, memo.misses) == (2, 1)
+    persisted = ParseMemo(store_path=tmp_path / "memo.sqlite")
+    key = get_content_key((dirs[0] / "ControlUnit" / "0_MetaDataProject.csp").read_bytes(), "property")
+    assert persisted.get(key) == (("Template", "A"),)
+
+
+def test_memo_store_is_written_in_batches(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(parse_memo, "STORE_BATCH_SIZE", 2)
+    memo = ParseMemo(store_path=tmp_path / "memo.sqlite")
+    memo.put("a", [("x", "1")])
+    reader = ParseMemo(store_path=tmp_path / "memo.sqlite")
+    assert reader.get("a") is None
+
+    memo.put("b", [("y", "2")])
+    assert reader.get("a") == (("x", "1"),)
+    memo.put("c", [("z", "3")])
+    memo.close()
+    assert reader.get("c") == (("z", "3"),)
+    reader.close()
@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+import core.utils.machine_data as machine_data
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.manifest import MachineManifest, get_manifest_path
+
+from test_machine_data import make_machine, make_series
+
+
+def test_unchanged_machines_are_reused(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    out_dir = tmp_path / "output"
+    series = make_series()
+    dirs = [
+        make_machine(repo, "W501_000001", "V1.0", {"Customer": "ACME"}),
+        make_machine(repo, "W501_000002", "V1.0", {"Customer": "Foo"}),
+    ]
+    manifest_path = get_manifest_path(out_dir, series)
+
+    get_machine_data_from_directories(dirs, out_dir, series, manifest=MachineManifest(manifest_path, series))
+    assert manifest_path.is_file()
+
+    # Change one machine; bump mtime so the change is visible on coarse clocks
+    csp = dirs[1] / "ControlUnit" / "0_MetaDataProject.csp"
+    csp.write_text(csp.read_text(encoding="utf-8").replace("Foo", "Bar"), encoding="utf-8")
+    st = os.stat(csp)
+    os.utime(csp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    parsed = []
+    original = machine_data.extract_machine
+    monkeypatch.setattr(machine_data, "extract_machine", lambda d, s: parsed.append(d.name) or original(d, s))
+
+    manifest = MachineManifest(manifest_path, series)
+    get_machine_data_from_directories(dirs, out_dir, series, manifest=manifest)
+
+    assert parsed == ["W501_000002"]
+    reloaded = MachineManifest(manifest_path, series)
+    assert reloaded.lookup(dirs[1], reloaded.signature(dirs[1]))["Customer"] == "Bar"
+    assert reloaded.lookup(dirs[0], reloaded.signature(dirs[0]))["Customer"] == "ACME"
+
+
+def test_reused_machines_keep_their_attributes_in_order(tmp_path: Path):
+    repo = tmp_path / "repo"
+    out_dir = tmp_path / "output"
+    series = make_series()
+    dirs = [
+        make_machine(repo, "W501_000001", "V1.0", {"Customer": "ACME", "Lanes": "4"}),
+        make_machine(repo, "W501_000002", "V1.0", {"Lanes": "4", "Customer": "ACME", "Extra": "x"}),
+    ]
+    manifest_path = get_manifest_path(out_dir, series)
+    get_machine_data_from_directories(dirs, out_dir, series, manifest=MachineManifest(manifest_path, series))
+    parsed = [machine_data.extract_machine(dir_path, series) for dir_path in dirs]
+
+    # One header line, then one line per machine
+    assert len(manifest_path.read_text(encoding="utf-8").splitlines()) == 3
+    reloaded = MachineManifest(manifest_path, series)
+    reused = [reloaded.lookup(dir_path, reloaded.signature(dir_path)) for dir_path in dirs]
+    assert [list(machine.items()) for machine in reused] == [list(machine.items()) for machine in parsed]
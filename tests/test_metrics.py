@@ -0,0 +1,36 @@
+import contextvars
+from pathlib import Path
+
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.metrics import RunMetrics, percentile, set_current_metrics
+
+from test_machine_data import make_machine, make_series
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) is None
+
+
+def test_run_is_instrumented_when_metrics_are_set(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W501_00000{i}", "V1.0", {"Index": str(i)}) for i in range(1, 6)]
+    metrics = RunMetrics("Wxxx", slowest=2)
+
+    def run():
+        set_current_metrics(metrics)
+        get_machine_data_from_directories(dirs, tmp_path / "output", make_series(), workers=2)
+
+    contextvars.copy_context().run(run)
+    report = metrics.to_dict()
+
+    assert report["counters"]["machines"] == 5
+    assert report["counters"]["files_read"] == 10
+    assert report["counters"]["bytes_read"] > 0
+    assert report["machine_latency_seconds"]["count"] == 5
+    assert len(report["slowest_directories"]) == 2
+    assert {"extract", "export"} <= set(report["stages_seconds"])
+    assert "csp_read_parse" in report["timers_seconds"]
@@ -0,0 +1,68 @@
+import io
+from pathlib import Path
+
+from core.utils.definitions import get_series_info
+from core.utils.machine_data import extract_machine
+from core.utils.mu_config import format_mu_value, parse_mu_value, scan_mu_config
+
+from test_machine_data import make_machine, make_series
+
+GVL = b"""<?xml version="1.0" encoding="utf-8"?>
+<TcPlcObject Version="1.1.0.1">
+  <GVL Name="MU_Config">
+    <Declaration><![CDATA[VAR_GLOBAL
+\t// HMICFGgszProgramVersion : STRING(40) := 'commented';
+\t(* HMICFGgnStations : INT := 99;
+\t   still a comment *)
+\tHMICFGgszProgramVersion : STRING(40) := 'V2.4 $'rc$'';
+\tHMICFGgnStations : INT := 16#1F; // hex
+\tHMICFGgbSafety : BOOL := TRUE;
+\tHMICFGgrCycle : LREAL := 2.5;
+\tHMICFGgszProgramVersion : STRING(40) := 'never read';
+END_VAR
+]]></Declaration>
+"""
+
+
+def test_scan_reads_typed_values_and_stops_when_all_are_found():
+    source = io.BytesIO(GVL)
+    values = scan_mu_config(
+        source, ["HMICFGgszProgramVersion", "HMICFGgnStations", "HMICFGgbSafety", "HMICFGgrCycle"], chunk_size=64
+    )
+
+    assert values == {
+        "HMICFGgszProgramVersion": "V2.4 'rc'",
+        "HMICFGgnStations": 31,
+        "HMICFGgbSafety": True,
+        "HMICFGgrCycle": 2.5,
+    }
+    assert source.tell() < len(GVL)
+
+
+def test_typed_literals_and_attribute_text():
+    assert parse_mu_value("DINT", "-1_000") == -1000
+    assert parse_mu_value("DWORD", "DWORD#2#1010") == 10
+    assert parse_mu_value("INT", "SIZE_CONST") == "SIZE_CONST"
+    assert format_mu_value(parse_mu_value("BOOL", "FALSE")) == "FALSE"
+
+
+def test_configured_mu_variables_become_attributes(tmp_path: Path):
+    dir_path = make_machine(tmp_path / "repo", "W501_000001", "V1.0", {"Customer": "ACME"})
+    mu_file = dir_path / "ControlUnit" / "MU_Config.TcGVL"
+    mu_file.write_text(mu_file.read_text(encoding="utf-8") + "\tHMICFGgnLanes : UINT := 4;\n", encoding="utf-8")
+
+    series_info = make_series().with_mu_variables({"HMICFGgnLanes": "HMICFGgnLanes"})
+    machine = extract_machine(dir_path, series_info)
+
+    assert list(machine) == ["TYPE", "SN", "SW_VERSION", "HMICFGgnLanes", "Customer"]
+    assert machine["HMICFGgnLanes"] == "4"
+
+
+def test_extra_mu_variables_leave_the_shared_config_unchanged():
+    series_info = get_series_info("Wxxx")
+    configured = dict(series_info.mu_variables)
+
+    run_info = series_info.with_mu_variables({"HMICFGgnLanes": "HMICFGgnLanes"})
+
+    assert run_info.mu_variables == {**configured, "HMICFGgnLanes": "HMICFGgnLanes"}
+    assert get_series_info("Wxxx").mu_variables == configured
@@ -0,0 +1,29 @@
+import sys
+import time
+
+from app.parser_runner import ParserRunner
+
+CHILD = """
+import sys
+for i in range(1, 5001):
+    sys.stdout.write(f"line {i}\\n")
+for i in range(1, 4):
+    sys.stderr.write(f"\\x1b[36m[T300] Copying properties from T300_{i:06d} [{i}/3]\\x1b[39m\\n")
+sys.exit(3)
+"""
+
+
+def test_runner_drains_both_pipes_into_a_bounded_buffer():
+    runner = ParserRunner([sys.executable, "-c", CHILD], max_lines=100)
+    runner.start()
+
+    deadline = time.monotonic() + 30
+    while runner.running and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert runner.returncode == 3
+    assert len(runner.lines) == 100
+    assert not any("\x1b" in line for line in runner.lines)
+
+    progress = runner.progress_snapshot()["T300"]
+    assert (progress.done, progress.total) == (3, 3)
@@ -0,0 +1,80 @@
+import asyncio
+from pathlib import Path
+
+from core.utils.checkpoint import CheckpointJournal
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.manifest import MachineManifest
+from core.utils.pipeline import extract_series, write_machine_data_async
+from core.utils.sinks import CsvSink
+
+from test_machine_data import make_machine, make_series
+
+
+def test_async_pipeline_matches_sync_output(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W5{i % 3:02d}_{i:06d}", f"V{i}", {"Customer": f"C{i}"}) for i in range(12, 0, -1)]
+    (dirs[5] / "ControlUnit" / "0_MetaDataProject.csp").write_text("<broken", encoding="utf-8")
+    series_info = make_series()
+
+    sync_csv = tmp_path / "sync.csv"
+    get_machine_data_from_directories(dirs, tmp_path / "sync", series_info, workers=2, sinks=[CsvSink(sync_csv)])
+
+    manifest_path = tmp_path / "async" / "machines.manifest.json"
+    async_csv = tmp_path / "async.csv"
+    summary = asyncio.run(
+        write_machine_data_async(
+            dirs,
+            tmp_path / "async",
+            series_info,
+            readers=3,
+            queue_size=2,
+            manifest=MachineManifest(manifest_path, series_info),
+            sinks=[CsvSink(async_csv)],
+        )
+    )
+    rerun = asyncio.run(
+        write_machine_data_async(
+            dirs, tmp_path / "rerun", series_info, manifest=MachineManifest(manifest_path, series_info)
+        )
+    )
+
+    assert async_csv.read_text(encoding="utf-8") == sync_csv.read_text(encoding="utf-8")
+    assert (tmp_path / "async" / series_info.out_file_name).read_bytes() == (
+        tmp_path / "sync" / series_info.out_file_name
+    ).read_bytes()
+    assert (summary.machines, summary.failures) == (12, 0)
+    assert (rerun.reused, rerun.failures) == (12, 0)
+
+
+def test_async_pipeline_resumes_from_checkpoint(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W500_{i:06d}", f"V{i}", {"Line": str(i)}) for i in range(1, 6)]
+    series_info = make_series()
+    journal_path = tmp_path / "out" / "machines.checkpoint.jsonl"
+
+    journal = CheckpointJournal(journal_path)
+    journal.record(dirs[0].name, {"TYPE": "W500", "SN": "000001", "SW_VERSION": "from-journal"})
+    journal.close()
+
+    summary = asyncio.run(
+        write_machine_data_async(
+            dirs, tmp_path / "out", series_info, checkpoint=CheckpointJournal(journal_path, resume=True)
+        )
+    )
+
+    assert summary.machines == 5
+    assert "from-journal" in (tmp_path / "out" / series_info.out_file_name).read_text(encoding="utf-8")
+    assert not journal_path.exists()
+
+
+def test_extract_series_yields_machines_in_sn_order(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W500_{i:06d}", f"V{i}", {"Line": str(i)}) for i in (3, 1, 2)]
+    (dirs[1] / "ControlUnit" / "0_MetaDataProject.csp").write_text("<broken", encoding="utf-8")
+
+    async def collect():
+        return [machine async for machine in extract_series(make_series(), found_dirs=dirs, readers=2, queue_size=1)]
+
+    machines = asyncio.run(collect())
+
+    assert [machine["SN"] for machine in machines] == ["000001", "000002", "000003"]
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+from core.utils import machine_data
+from core.utils.machine_data import create_process_pool, get_machine_data_from_directories, set_process_pool
+from core.utils.manifest import MachineManifest
+from core.utils.metrics import RunMetrics, set_current_metrics
+from core.utils.parse_memo import ParseMemo, get_content_key
+from core.utils.sinks import CsvSink
+
+from test_machine_data import make_machine, make_series
+
+
+def test_process_executor_matches_threads_and_merges_metrics(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(machine_data, "PROCESS_BATCH_SIZE", 3)
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W5{i % 3:02d}_{i:06d}", f"V{i}", {"Customer": f"C{i}"}) for i in range(10, 0, -1)]
+    (dirs[4] / "ControlUnit" / "0_MetaDataProject.csp").write_text("<broken", encoding="utf-8")
+    series_info = make_series()
+
+    thread_csv = tmp_path / "threads.csv"
+    get_machine_data_from_directories(dirs, tmp_path / "threads", series_info, workers=2, sinks=[CsvSink(thread_csv)])
+
+    manifest_path = tmp_path / "process" / "machines.manifest.json"
+    process_csv = tmp_path / "process.csv"
+    metrics = RunMetrics("Wxxx")
+    set_current_metrics(metrics)
+    pool = create_process_pool(2)
+    set_process_pool(pool)
+    try:
+        summary = get_machine_data_from_directories(
+            dirs,
+            tmp_path / "process",
+            series_info,
+            workers=2,
+            manifest=MachineManifest(manifest_path, series_info),
+            sinks=[CsvSink(process_csv)],
+        )
+        # Unchanged machines are served from the manifest without reaching the workers
+        monkeypatch.setattr(pool, "submit", None)
+        rerun = get_machine_data_from_directories(
+            dirs, tmp_path / "rerun", series_info, workers=2, manifest=MachineManifest(manifest_path, series_info)
+        )
+    finally:
+        set_process_pool(None)
+        set_current_metrics(None)
+        pool.shutdown()
+
+    assert process_csv.read_text(encoding="utf-8") == thread_csv.read_text(encoding="utf-8")
+    assert (summary.machines, summary.failures) == (10, 0)
+    assert (rerun.reused, rerun.failures) == (10, 0)
+    assert metrics.counters["files_read"] >= 10
+    assert metrics.to_dict()["machine_latency_seconds"]["count"] >= 10
+
+
+def test_process_workers_share_the_memo_store_and_report_hits(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [make_machine(repo, f"W501_{i:06d}", "V1.0", {"Template": "A"}) for i in range(1, 5)]
+    store_path = tmp_path / "memo.sqlite"
+
+    metrics = RunMetrics("Wxxx")
+    set_current_metrics(metrics)
+    pool = create_process_pool(2, memo_entries=16, memo_store=store_path)
+    set_process_pool(pool)
+    try:
+        get_machine_data_from_directories(dirs, tmp_path / "output", make_series(), workers=2)
+    finally:
+        set_process_pool(None)
+        set_current_metrics(None)
+        pool.shutdown()
+
+    # All four machines go to one worker in a single batch
+    assert (metrics.counters["memo_hits"], metrics.counters["memo_misses"]) == (3, 1)
+
+    key = get_content_key((dirs[0] / "ControlUnit" / "0_MetaDataProject.csp").read_bytes(), "property")
+    assert ParseMemo(store_path=store_path).get(key) == (("Template", "A"),)
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.sinks import CsvSink, JsonSink, MachineTable, ParquetSink
+
+from test_machine_data import make_machine, make_series
+
+
+def test_machine_table_column_union_keeps_first_seen_order():
+    table = MachineTable()
+    table.append({"TYPE": "W501", "SN": "1", "B": "x"})
+    table.append({"TYPE": "W501", "SN": "2", "A": "y", "B": "z"})
+
+    assert table.columns == ["TYPE", "SN", "B", "A"]
+    assert len(table) == 2
+    assert list(table.iter_rows()) == [("W501", "1", "x", None), ("W501", "2", "z", "y")]
+
+
+def test_machine_table_rows_share_schema_and_values():
+    table = MachineTable()
+    # Equal but distinct string objects, as returned for every parsed machine
+    table.append({"TYPE": "W501", "SN": "1", "Customer": "".join(["AC", "ME"])})
+    table.append({"SN": "2", "Customer": "".join(["AC", "ME"]), "TYPE": "W502"})
+
+    first, second = table.rows
+    assert first.schema is second.schema
+    assert first.values[2] is second.values[2]
+    assert second.to_dict() == {"TYPE": "W502", "SN": "2", "Customer": "ACME"}
+    assert (second.get("Line"), "Customer" in second, second["SN"]) == (None, True, "2")
+    assert not hasattr(first, "__dict__")
+
+
+def test_csv_and_json_are_written_in_the_same_pass(tmp_path: Path):
+    repo = tmp_path / "repo"
+    dirs = [
+        make_machine(repo, "W501_000001", "V1.0", {"Customer": "ACME"}),
+        make_machine(repo, "W502_000002", "V2.0", {"Line": "2, north"}),
+    ]
+    out_dir = tmp_path / "output"
+    xml_path = out_dir / "Wxxx" / "Wxxx_machines.xml"
+
+    get_machine_data_from_directories(
+        dirs,
+        out_dir,
+        make_series(),
+        sinks=[CsvSink(xml_path.with_suffix(".csv")), JsonSink(xml_path.with_suffix(".json"))],
+    )
+
+    df = pd.read_csv(xml_path.with_suffix(".csv"), dtype=str)
+    assert df.columns.tolist() == ["TYPE", "SN", "SW_VERSION", "Customer", "Line"]
+    assert df["SN"].tolist() == ["000001", "000002"]
+    assert df.iloc[1]["Line"] == "2, north"
+
+    records = json.loads(xml_path.with_suffix(".json").read_text(encoding="utf-8"))
+    assert records[0] == {"TYPE": "W501", "SN": "000001", "SW_VERSION": "V1.0", "Customer": "ACME", "Line": None}
+
+
+def test_parquet_sink_dictionary_encodes_low_cardinality_columns(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = MachineTable()
+    for i in range(10):
+        table.append({"TYPE": "W501", "SN": f"{i:06d}", "SW_VERSION": "V1.0" if i % 2 else "V2.0"})
+
+    path = tmp_path / "machines.parquet"
+    ParquetSink(path).write_table(table)
+
+    schema = pq.read_schema(path)
+    assert str(schema.field("TYPE").type).startswith("dictionary")
+    assert str(schema.field("SW_VERSION").type).startswith("dictionary")
+    assert str(schema.field("SN").type) in ("string", "large_string")
+    assert pd.read_parquet(path)["SN"].tolist()[:2] == ["000000", "000001"]
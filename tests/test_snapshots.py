@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from core.utils.snapshots import SnapshotSink, diff_snapshots, list_snapshots
+
+
+def record(db_path: Path, series: str, machines, retained=()):
+    sink = SnapshotSink(db_path, series)
+    for machine in machines:
+        sink.write(machine)
+    for type_, sn in retained:
+        sink.retain(type_, sn)
+    sink.close()
+    return sink
+
+
+def test_snapshots_store_changes_and_diff_between_versions(tmp_path: Path):
+    db_path = tmp_path / "snapshots.sqlite"
+    first = [
+        {"TYPE": "W501", "SN": "000001", "SW_VERSION": "V1.0", "Customer": "ACME"},
+        {"TYPE": "W502", "SN": "000002", "SW_VERSION": "V1.0", "Customer": "Initech"},
+        {"TYPE": "W503", "SN": "000003", "SW_VERSION": "V1.0", "Customer": "Umbrella"},
+    ]
+    assert record(db_path, "Wxxx", first).snapshot_id == 1
+    # Another series in the same database does not interfere
+    assert record(db_path, "Txxx", [{"TYPE": "T300", "SN": "000001", "SW_VERSION": "V1"}]).snapshot_id == 2
+    # Nothing changed: no new version
+    assert record(db_path, "Wxxx", first).snapshot_id is None
+
+    # 000002 updated, 000003 unreadable this run, 000001 removed, 000004 added
+    second = [
+        {**first[1], "SW_VERSION": "V2.0", "Line": "4"},
+        {"TYPE": "W504", "SN": "000004", "SW_VERSION": "V2.0"},
+    ]
+    assert record(db_path, "Wxxx", second, retained=[("W503", "000003")]).snapshot_id == 3
+    # 000002 reverted
+    assert record(db_path, "Wxxx", [first[1], second[1]], retained=[("W503", "000003")]).snapshot_id == 4
+
+    assert [(s["id"], s["added"], s["changed"], s["removed"]) for s in list_snapshots(db_path, "Wxxx")] == [
+        (4, 0, 1, 0),
+        (3, 1, 1, 1),
+        (1, 3, 0, 0),
+    ]
+
+    diff = diff_snapshots(db_path, "Wxxx", 1, 3)
+    assert [m["SN"] for m in diff.added] == ["000004"]
+    assert [m["SN"] for m in diff.removed] == ["000001"]
+    assert diff.changed == [
+        {"TYPE": "W502", "SN": "000002", "ATTRIBUTE": "Line", "OLD": None, "NEW": "4"},
+        {"TYPE": "W502", "SN": "000002", "ATTRIBUTE": "SW_VERSION", "OLD": "V1.0", "NEW": "V2.0"},
+    ]
+
+    # Default: previous against latest snapshot; the revert cancels out against snapshot 1
+    assert diff_snapshots(db_path, "Wxxx").changed_machines == 1
+    assert diff_snapshots(db_path, "Wxxx", 1, 4).changed == []
+    assert [row["CHANGE"] for row in diff_snapshots(db_path, "Wxxx", 0, 1).rows()] == ["added"] * 3
+
+    with pytest.raises(ValueError):
+        diff_snapshots(db_path, "Wxxx", 2, 4)
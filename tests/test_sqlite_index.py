@@ -0,0 +1,88 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import core.utils.sqlite_index as sqlite_index
+from core.utils.sqlite_index import SqliteSink, parse_condition, query_machines
+
+
+def write_run(db_path: Path, series: str, machines, retained=()):
+    sink = SqliteSink(db_path, series, hot_attributes=["Customer"])
+    for machine in machines:
+        sink.write(machine)
+    for type_, sn in retained:
+        sink.retain(type_, sn)
+    sink.close()
+    return sink
+
+
+def test_sink_updates_the_index_incrementally(tmp_path: Path):
+    db_path = tmp_path / "machines.sqlite"
+    first = [
+        {"TYPE": "W501", "SN": "000001", "SW_VERSION": "V1.0", "Customer": "ACME"},
+        {"TYPE": "W502", "SN": "000002", "SW_VERSION": "V1.0", "Customer": "Initech"},
+        {"TYPE": "W503", "SN": "000003", "SW_VERSION": "V1.0", "Customer": "Umbrella"},
+    ]
+    sink = write_run(db_path, "Wxxx", first)
+    assert sink.updated == 3
+
+    # 000001 unchanged, 000002 changed, 000003 unreadable this run, 000004 removed from the archive
+    second = [first[0], {**first[1], "SW_VERSION": "V2.0"}]
+    sink = write_run(db_path, "Wxxx", second, retained=[("W503", "000003")])
+    assert (sink.updated, sink.unchanged) == (1, 1)
+
+    rows = query_machines(db_path, columns=["Customer"])
+    assert [(row["SN"], row["SW_VERSION"], row["Customer"]) for row in rows] == [
+        ("000001", "V1.0", "ACME"),
+        ("000002", "V2.0", "Initech"),
+        ("000003", "V1.0", "Umbrella"),
+    ]
+
+    write_run(db_path, "Wxxx", second)
+    assert [row["SN"] for row in query_machines(db_path)] == ["000001", "000002"]
+
+    with sqlite3.connect(str(db_path)) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_hot_Customer" in indexes
+
+
+
+def test_series_writing_to_one_database_do_not_wait_for_each_other(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(sqlite_index, "COMMIT_EVERY", 2)
+    db_path = tmp_path / "machines.sqlite"
+    sinks = [SqliteSink(db_path, series) for series in ("Wxxx", "Txxx")]
+    for sink in sinks:
+        # Fail at once instead of after the default wait if the other sink holds the write lock
+        sink._conn.execute("PRAGMA busy_timeout = 0")
+
+    for idx in range(5):
+        for sink in sinks:
+            sink.write({"TYPE": "W501", "SN": f"{idx:06d}", "SW_VERSION": sink.series})
+    for sink in sinks:
+        sink.close()
+
+    assert [sink.updated for sink in sinks] == [5, 5]
+    assert len(query_machines(db_path, series=["Wxxx"])) == len(query_machines(db_path, series=["Txxx"])) == 5
+
+def test_query_combines_series_machine_columns_and_attributes(tmp_path: Path):
+    db_path = tmp_path / "machines.sqlite"
+    write_run(db_path, "Wxxx", [
+        {"TYPE": "W501", "SN": "000001", "SW_VERSION": "V1.0", "Customer": "ACME", "Line": "north"},
+        {"TYPE": "W502", "SN": "000002", "SW_VERSION": "V2.0", "Customer": "ACME Labs", "Line": "south"},
+    ])
+    write_run(db_path, "T300", [
+        {"TYPE": "T300", "SN": "000003", "SW_VERSION": "V1.0", "Customer": "ACME"},
+    ])
+
+    rows = query_machines(db_path, where=["SW_VERSION=V1.0", "Customer=ACME"])
+    assert [(row["SERIES"], row["SN"]) for row in rows] == [("T300", "000003"), ("Wxxx", "000001")]
+
+    rows = query_machines(db_path, series=["Wxxx"], where=["Customer~ACME*", "Line!=north"], columns=["Line"])
+    assert [(row["SN"], row["Line"]) for row in rows] == [("000002", "south")]
+
+    assert parse_condition("HMI.Name!=a=b") == ("HMI.Name", "!=", "a=b")
+    with pytest.raises(ValueError):
+        parse_condition("Customer")
+    with pytest.raises(FileNotFoundError):
+        query_machines(tmp_path / "missing.sqlite")
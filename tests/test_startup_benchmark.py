@@ -0,0 +1,18 @@
+from benchmarks.startup_benchmark import measure_startup, parse_importtime
+
+
+def test_parse_importtime_marks_top_level_modules():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:       300 |        420 | io\n"
+    )
+    modules = parse_importtime(stderr)
+    assert modules["io"] == {"self_us": 300, "cumulative_us": 420, "top_level": True}
+    assert modules["_io"]["top_level"] is False
+
+
+def test_help_does_not_import_heavy_dependencies():
+    report = measure_startup(["--help"], runs=1)
+    assert report["modules_imported"] > 0
+    assert report["heavy_modules_imported"] == []
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from app.table_query import TableIndex
+
+
+def make_index() -> TableIndex:
+    df = pd.DataFrame({
+        "TYPE": pd.Categorical(["W501", "W502", "W501", "W503"]),
+        "SN": pd.array(["000001", "000002", "000003", "000004"], dtype="string"),
+        "Customer": pd.array(["ACME", None, "Initech", "acme labs"], dtype="string"),
+    })
+    return TableIndex(df)
+
+
+def test_filters_and_search_narrow_rows_before_paging():
+    index = make_index()
+    assert index.filterable_columns == ["TYPE"]
+    assert index.values("TYPE") == ["W501", "W502", "W503"]
+
+    assert index.filter({"TYPE": ["W501", "W503"]}).tolist() == [0, 2, 3]
+    assert index.filter({"TYPE": []}, "acme").tolist() == [0, 3]
+    assert index.filter({"TYPE": ["W501"]}, "ACME").tolist() == [0]
+    assert index.filter({}, "w502").tolist() == [1]
+
+
+def test_page_materializes_only_the_requested_rows_and_columns():
+    index = make_index()
+    positions = index.filter({}, "")
+
+    page = index.page(positions, ["SN"], page=1, page_size=3)
+    assert page.columns.tolist() == ["SN"]
+    assert page["SN"].tolist() == ["000004"]
+
+
+def test_search_reads_text_columns_from_the_frame_itself():
+    df = pd.DataFrame({
+        "SN": pd.array(["A1", "b2", "C3"], dtype="string"),
+        "Count": [10, 21, 32],
+    })
+    index = TableIndex(df)
+
+    assert index.filter({}, "B").tolist() == [1]
+    assert index.filter({}, "2").tolist() == [1, 2]
+    assert not any(isinstance(value, pd.Series) for value in vars(index).values())
@@ -0,0 +1,96 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.utils.atomic_write import STALE_TEMPORARY_SECONDS, atomic_output
+from core.utils.machine_data import get_machine_data_from_directories
+from core.utils.manifest import MachineManifest, get_manifest_path
+from core.utils.watch import RepositoryWatcher
+
+from test_machine_data import make_machine, make_series
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def refresh(dirs, out_dir, series_info, trusted=()):
+    manifest = MachineManifest(get_manifest_path(out_dir, series_info), series_info)
+    manifest.trust(trusted)
+    get_machine_data_from_directories(dirs, out_dir, series_info, manifest=manifest)
+
+
+def test_watcher_refreshes_only_new_and_changed_machines(tmp_path: Path):
+    repo, out_dir = tmp_path / "repo", tmp_path / "output"
+    series_info = make_series()
+    dirs = [make_machine(repo, f"W500_{i:06d}", f"V{i}", {"Line": str(i)}) for i in range(1, 4)]
+    clock = FakeClock()
+    watcher = RepositoryWatcher([series_info], out_dir, verify_interval=60, clock=clock)
+
+    assert watcher.poll({"Wxxx": dirs}) == {"Wxxx": set()}
+    refresh(dirs, out_dir, series_info)
+    assert watcher.poll({"Wxxx": dirs}) == {}
+
+    # A machine lands: only it needs reading
+    dirs.append(make_machine(repo, "W500_000004", "V4", {"Line": "4"}))
+    trusted = watcher.poll({"Wxxx": dirs})["Wxxx"]
+    assert trusted == {"W500_000001", "W500_000002", "W500_000003"}
+    refresh(dirs, out_dir, series_info, trusted)
+
+    # Recently added machines are stat'ed on every poll, older ones only on verify
+    (dirs[3] / "ControlUnit" / "0_MetaDataProject.csp").write_text("<codeSmith/>", encoding="utf-8")
+    (dirs[0] / "ControlUnit" / "0_MetaDataProject.csp").write_text("<codeSmith/>", encoding="utf-8")
+    assert "W500_000004" not in watcher.poll({"Wxxx": dirs})["Wxxx"]
+    refresh(dirs, out_dir, series_info, {"W500_000001", "W500_000002", "W500_000003"})
+    assert watcher.poll({"Wxxx": dirs}) == {}
+
+    clock.now = 60
+    assert watcher.poll({"Wxxx": dirs}) == {"Wxxx": {"W500_000002", "W500_000003", "W500_000004"}}
+    refresh(dirs, out_dir, series_info, {"W500_000002", "W500_000003", "W500_000004"})
+    clock.now = 120
+    assert watcher.poll({"Wxxx": dirs}) == {}
+
+    # Removed machines and failed refreshes
+    assert watcher.poll({"Wxxx": dirs[1:]}) == {"Wxxx": {"W500_000002", "W500_000003", "W500_000004"}}
+    watcher.forget("Wxxx")
+    assert watcher.poll({"Wxxx": dirs[1:]}) == {"Wxxx": set()}
+
+
+def test_atomic_output_keeps_previous_file_on_failure(tmp_path: Path):
+    path = tmp_path / "machines.csv"
+    with atomic_output(path) as tmp:
+        tmp.write_text("v1", encoding="utf-8")
+    assert path.read_text(encoding="utf-8") == "v1"
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(path) as tmp:
+            tmp.write_text("partial", encoding="utf-8")
+            raise RuntimeError("interrupted")
+
+    assert path.read_text(encoding="utf-8") == "v1"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_temporary_files_of_killed_runs_are_removed(tmp_path: Path):
+    path = tmp_path / "machines.csv"
+    stale = tmp_path / "machines.csv.4242.tmp"
+    recent = tmp_path / "machines.csv.4343.tmp"
+    other = tmp_path / "other.csv.4242.tmp"
+    for tmp in (stale, recent, other):
+        tmp.write_text("partial", encoding="utf-8")
+    old = time.time() - STALE_TEMPORARY_SECONDS - 60
+    os.utime(stale, (old, old))
+    os.utime(other, (old, old))
+
+    with atomic_output(path) as tmp:
+        tmp.write_text("v1", encoding="utf-8")
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "machines.csv", "machines.csv.4343.tmp", "other.csv.4242.tmp"
+    ]